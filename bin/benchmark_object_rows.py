@@ -0,0 +1,60 @@
+"""
+Compare the rendering of the records with ObjectSerializer and with
+ObjectRowSerializer, which is used by the list, search and export endpoints of the
+v2 API if all the fields are shown.
+
+The latest records in the database are rendered, including the queries:
+
+    python src/manage.py shell < bin/benchmark_object_rows.py
+
+Set BENCHMARK_ROWS to change the number of rendered records (default 1000) and
+BENCHMARK_ITERATIONS to change the number of repetitions (default 5).
+"""
+import os
+import time
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import NamespaceVersioning
+
+from objects.api.rows import ObjectRowSerializer
+from objects.api.serializers import ObjectSerializer
+from objects.api.v2.views import ObjectViewSet
+
+rows = int(os.environ.get("BENCHMARK_ROWS", 1000))
+iterations = int(os.environ.get("BENCHMARK_ITERATIONS", 5))
+
+request = Request(APIRequestFactory().get("/api/v2/objects"))
+request.version = "v2"
+request.versioning_scheme = NamespaceVersioning()
+context = {"request": request}
+
+queryset = ObjectViewSet.queryset.filter(is_latest=True)[:rows]
+count = queryset.count()
+if not count:
+    raise SystemExit("There are no records to render")
+
+
+def serialize():
+    return ObjectSerializer(queryset, many=True, context=context).data
+
+
+def serialize_rows():
+    serializer = ObjectRowSerializer(context=context)
+    return serializer.get_data(serializer.get_rows(queryset))
+
+
+def benchmark(label: str, render) -> None:
+    render()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    duration = time.perf_counter() - start
+    print(
+        f"{label}: {count * iterations} records in {duration:.3f}s "
+        f"({count * iterations / duration:.0f} records/s)"
+    )
+
+
+benchmark("ObjectSerializer", serialize)
+benchmark("ObjectRowSerializer", serialize_rows)
@@ -0,0 +1,41 @@
+"""
+Compare the resolution of OBJECTTYPE urls with queries (as before the resolver
+cache) and with the process-wide resolver.
+
+The urls of the ObjectTypes in the database are resolved round-robin:
+
+    python src/manage.py shell < bin/benchmark_objecttype_resolver.py
+
+Set BENCHMARK_ITERATIONS to change the number of resolved urls (default 10000).
+"""
+import os
+import time
+
+from django.test.utils import override_settings
+
+from objects.core.models import ObjectType
+from objects.core.resolver import object_type_resolver
+
+iterations = int(os.environ.get("BENCHMARK_ITERATIONS", 10000))
+urls = [object_type.url for object_type in ObjectType.objects.select_related("service")]
+if not urls:
+    raise SystemExit("There are no ObjectTypes to resolve")
+
+
+def benchmark(label: str) -> None:
+    object_type_resolver.clear()
+    start = time.perf_counter()
+    for index in range(iterations):
+        ObjectType.objects.get_by_url(urls[index % len(urls)])
+    duration = time.perf_counter() - start
+    print(
+        f"{label}: {iterations} urls in {duration:.3f}s "
+        f"({duration / iterations * 1e6:.1f} us per url)"
+    )
+
+
+with override_settings(OBJECTTYPE_RESOLVER_CACHE_TIMEOUT=0):
+    benchmark("queries")
+
+with override_settings(OBJECTTYPE_RESOLVER_CACHE_TIMEOUT=300):
+    benchmark("resolver")
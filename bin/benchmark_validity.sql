@@ -0,0 +1,53 @@
+--
+-- Compare the query plans of the material-date filter with B-tree indexes on
+-- start_at/end_at and with the GiST index on the validity date range.
+--
+-- The fixture is created in a temporary table, nothing is left in the database:
+--
+--     psql -v records=5000000 -f bin/benchmark_validity.sql <database>
+--
+\set ON_ERROR_STOP on
+\if :{?records}
+\else
+    \set records 5000000
+\endif
+
+BEGIN;
+
+-- one object has five consecutive records of ~half a year each
+CREATE TEMPORARY TABLE benchmark_record ON COMMIT DROP AS
+SELECT
+    id,
+    id / 5 AS object_id,
+    DATE '2000-01-01' + (id / 5) % 3650 + (id % 5) * 180 AS start_at,
+    CASE
+        WHEN id % 5 = 4 THEN NULL
+        ELSE DATE '2000-01-01' + (id / 5) % 3650 + (id % 5 + 1) * 180
+    END AS end_at
+FROM generate_series(1, :records) AS id;
+
+CREATE INDEX ON benchmark_record (start_at);
+CREATE INDEX ON benchmark_record (end_at);
+ANALYZE benchmark_record;
+
+\echo '# start_at <= date AND (end_at >= date OR end_at IS NULL)'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT count(*) FROM benchmark_record
+WHERE start_at <= DATE '2005-06-01'
+    AND (end_at >= DATE '2005-06-01' OR end_at IS NULL);
+
+CREATE INDEX ON benchmark_record USING gist ((
+    CASE WHEN end_at < start_at THEN 'empty'::daterange
+    ELSE daterange(start_at, end_at, '[]') END
+));
+ANALYZE benchmark_record;
+
+\echo '# validity @> date'
+EXPLAIN (ANALYZE, BUFFERS)
+SELECT count(*) FROM benchmark_record
+WHERE (
+    CASE WHEN end_at < start_at THEN 'empty'::daterange
+    ELSE daterange(start_at, end_at, '[]') END
+) @> DATE '2005-06-01';
+
+ROLLBACK;
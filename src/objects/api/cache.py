@@ -0,0 +1,94 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from random import random
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int
+    misses: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    Opt-in shared cache of the data of the responses of the list and search of
+    OBJECTs, which is stored in the Django cache ``OBJECTS_RESPONSE_CACHE_ALIAS``
+    for ``OBJECTS_RESPONSE_CACHE_TIMEOUT`` seconds. ``0`` disables the cache.
+
+    The entries are not deleted when the OBJECTs change. Instead their keys contain
+    the change counters of the OBJECTTYPEs in the response, so only the changes of
+    these OBJECTTYPEs lead to new keys. A sample of the hits and misses, of
+    ``OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE``, is counted in the shared cache as
+    well.
+    """
+
+    key_prefix = "objects-response"
+    counters = ("hits", "misses")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            settings.OBJECTS_RESPONSE_CACHE_TIMEOUT > 0
+            and settings.OBJECTS_RESPONSE_CACHE_ALIAS
+        )
+
+    def get_cache(self):
+        return caches[settings.OBJECTS_RESPONSE_CACHE_ALIAS]
+
+    def get_key(self, *parts) -> str:
+        value = json.dumps(parts, cls=DjangoJSONEncoder, sort_keys=True)
+        return f"{self.key_prefix}:{hashlib.sha256(value.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.get_cache().get(key)
+        self.count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.get_cache().set(
+            key, value, timeout=settings.OBJECTS_RESPONSE_CACHE_TIMEOUT
+        )
+
+    def get_counter_key(self, name: str) -> str:
+        return f"{self.key_prefix}-stats:{name}"
+
+    def count(self, name: str) -> None:
+        rate = settings.OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE
+        if rate <= 0 or random() >= rate:
+            return
+
+        cache = self.get_cache()
+        key = self.get_counter_key(name)
+        # a sampled lookup counts for all the lookups it represents
+        delta = round(1 / min(rate, 1))
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # the first count, or the counter was evicted. The counters don't expire
+            cache.set(key, delta, timeout=None)
+
+    def get_stats(self) -> ResponseCacheStats:
+        cache = self.get_cache()
+        values = cache.get_many([self.get_counter_key(name) for name in self.counters])
+        return ResponseCacheStats(
+            *[values.get(self.get_counter_key(name)) or 0 for name in self.counters]
+        )
+
+    def reset_stats(self) -> None:
+        self.get_cache().delete_many(
+            [self.get_counter_key(name) for name in self.counters]
+        )
+
+
+response_cache = ResponseCache()
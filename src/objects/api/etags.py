@@ -0,0 +1,44 @@
+import hashlib
+import json
+from typing import Callable, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from objects.token.cache import ObjectTypePermission
+
+
+def get_etag(*parts) -> str:
+    """return a strong ETag, which is the hash of the parts"""
+    value = json.dumps(parts, cls=DjangoJSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.sha256(value.encode("utf-8")).hexdigest())
+
+
+def get_permission_fingerprint(permission: Optional[ObjectTypePermission]) -> list:
+    """the attributes of the permission which change the representation"""
+    if permission is None:
+        return []
+    return [permission.mode, permission.use_fields, permission.fields]
+
+
+def conditional_response(
+    request, etag: Optional[str], get_response: Callable[[], HttpResponseBase]
+) -> HttpResponseBase:
+    """
+    respond with 304 if the `If-None-Match` header matches the ETag, otherwise
+    return the response of `get_response`. The ETag is added to successful
+    responses. Without an ETag the response is always returned.
+    """
+    if etag is None:
+        return get_response()
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+
+    response["ETag"] = etag
+    return response
@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
+from objects.core.loaders import get_objecttype_loader
 from objects.core.models import ObjectRecord
 
 
@@ -39,8 +40,9 @@ class ObjectTypeField(serializers.RelatedField):
         if self.min_length and len(data) < self.min_length:
             self.fail("min_length")
 
+        loader = get_objecttype_loader(self.context.get("request"))
         try:
-            return self.get_queryset().get_by_url(data)
+            return loader.get_by_url(data, self.get_queryset())
         except ObjectDoesNotExist:
             self.fail("does_not_exist", value=smart_text(data))
         except (TypeError, ValueError):
@@ -64,7 +64,11 @@ class OrderingBackend(OrderingFilter):
         ordering = [term for term in fields if term_valid(term)]
 
         # check that all fields are allowed
-        permissions = request.auth.permissions.filter(use_fields=True)
+        permissions = [
+            permission
+            for permission in request.auth.auth_context.permissions.values()
+            if permission.use_fields
+        ]
         allowed_fields = sum([list(p.fields.values()) for p in permissions], [])
 
         def term_allowed(term):
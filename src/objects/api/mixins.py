@@ -1,3 +1,7 @@
+import logging
+from typing import Dict, List, Union
+
+from django.conf import settings
 from django.db import models
 
 from rest_framework.exceptions import NotAcceptable
@@ -16,6 +20,10 @@ from vng_api_common.notifications.viewsets import (
     conditional_atomic,
 )
 
+from objects.core.outbox import add_notifications
+
+logger = logging.getLogger(__name__)
+
 
 class GeoMixin(_GeoMixin):
     def perform_crs_negotation(self, request):
@@ -41,15 +49,63 @@ class GeoMixin(_GeoMixin):
 
 
 class ObjectNotificationMixin(NotificationCreateMixin, NotificationDestroyMixin):
+    # whether the last update didn't change the object
+    unchanged_update = False
+
     def construct_message(self, data: dict, instance: models.Model = None) -> dict:
         message = super().construct_message(data, instance)
         message["resource"] = "object"
         return message
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.unchanged_update = serializer.unchanged
+
     def update(self, request, *args, **kwargs):
         with conditional_atomic(self.notifications_wrap_in_atomic_block)():
             response = super().update(request, *args, **kwargs)
 
+            # an unchanged update returns the current record without a new record,
+            # so there is nothing to notify
+            if self.unchanged_update:
+                response[settings.UNCHANGED_OBJECT_HEADER] = "true"
+                return response
+
             instance = self.get_object()
             self.notify(response.status_code, response.data, instance=instance)
             return response
+
+    def notify(
+        self, status_code: int, data: Union[List, Dict], instance: models.Model = None
+    ) -> None:
+        """
+        Store the notification in the outbox in the transaction of the request.
+        The notifications are sent by the `send_notifications` management command.
+        """
+        if settings.NOTIFICATIONS_DISABLED:
+            return
+
+        if not 200 <= status_code < 300:
+            logger.info(
+                "Not notifying, status code '%s' does not represent success.",
+                status_code,
+            )
+            return
+
+        message = self.construct_message(data, instance=instance)
+        add_notifications([message])
+
+    def notify_bulk(self, data: list, instances: list, action: str = "create") -> None:
+        """
+        Store the notifications of multiple objects in the outbox in one query
+        """
+        if settings.NOTIFICATIONS_DISABLED or not instances:
+            return
+
+        messages = []
+        for item_data, instance in zip(data, instances):
+            message = self.construct_message(item_data, instance=instance)
+            message["actie"] = action
+            messages.append(message)
+
+        add_notifications(messages)
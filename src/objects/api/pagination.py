@@ -1,7 +1,245 @@
+import json
+import operator
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import partial, reduce
+
+from django.db.models import F, Q, TextField, Value
+from django.db.models.functions import Cast
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class DynamicPageSizePagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = "pageSize"
     max_page_size = 500
+
+
+class KeysetPagination(DynamicPageSizePagination):
+    """
+    Page number pagination, which switches to keyset pagination if the `cursor`
+    query parameter is used.
+
+    A keyset page continues after the ordering values of the last result of the
+    previous page, so the results are not counted, the pages don't use an OFFSET
+    and they are stable if results are inserted concurrently. The primary key is
+    added to the ordering as a tiebreaker.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _(
+        "The pagination cursor value. If it's given, the results are paginated with "
+        "cursors instead of page numbers and the total count is omitted. Use an empty "
+        "value to request the first page and follow the `next` links afterwards."
+    )
+    invalid_cursor_message = _("Invalid cursor")
+    key_prefix = "_cursor_key"
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.cursor_mode = True
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        position = self.decode_cursor(request)
+
+        queryset = self.order_by_keys(queryset)
+        if position:
+            queryset = queryset.filter(self.get_after_condition(queryset, position))
+
+        page_size = self.get_page_size(request)
+        results = list(queryset[: page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        return self.page
+
+    def get_ordering(self, queryset) -> list:
+        """return the ordering of the queryset up to and including the primary key"""
+        pk_names = ("pk", queryset.model._meta.pk.name)
+        ordering = []
+        for term in queryset.query.order_by:
+            if not isinstance(term, str) or term == "?":
+                continue
+
+            ordering.append(term)
+            if term.lstrip("-") in pk_names:
+                return ordering
+
+        return ordering + ["-pk"]
+
+    def get_key_name(self, index: int) -> str:
+        return f"{self.key_prefix}_{index}"
+
+    def order_by_keys(self, queryset):
+        """
+        order by the keys of the ordering, the text representation of the keys is
+        annotated to build the cursor of the next page
+        """
+        keys_ordering = []
+        for index, term in enumerate(self.ordering):
+            name = self.get_key_name(index)
+            prefix = "-" if term.startswith("-") else ""
+            queryset = queryset.alias(**{name: F(term.lstrip("-"))}).annotate(
+                **{f"{name}_text": Cast(name, output_field=TextField())}
+            )
+            keys_ordering.append(f"{prefix}{name}")
+
+        return queryset.order_by(*keys_ordering)
+
+    def get_after_condition(self, queryset, position: list) -> Q:
+        """
+        return the condition for the results after the position in the ordering.
+        NULL values are sorted last in ascending and first in descending order.
+        """
+        conditions = []
+        equal = Q()
+        for index, (term, value) in enumerate(zip(self.ordering, position)):
+            name = self.get_key_name(index)
+            descending = term.startswith("-")
+
+            if value is None:
+                if descending:
+                    conditions.append(equal & Q(**{f"{name}__isnull": False}))
+                equal &= Q(**{f"{name}__isnull": True})
+                continue
+
+            output_field = queryset.query.annotations[name].output_field
+            key = Cast(Value(value), output_field=output_field)
+            if descending:
+                after = Q(**{f"{name}__lt": key})
+            else:
+                after = Q(**{f"{name}__gt": key}) | Q(**{f"{name}__isnull": True})
+            conditions.append(equal & after)
+            equal &= Q(**{name: key})
+
+        return reduce(operator.or_, conditions)
+
+    def decode_cursor(self, request) -> list:
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return []
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # the cursor can't be used if the ordering has changed
+        if (
+            not isinstance(cursor, dict)
+            or cursor.get("ordering") != self.ordering
+            or not isinstance(cursor.get("position"), list)
+            or len(cursor["position"]) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor["position"]
+
+    def encode_cursor(self, instance) -> str:
+        # the results are model instances or `.values()` rows
+        get_value = (
+            instance.get if isinstance(instance, dict) else partial(getattr, instance)
+        )
+        position = [
+            get_value(f"{self.get_key_name(index)}_text")
+            for index in range(len(self.ordering))
+        ]
+        cursor = json.dumps({"ordering": self.ordering, "position": position})
+        return urlsafe_b64encode(cursor.encode("ascii")).decode("ascii")
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        )
+        return parameters
+
+
+class HistoryPagination(KeysetPagination):
+    """
+    Keyset pagination of the RECORDs of an OBJECT, which is used only if the `cursor`
+    query parameter is given. Without it all the RECORDs are returned as a list.
+    """
+
+    cursor_query_description = _(
+        "The pagination cursor value. If it's given, the RECORDs are paginated. Use an "
+        "empty value to request the first page and follow the `next` links afterwards."
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return None
+
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "oneOf": [
+                schema,
+                {
+                    "type": "object",
+                    "required": ["next", "results"],
+                    "properties": {
+                        "next": {
+                            "type": "string",
+                            "nullable": True,
+                            "format": "uri",
+                        },
+                        "results": schema,
+                    },
+                },
+            ]
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.page_size_query_description),
+                "schema": {"type": "integer"},
+            },
+        ]
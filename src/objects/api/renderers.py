@@ -0,0 +1,21 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Render newline delimited JSON: every item of a list on its own line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        items = data if isinstance(data, list) else [data]
+        return b"".join(self.render_item(item) for item in items)
+
+    def render_item(self, item) -> bytes:
+        return JSONRenderer().render(item) + b"\n"
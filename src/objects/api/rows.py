@@ -0,0 +1,90 @@
+import json
+from uuid import UUID
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.db import models
+
+from rest_framework.reverse import reverse
+
+from objects.core.models import ObjectRecord
+
+# the maximum number of decimals of ST_AsGeoJSON, which writes the shortest
+# representation of the coordinates up to this number of decimals
+GEOJSON_PRECISION = 15
+
+URL_PLACEHOLDER = str(UUID(int=0))
+
+
+class ObjectRowSerializer:
+    """
+    Read-only serializer, which renders the same data as ``ObjectSerializer`` from
+    ``.values()`` rows of records.
+
+    The rows contain the uuids and the api root of the related objects, the indices
+    of the correcting records and the geometry as GeoJSON, so no model instances and
+    relations are built. The url of the OBJECT is formatted from a template, which
+    is reversed once. Field-based authorization and the `fields` query parameter
+    are not supported, these requests use ``ObjectSerializer``. The data of compacted
+    records is reconstructed per list of rows in ``get_data``.
+    """
+
+    values = (
+        "object_id",
+        "object__uuid",
+        "object__object_type__uuid",
+        "object__object_type__service__api_root",
+        "index",
+        "version",
+        "data",
+        "data_patch",
+        "start_at",
+        "end_at",
+        "registration_at",
+        "correct__index",
+        "corrected__index",
+    )
+    geometry_value = "_geometry_geojson"
+
+    def __init__(self, context: dict):
+        url = reverse(
+            "object-detail",
+            kwargs={"uuid": URL_PLACEHOLDER},
+            request=context.get("request"),
+        )
+        self.url_prefix, self.url_suffix = url.split(URL_PLACEHOLDER)
+
+    @classmethod
+    def get_rows(cls, queryset: models.QuerySet) -> models.QuerySet:
+        return queryset.values(
+            *cls.values,
+            **{cls.geometry_value: AsGeoJSON("geometry", precision=GEOJSON_PRECISION)},
+        )
+
+    def to_representation(self, row: dict) -> dict:
+        uuid = str(row["object__uuid"])
+        geometry = row[self.geometry_value]
+        end_at = row["end_at"]
+        return {
+            "url": f"{self.url_prefix}{uuid}{self.url_suffix}",
+            "uuid": uuid,
+            "type": (
+                f"{row['object__object_type__service__api_root']}"
+                f"objecttypes/{row['object__object_type__uuid']}"
+            ),
+            "record": {
+                "index": row["index"],
+                "typeVersion": row["version"],
+                "data": row["data"],
+                "geometry": json.loads(geometry) if geometry is not None else None,
+                "startAt": row["start_at"].isoformat(),
+                "endAt": end_at.isoformat() if end_at is not None else None,
+                "registrationAt": row["registration_at"].isoformat(),
+                "correctionFor": row["correct__index"],
+                "correctedBy": row["corrected__index"],
+            },
+        }
+
+    def get_data(self, rows) -> list:
+        rows = list(rows)
+        ObjectRecord.objects.reconstruct_rows(rows)
+        return [self.to_representation(row) for row in rows]
@@ -1,3 +1,8 @@
+import json
+from copy import deepcopy
+from typing import Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
@@ -6,14 +11,33 @@ from rest_framework_gis.serializers import GeometryField
 
 from objects.core.models import Object, ObjectRecord, ObjectType
 from objects.token.models import Permission
-from objects.utils.serializers import DynamicFieldsMixin
+from objects.utils.serializers import (
+    DynamicFieldsMixin,
+    QueryFieldsMixin,
+    SelectedFieldsMixin,
+)
 
 from .fields import ObjectSlugRelatedField, ObjectTypeField, ObjectUrlField
 from .utils import merge_patch
 from .validators import GeometryValidator, IsImmutableValidator, JsonSchemaValidator
 
 
-class ObjectRecordSerializer(serializers.ModelSerializer):
+def get_canonical_json(value) -> str:
+    return json.dumps(
+        value, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+    )
+
+
+def is_same_geometry(geometry, other) -> bool:
+    if geometry is None or other is None:
+        return geometry is other
+
+    return (
+        geometry.srid is None or other.srid is None or geometry.srid == other.srid
+    ) and geometry.equals_exact(other)
+
+
+class ObjectRecordSerializer(SelectedFieldsMixin, serializers.ModelSerializer):
     correctionFor = ObjectSlugRelatedField(
         source="correct",
         slug_field="index",
@@ -49,7 +73,9 @@ class ObjectRecordSerializer(serializers.ModelSerializer):
         }
 
 
-class HistoryRecordSerializer(serializers.ModelSerializer):
+class HistoryRecordSerializer(
+    QueryFieldsMixin, SelectedFieldsMixin, serializers.ModelSerializer
+):
     correctionFor = serializers.SlugRelatedField(
         source="correct",
         slug_field="index",
@@ -85,7 +111,9 @@ class HistoryRecordSerializer(serializers.ModelSerializer):
         }
 
 
-class ObjectSerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerializer):
+class ObjectSerializer(
+    DynamicFieldsMixin, SelectedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     url = ObjectUrlField(view_name="object-detail")
     uuid = serializers.UUIDField(
         source="object.uuid",
@@ -113,6 +141,20 @@ class ObjectSerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerialize
         }
         validators = [JsonSchemaValidator(), GeometryValidator()]
 
+    # the data of the new record of a validated update, see `get_record_data`
+    record_data = None
+    # whether the validated update doesn't change the record
+    unchanged = False
+
+    def run_validators(self, value):
+        # the merge patch of partial updates is applied once, here
+        if self.instance is not None and isinstance(value, dict):
+            self.record_data = self.get_record_data(self.instance, value)
+        # unchanged updates are not validated against the JSON schema again, see
+        # `JsonSchemaValidator`
+        self.unchanged = self.is_unchanged(self.instance, self.record_data)
+        super().run_validators(value)
+
     @transaction.atomic
     def create(self, validated_data):
         object_data = validated_data.pop("object")
@@ -124,18 +166,61 @@ class ObjectSerializer(DynamicFieldsMixin, serializers.HyperlinkedModelSerialize
 
     @transaction.atomic
     def update(self, instance, validated_data):
+        if self.unchanged:
+            return instance
+
+        record = super().create(dict(self.record_data))
+        return record
+
+    def get_record_data(self, instance, validated_data) -> dict:
+        """return the data of the new record, which updates the instance"""
+        validated_data = dict(validated_data)
         # object_data is not used since all object attributes are immutable
-        object_data = validated_data.pop("object", None)
+        validated_data.pop("object", None)
         validated_data["object"] = instance.object
         # version should be set
         if "version" not in validated_data:
             validated_data["version"] = instance.version
         if self.partial and "data" in validated_data:
             # Apply JSON Merge Patch for record data
-            validated_data["data"] = merge_patch(instance.data, validated_data["data"])
+            validated_data["data"] = merge_patch(
+                deepcopy(instance.data), validated_data["data"]
+            )
+
+        return validated_data
+
+    def is_unchanged(self, instance, record_data: Optional[dict]) -> bool:
+        """
+        whether the new record of the update, see `get_record_data`, would be the same
+        as the instance: the (merged) data, the geometry, the version and the start
+        date are equal and it doesn't correct another record
+        """
+        if instance is None or record_data is None:
+            return False
+
+        if record_data.get("correct") or "start_at" not in record_data:
+            return False
+
+        geometry = record_data.get("geometry")
+        return (
+            record_data["version"] == instance.version
+            and record_data["start_at"] == instance.start_at
+            and get_canonical_json(record_data.get("data", {}))
+            == get_canonical_json(instance.data)
+            and is_same_geometry(geometry, instance.geometry)
+        )
 
-        record = super().create(validated_data)
-        return record
+
+class BulkResultSerializer(serializers.Serializer):
+    status = serializers.IntegerField(
+        help_text=_("HTTP status code of the creation of the item")
+    )
+    object = ObjectSerializer(
+        required=False, help_text=_("The created OBJECT, if the item is valid")
+    )
+    errors = serializers.DictField(
+        required=False, help_text=_("The validation errors, if the item is invalid")
+    )
 
 
 class GeoWithinSerializer(serializers.Serializer):
@@ -1,8 +1,10 @@
 from datetime import date
+from typing import Iterable, Iterator
 
 from django.db import models
 
-from objects.typing import JSONValue
+from objects.typing import JSONObject, JSONValue
+from objects.utils.json_patch import apply_json_patch, get_json_patch
 
 
 def string_to_value(value: str) -> str | float | date:
@@ -61,3 +63,28 @@ def merge_patch(target: JSONValue, patch: JSONValue) -> dict[str, JSONValue]:
         target[k] = merge_patch(target.get(k), v)
 
     return target
+
+
+def encode_history_delta(records: Iterable[JSONObject]) -> Iterator[JSONObject]:
+    """
+    Return the first record in full and every next record as ``{"patch": [...]}``,
+    the JSON Patch against the previous record.
+    """
+    previous = None
+    for record in records:
+        if previous is None:
+            yield record
+        else:
+            yield {"patch": get_json_patch(previous, record)}
+        previous = record
+
+
+def decode_history_delta(items: Iterable[JSONObject]) -> Iterator[JSONObject]:
+    """Reconstruct the records of `encode_history_delta`."""
+    previous = None
+    for item in items:
+        if previous is not None and set(item) == {"patch"}:
+            previous = apply_json_patch(previous, item["patch"])
+        else:
+            previous = item
+        yield previous
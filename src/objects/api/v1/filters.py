@@ -81,8 +81,18 @@ should be used. If `height` is nested inside `dimensions` attribute, query shoul
         fields = ("type", "data_attrs", "date", "registrationDate")
         form = ObjectRecordFilterForm
 
+    def reconstructs_data(self) -> bool:
+        """
+        whether the data of compacted records is reconstructed to filter on it. Only
+        the records of a past date can be compacted.
+        """
+        cleaned_data = self.form.cleaned_data
+        return bool(cleaned_data.get("date") or cleaned_data.get("registrationDate"))
+
     def filter_data_attrs(self, queryset, name, value: str):
         parts = value.split(",")
+        exact_values = []
+        reconstructed = self.reconstructs_data()
 
         for value_part in parts:
             variable, operator, str_value = value_part.rsplit("__", 2)
@@ -90,23 +100,26 @@ should be used. If `height` is nested inside `dimensions` attribute, query shoul
 
             if operator == "exact":
                 #  for exact operator try to filter on string and numeric values
-                in_vals = [str_value]
-                if real_value != value:
-                    in_vals.append(real_value)
-                queryset = queryset.filter(**{f"data__{variable}__in": in_vals})
+                values = [str_value]
+                if isinstance(real_value, float):
+                    values.append(real_value)
+                exact_values.append((variable.split("__"), values))
             elif operator == "icontains":
                 # icontains treats everything like strings
-                queryset = queryset.filter(
-                    **{f"data__{variable}__icontains": str_value}
+                queryset = queryset.filter_data(
+                    {f"data__{variable}__icontains": str_value},
+                    reconstructed=reconstructed,
                 )
 
             else:
                 # gt, gte, lt, lte operators
-                queryset = queryset.filter(
-                    **{f"data__{variable}__{operator}": real_value}
+                queryset = queryset.filter_data(
+                    {f"data__{variable}__{operator}": real_value},
+                    reconstructed=reconstructed,
                 )
 
-        return queryset
+        # exact values are matched with a single containment predicate
+        return queryset.filter_data_exact(exact_values, reconstructed=reconstructed)
 
     def filter_date(self, queryset, name, value: date):
         return queryset.filter_for_date(value)
@@ -1,4 +1,5 @@
 import datetime
+from typing import Optional
 
 from django.conf import settings
 from django.db import models
@@ -9,8 +10,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from vng_api_common.search import SearchMixin
 
-from objects.core.models import ObjectRecord
-from objects.token.models import Permission
+from objects.core.models import ObjectRecord, ObjectType
 from objects.token.permissions import ObjectTypeBasedPermission
 
 from ..kanalen import KANAAL_OBJECTEN
@@ -63,18 +63,12 @@ class ObjectViewSet(
     search_input_serializer_class = ObjectSearchSerializer
     permission_classes = [ObjectTypeBasedPermission]
     notifications_kanaal = KANAAL_OBJECTEN
+    # whether the list shows the latest records, see `get_queryset`
+    shows_latest_records = False
 
     def get_queryset(self):
         base = super().get_queryset()
         token_auth = getattr(self.request, "auth", None)
-        # prefetch permissions for DB optimization. Used in DynamicFieldsMixin
-        base = base.prefetch_related(
-            models.Prefetch(
-                "object__object_type__permissions",
-                queryset=Permission.objects.filter(token_auth=token_auth),
-                to_attr="token_permissions",
-            ),
-        )
 
         if self.action not in ("list", "search"):
             return base
@@ -83,18 +77,54 @@ class ObjectViewSet(
         base = base.filter_for_token(token_auth)
 
         # show only actual objects
+        if self.shows_actual_records():
+            today = datetime.date.today()
+            # an object whose latest record starts in the future shows an earlier
+            # record today, which is found like for the `date` query parameter
+            # only the objects of the requested OBJECTTYPE are shown
+            object_type = self.get_requested_object_type()
+            requested = base.filter(_object_type=object_type) if object_type else base
+            self.shows_latest_records = not requested.has_latest_records_after(today)
+            if self.shows_latest_records:
+                base = base.keep_latest_record_per_object()
+            else:
+                base = base.filter_for_date(today)
+        else:
+            # the records of a past date can be compacted
+            base = base.with_reconstructed_data()
+
+        return base
+
+    def get_requested_object_type(self) -> Optional[ObjectType]:
+        """return the OBJECTTYPE of the `type` query parameter, if it's valid"""
+        object_type_url = getattr(self.request, "query_params", {}).get("type")
+        if not object_type_url:
+            return None
+
+        try:
+            return ObjectType.objects.get_by_url(object_type_url)
+        except (ObjectType.DoesNotExist, ValueError, TypeError):
+            # the filter returns the error
+            return None
+
+    def shows_actual_records(self) -> bool:
+        """whether the list shows the records as seen today"""
+        if self.action not in ("list", "search"):
+            return False
+
         date = getattr(self.request, "query_params", {}).get("date", None)
         registration_date = getattr(self.request, "query_params", {}).get(
             "registrationDate", None
         )
-        if not date and not registration_date:
-            base = base.filter_for_date(datetime.date.today())
-
-        return base
+        return not date and not registration_date
 
     def filter_queryset(self, queryset):
         queryset = super().filter_queryset(queryset)
 
+        # the latest records are already one per object
+        if self.shows_latest_records:
+            return queryset
+
         # keep only records with max index per object
         return queryset.keep_max_record_per_object()
 
@@ -108,7 +138,9 @@ class ObjectViewSet(
     @action(detail=True, methods=["get"], serializer_class=HistoryRecordSerializer)
     def history(self, request, uuid=None):
         """Retrieve all RECORDs of an OBJECT."""
-        records = self.get_object().object.records.order_by("id")
+        records = (
+            self.get_object().object.records.order_by("id").with_reconstructed_data()
+        )
         serializer = self.get_serializer(records, many=True)
         return Response(serializer.data)
 
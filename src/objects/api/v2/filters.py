@@ -1,12 +1,14 @@
 from datetime import date as date_
 
 from django import forms
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 from django_filters import filters
 from rest_framework import serializers
 from vng_api_common.filtersets import FilterSet
 
+from objects.core.constants import IndexStatus
 from objects.core.models import ObjectRecord, ObjectType
 from objects.utils.filters import ObjectTypeFilter
 
@@ -91,40 +93,133 @@ should be used. If `height` is nested inside `dimensions` attribute, query shoul
         fields = ("type", "data_attrs", "date", "registrationDate")
         form = ObjectRecordFilterForm
 
+    def get_indexed_attributes(self) -> dict:
+        """return the indexed attributes of the filtered OBJECTTYPE per path"""
+        object_type = self.form.cleaned_data.get("type")
+        if not object_type:
+            return {}
+
+        # the index of a pending attribute isn't built yet
+        return {
+            indexed_attribute.path: indexed_attribute
+            for indexed_attribute in object_type.indexed_attributes.filter(
+                index_status=IndexStatus.ready
+            )
+        }
+
+    def reconstructs_data(self) -> bool:
+        """
+        whether the data of compacted records is reconstructed to filter on it. Only
+        the records of a past date can be compacted.
+        """
+        cleaned_data = self.form.cleaned_data
+        return bool(cleaned_data.get("date") or cleaned_data.get("registrationDate"))
+
     def filter_data_attrs(self, queryset, name, value: str):
         parts = value.split(",")
+        exact_values = []
+        reconstructed = self.reconstructs_data()
+        # the indexes don't contain the data of compacted records
+        indexed_attributes = {} if reconstructed else self.get_indexed_attributes()
 
         for value_part in parts:
             variable, operator, str_value = value_part.rsplit("__", 2)
             real_value = string_to_value(str_value)
 
-            if operator == "exact":
-                #  for exact operator try to filter on string and numeric values
-                in_vals = [str_value]
-                if real_value != value:
-                    in_vals.append(real_value)
-                queryset = queryset.filter(**{f"data__{variable}__in": in_vals})
+            #  for exact operator try to filter on string and numeric values
+            values = [str_value]
+            if isinstance(real_value, float):
+                values.append(real_value)
+
+            indexed_attribute = indexed_attributes.get(variable)
+            if indexed_attribute and indexed_attribute.supports(operator, str_value):
+                # the index compares the same JSON values as the filters below
+                if operator == "exact":
+                    queryset = queryset.filter_indexed_attribute(
+                        indexed_attribute, "in", values
+                    )
+                else:
+                    queryset = queryset.filter_indexed_attribute(
+                        indexed_attribute, operator, real_value
+                    )
+            elif operator == "exact":
+                exact_values.append((variable.split("__"), values))
             elif operator == "icontains":
                 # icontains treats everything like strings
-                queryset = queryset.filter(
-                    **{f"data__{variable}__icontains": str_value}
+                queryset = queryset.filter_data(
+                    {f"data__{variable}__icontains": str_value},
+                    reconstructed=reconstructed,
                 )
 
             else:
                 # gt, gte, lt, lte operators
-                queryset = queryset.filter(
-                    **{f"data__{variable}__{operator}": real_value}
+                queryset = queryset.filter_data(
+                    {f"data__{variable}__{operator}": real_value},
+                    reconstructed=reconstructed,
                 )
 
-        return queryset
+        # exact values are matched with a single containment predicate
+        return queryset.filter_data_exact(exact_values, reconstructed=reconstructed)
 
     def filter_data_icontains(self, queryset, name, value: str):
-        # WHERE clause has jsonpath: where data @? '$.** ? (@ like_regex "$value" flag "i")'
-        where_str = "core_objectrecord.data @? CONCAT('$.** ? (@ like_regex \"',%s::text,'\" flag \"i\")')::jsonpath"
-        return queryset.extra(where=[where_str], params=[value])
+        if settings.DATA_ICONTAINS_MODE == "jsonpath":
+            return queryset.filter_data_like_regex(
+                value, reconstructed=self.reconstructs_data()
+            )
+
+        # the search text of compacted records is kept
+        return queryset.filter_data_icontains(value)
 
     def filter_date(self, queryset, name, value: date_):
         return queryset.filter_for_date(value)
 
     def filter_registration_date(self, queryset, name, value: date_):
         return queryset.filter_for_registration_date(value)
+
+
+class HistoryRecordFilterSet(FilterSet):
+    index__gte = filters.NumberFilter(
+        field_name="index",
+        lookup_expr="gte",
+        help_text=_("Only include records with an `index` greater than or equal to"),
+    )
+    index__lte = filters.NumberFilter(
+        field_name="index",
+        lookup_expr="lte",
+        help_text=_("Only include records with an `index` less than or equal to"),
+    )
+    startAt__gte = filters.DateFilter(
+        field_name="start_at",
+        lookup_expr="gte",
+        help_text=_("Only include records with a `startAt` on or after the date"),
+    )
+    startAt__lte = filters.DateFilter(
+        field_name="start_at",
+        lookup_expr="lte",
+        help_text=_("Only include records with a `startAt` on or before the date"),
+    )
+    registrationAt__gte = filters.DateFilter(
+        field_name="registration_at",
+        lookup_expr="gte",
+        help_text=_(
+            "Only include records with a `registrationAt` on or after the date"
+        ),
+    )
+    registrationAt__lte = filters.DateFilter(
+        field_name="registration_at",
+        lookup_expr="lte",
+        help_text=_(
+            "Only include records with a `registrationAt` on or before the date"
+        ),
+    )
+
+    class Meta:
+        model = ObjectRecord
+        fields = (
+            "index__gte",
+            "index__lte",
+            "startAt__gte",
+            "startAt__lte",
+            "registrationAt__gte",
+            "registrationAt__lte",
+        )
@@ -1,30 +1,65 @@
 import datetime
+from functools import partial
+from itertools import islice
+from typing import Callable, Optional
+from uuid import UUID
 
 from django.conf import settings
 from django.db import models
+from django.http import StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.translation import gettext_lazy as _
 
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import mixins, viewsets
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import BooleanField
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from vng_api_common.filters import Backend as FilterBackend
+from vng_api_common.geo import HEADER_ACCEPT, extract_header
+from vng_api_common.notifications.viewsets import conditional_atomic
+from vng_api_common.permissions import bypass_permissions
 from vng_api_common.search import SearchMixin
 
-from objects.core.models import ObjectRecord
+from objects.core.models import Object, ObjectRecord, ObjectType
+from objects.token.constants import PermissionModes
 from objects.token.models import Permission
 from objects.token.permissions import ObjectTypeBasedPermission
+from objects.utils.serializers import get_selected_names, parse_fields
 
+from ..cache import response_cache
+from ..etags import conditional_response, get_etag, get_permission_fingerprint
 from ..filter_backends import OrderingBackend
 from ..kanalen import KANAAL_OBJECTEN
 from ..mixins import GeoMixin, ObjectNotificationMixin
-from ..pagination import DynamicPageSizePagination
+from ..pagination import DynamicPageSizePagination, HistoryPagination, KeysetPagination
+from ..renderers import NDJSONRenderer
+from ..rows import ObjectRowSerializer
 from ..serializers import (
+    BulkResultSerializer,
     HistoryRecordSerializer,
+    ObjectRecordSerializer,
     ObjectSearchSerializer,
     ObjectSerializer,
     PermissionSerializer,
 )
-from .filters import ObjectRecordFilterSet
+from ..utils import encode_history_delta
+from .filters import HistoryRecordFilterSet, ObjectRecordFilterSet
+
+
+def parse_uuid(value) -> UUID:
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+BULK_PERMISSION_DENIED = {
+    "status": status.HTTP_403_FORBIDDEN,
+    "errors": {"detail": _("You do not have permission to perform this action.")},
+}
 
 
 @extend_schema_view(
@@ -39,11 +74,15 @@ from .filters import ObjectRecordFilterSet
     ),
     create=extend_schema(description="Create an OBJECT and its initial RECORD."),
     update=extend_schema(
-        description="Update the OBJECT by creating a new RECORD with the updates values."
+        description="Update the OBJECT by creating a new RECORD with the updates values. "
+        "If the values are the same as the actual RECORD, no RECORD is created and "
+        "the actual RECORD is returned."
     ),
     partial_update=extend_schema(
         description="Update the OBJECT by creating a new RECORD with the updates values. "
-        "The provided `record.data` value will be merged recursively with the existing record data."
+        "The provided `record.data` value will be merged recursively with the existing record data. "
+        "If the values are the same as the actual RECORD, no RECORD is created and "
+        "the actual RECORD is returned."
     ),
     destroy=extend_schema(
         description="Delete an OBJECT and all RECORDs belonging to it.",
@@ -69,56 +108,513 @@ class ObjectViewSet(
     lookup_url_kwarg = "uuid"
     search_input_serializer_class = ObjectSearchSerializer
     permission_classes = [ObjectTypeBasedPermission]
-    pagination_class = DynamicPageSizePagination
+    pagination_class = KeysetPagination
     notifications_kanaal = KANAAL_OBJECTEN
+    export_chunk_size = 1000
+    bulk_max_size = 500
+    response_cache_key = None
+    # the change counters of the OBJECTTYPEs, see `get_generations`
+    object_type_generations = None
+    # whether the list shows the latest records, see `get_queryset`
+    shows_latest_records = False
 
     def get_queryset(self):
         base = super().get_queryset()
         token_auth = getattr(self.request, "auth", None)
-        # prefetch permissions for DB optimization. Used in DynamicFieldsMixin
-        base = base.prefetch_related(
-            models.Prefetch(
-                "object__object_type__permissions",
-                queryset=Permission.objects.filter(token_auth=token_auth),
-                to_attr="token_permissions",
-            ),
-        )
 
-        if self.action not in ("list", "search"):
+        if self.action not in ("list", "search", "export"):
             return base
 
+        # the search text is only used for filtering
+        base = base.defer("_search_text")
+
         # show only allowed objects
         base = base.filter_for_token(token_auth)
 
         # show only actual objects
+        if self.shows_actual_records():
+            today = datetime.date.today()
+            # an object whose latest record starts in the future shows an earlier
+            # record today, which is found like for the `date` query parameter
+            # only the objects of the requested OBJECTTYPE are shown
+            object_type = self.get_requested_object_type()
+            requested = base.filter(_object_type=object_type) if object_type else base
+            self.shows_latest_records = not requested.has_latest_records_after(today)
+            if self.shows_latest_records:
+                base = base.keep_latest_record_per_object()
+            else:
+                base = base.filter_for_date(today)
+        else:
+            # the records of a past date can be compacted
+            base = base.with_reconstructed_data()
+
+        return base
+
+    def get_requested_object_type(self) -> Optional[ObjectType]:
+        """return the OBJECTTYPE of the `type` query parameter, if it's valid"""
+        object_type_url = getattr(self.request, "query_params", {}).get("type")
+        if not object_type_url:
+            return None
+
+        try:
+            return ObjectType.objects.get_by_url(object_type_url)
+        except (ObjectType.DoesNotExist, ValueError, TypeError):
+            # the filter returns the error
+            return None
+
+    def shows_actual_records(self) -> bool:
+        """whether the list shows the records as seen today"""
+        if self.action not in ("list", "search", "export"):
+            return False
+
         date = getattr(self.request, "query_params", {}).get("date", None)
         registration_date = getattr(self.request, "query_params", {}).get(
             "registrationDate", None
         )
-        if not date and not registration_date:
-            base = base.filter_for_date(datetime.date.today())
-
-        return base
+        return not date and not registration_date
 
     def filter_queryset(self, queryset):
+        # the filters of the history apply to the RECORDs of the OBJECT, see
+        # `get_history_queryset`
+        if self.action == "history":
+            return queryset.keep_max_record_per_object()
+
         queryset = super().filter_queryset(queryset)
 
-        # keep only records with max index per object
-        return queryset.keep_max_record_per_object()
+        # the latest records are already one per object, otherwise keep only records
+        # with max index per object
+        if not self.shows_latest_records:
+            queryset = queryset.keep_max_record_per_object()
+
+        return self.select_fields(queryset)
+
+    def get_selected_fields(self) -> Optional[set]:
+        """
+        return the field paths requested with the `fields` query parameter and the
+        fields of the field-based permissions of the token, or None if all the fields
+        are requested
+        """
+        if self.action not in ("list", "search", "export", "history"):
+            return None
+
+        query_fields = parse_fields(self.request.query_params.get("fields"))
+        if not query_fields:
+            return None
+
+        selected_fields = set(query_fields)
+        # the history is not allowed with field-based authorization
+        if self.action == "history":
+            return selected_fields
+
+        auth_context = getattr(self.request.auth, "auth_context", None)
+        if auth_context:
+            for permission in auth_context.permissions.values():
+                if permission.use_fields:
+                    for fields in permission.fields.values():
+                        selected_fields.update(fields)
+        return selected_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["selected_fields"] = self.get_selected_fields()
+        return context
+
+    def select_fields(self, queryset: models.QuerySet) -> models.QuerySet:
+        """load only the columns and the relations of the selected fields"""
+        selected_fields = self.get_selected_fields()
+        if selected_fields is None:
+            return queryset
+
+        record_fields = get_selected_names(selected_fields, "record")
+        if record_fields is None:
+            return queryset
+
+        related = ["object__object_type__service"]
+        if "correctionFor" in record_fields:
+            related.append("correct")
+        if "correctedBy" in record_fields:
+            related.append("corrected")
+        queryset = queryset.select_related(None).select_related(*related)
+
+        if "geometry" not in record_fields:
+            queryset = queryset.defer("geometry")
+
+        if "data" not in record_fields:
+            return queryset.defer("data", "data_patch")
+
+        data_keys = get_selected_names(selected_fields, "record__data")
+        if data_keys is not None:
+            queryset = queryset.project_data(sorted(data_keys))
+        return queryset
+
+    def uses_row_serializer(self) -> bool:
+        """
+        whether the records are rendered from rows with ``ObjectRowSerializer``,
+        which is only possible if all the fields of the records are shown
+        """
+        if self.action not in ("list", "search", "export"):
+            return False
+
+        if parse_fields(self.request.query_params.get("fields")):
+            return False
+
+        auth_context = getattr(self.request.auth, "auth_context", None)
+        if not auth_context:
+            return False
+
+        return not any(
+            permission.mode == PermissionModes.read_only and permission.use_fields
+            for permission in auth_context.permissions.values()
+        )
+
+    def get_rows_output(self, queryset: models.QuerySet) -> Response:
+        serializer = ObjectRowSerializer(context=self.get_serializer_context())
+        rows = serializer.get_rows(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.get_data(page))
+
+        return Response(serializer.get_data(rows))
+
+    def get_etag_parts(self) -> list:
+        """the parts of the ETags which are shared by all the endpoints"""
+        return [
+            self.request.build_absolute_uri(),
+            extract_header(self.request, HEADER_ACCEPT),
+            getattr(self.request, "accepted_media_type", None),
+        ]
+
+    def get_object_etag(self) -> Optional[str]:
+        """
+        return the ETag of the OBJECT of the detail url and its RECORDs, which is
+        based on the index and the modification time of the latest record, or of
+        all the records for the history, and the url of the OBJECTTYPE. It's found
+        with a single indexed query, without loading the record. Return None if the
+        OBJECT can't be shown, the view responds with an error then.
+        """
+        uuid = parse_uuid(self.kwargs.get(self.lookup_url_kwarg))
+        if not uuid:
+            return None
+
+        latest_records = ObjectRecord.objects.filter(object__uuid=uuid, is_latest=True)
+        if self.action == "history":
+            # the earlier records can be changed in the admin as well
+            latest_records = latest_records.annotate(
+                last_modified_at=models.Subquery(
+                    ObjectRecord.objects.filter(object=models.OuterRef("object"))
+                    .order_by("-modified_at")
+                    .values("modified_at")[:1]
+                )
+            )
+        else:
+            latest_records = latest_records.annotate(
+                last_modified_at=models.F("modified_at")
+            )
+
+        latest_record = latest_records.values_list(
+            "index",
+            "last_modified_at",
+            "_object_type",
+            "_object_type__uuid",
+            "_object_type__service__api_root",
+        ).first()
+        if not latest_record:
+            return None
+
+        index, modified_at, object_type_id, *object_type_url = latest_record
+        if bypass_permissions(self.request):
+            permission_fingerprint = None
+        else:
+            permission = self.request.auth.auth_context.permissions.get(object_type_id)
+            if not permission:
+                return None
+
+            # history is forbidden if there is field based auth
+            if (
+                self.action == "history"
+                and permission.mode == PermissionModes.read_only
+                and permission.use_fields
+            ):
+                return None
+
+            permission_fingerprint = get_permission_fingerprint(permission)
+
+        return get_etag(
+            *self.get_etag_parts(),
+            str(uuid),
+            index,
+            modified_at,
+            *object_type_url,
+            permission_fingerprint,
+        )
+
+    def get_list_etag(self) -> Optional[str]:
+        """
+        return the ETag of a list of OBJECTs of a single OBJECTTYPE, which is based
+        on the change counter of the OBJECTTYPE. The actual records depend on the
+        current date, so it's part of the ETag as well.
+        """
+        object_type_url = self.request.query_params.get("type")
+        if not object_type_url:
+            return None
+
+        try:
+            object_type = ObjectType.objects.get_by_url(object_type_url)
+        except (ObjectType.DoesNotExist, ValueError, TypeError):
+            return None
+
+        generation = self.get_generations([object_type.pk]).get(object_type.pk)
+        if generation is None:
+            return None
+
+        auth_context = getattr(self.request.auth, "auth_context", None)
+        permission = (
+            auth_context.permissions.get(object_type.pk) if auth_context else None
+        )
+        return get_etag(
+            *self.get_etag_parts(),
+            object_type.pk,
+            generation,
+            datetime.date.today(),
+            get_permission_fingerprint(permission),
+        )
+
+    def get_generations(self, object_type_ids: list) -> dict:
+        """
+        return the change counters of the OBJECTTYPEs, which are looked up once per
+        request for the ETag and the key of the response cache
+        """
+        if self.object_type_generations is None:
+            self.object_type_generations = {}
+
+        missing_ids = [
+            pk for pk in object_type_ids if pk not in self.object_type_generations
+        ]
+        if missing_ids:
+            self.object_type_generations.update(
+                ObjectType.objects.filter(pk__in=missing_ids).values_list(
+                    "pk", "generation"
+                )
+            )
+        return {
+            pk: self.object_type_generations[pk]
+            for pk in object_type_ids
+            if pk in self.object_type_generations
+        }
+
+    def get_response_cache_key(self) -> Optional[str]:
+        """
+        return the key of the response in the response cache, which contains the
+        normalized request, the permissions of the token and the change counters of
+        the OBJECTTYPEs which can be in the response. Return None if the response
+        isn't cached.
+        """
+        if not response_cache.enabled or bypass_permissions(self.request):
+            return None
+
+        auth_context = getattr(self.request.auth, "auth_context", None)
+        if not auth_context:
+            return None
+
+        object_type_ids = sorted(auth_context.permissions)
+        object_type_url = self.request.query_params.get("type")
+        if object_type_url:
+            try:
+                object_type = ObjectType.objects.get_by_url(object_type_url)
+            except (ObjectType.DoesNotExist, ValueError, TypeError):
+                return None
+
+            object_type_ids = [pk for pk in object_type_ids if pk == object_type.pk]
+
+        generations = sorted(self.get_generations(object_type_ids).items())
+        return response_cache.get_key(
+            self.action,
+            self.request.build_absolute_uri(self.request.path),
+            sorted(
+                (name, sorted(values))
+                for name, values in self.request.query_params.lists()
+            ),
+            self.request.data if self.action == "search" else None,
+            extract_header(self.request, HEADER_ACCEPT),
+            datetime.date.today(),
+            [
+                get_permission_fingerprint(auth_context.permissions[pk])
+                for pk in object_type_ids
+            ],
+            generations,
+        )
+
+    def get_cached_response(self, get_response: Callable[[], Response]) -> Response:
+        """
+        return the cached response data or the response of `get_response`, which is
+        stored in the response cache by `finalize_response`
+        """
+        key = self.get_response_cache_key()
+        if key is None:
+            return get_response()
+
+        cached = response_cache.get(key)
+        if cached is not None:
+            data, unauthorized_fields = cached
+            if unauthorized_fields:
+                self.headers[settings.UNAUTHORIZED_FIELDS_HEADER] = unauthorized_fields
+            return Response(data)
+
+        self.response_cache_key = key
+        return get_response()
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            self.get_object_etag(),
+            partial(super().retrieve, request, *args, **kwargs),
+        )
+
+    def list(self, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            self.get_list_etag(),
+            partial(self.get_list_response, request, *args, **kwargs),
+        )
+
+    def get_list_response(self, request, *args, **kwargs) -> Response:
+        if not self.uses_row_serializer():
+            return self.get_cached_response(
+                partial(super().list, request, *args, **kwargs)
+            )
+
+        return self.get_cached_response(
+            lambda: self.get_rows_output(self.filter_queryset(self.get_queryset()))
+        )
 
     def perform_destroy(self, instance):
         instance.object.delete()
 
     @extend_schema(
-        description="Retrieve all RECORDs of an OBJECT.",
+        description="Retrieve all RECORDs of an OBJECT. The RECORDs are paginated if "
+        "the `cursor` query parameter is given. With the `Accept: application/x-ndjson` "
+        "header all the RECORDs are streamed as newline delimited JSON instead.",
+        parameters=[
+            OpenApiParameter(
+                name="delta",
+                type=bool,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=_(
+                    "Show the first RECORD in full and every next RECORD as "
+                    '`{"patch": [...]}`, a JSON Patch (RFC 6902) against the previous '
+                    "RECORD. Every page starts with a full RECORD."
+                ),
+            )
+        ],
         responses={"200": HistoryRecordSerializer(many=True)},
     )
-    @action(detail=True, methods=["get"], serializer_class=HistoryRecordSerializer)
+    @action(
+        detail=True,
+        methods=["get"],
+        serializer_class=HistoryRecordSerializer,
+        filterset_class=HistoryRecordFilterSet,
+        filter_backends=[FilterBackend],
+        pagination_class=HistoryPagination,
+        renderer_classes=[JSONRenderer, NDJSONRenderer],
+    )
     def history(self, request, uuid=None):
         """Retrieve all RECORDs of an OBJECT."""
-        records = self.get_object().object.records.order_by("id")
+        return conditional_response(
+            request, self.get_object_etag(), self.get_history_response
+        )
+
+    def get_history_response(self) -> HttpResponseBase:
+        self.validate_history_fields()
+        records = self.get_history_queryset(self.get_object().object)
+
+        encode = encode_history_delta if self.uses_history_delta() else iter
+
+        renderer = self.request.accepted_renderer
+        if isinstance(renderer, NDJSONRenderer):
+            rows = encode(self.serialize_in_chunks(records))
+            content = (renderer.render_item(row) for row in rows)
+            return StreamingHttpResponse(content, content_type=renderer.media_type)
+
+        # every page starts with a full RECORD
+        page = self.paginate_queryset(records)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(list(encode(serializer.data)))
+
         serializer = self.get_serializer(records, many=True)
-        return Response(serializer.data)
+        return Response(list(encode(serializer.data)))
+
+    def uses_history_delta(self) -> bool:
+        """whether the RECORDs after the first are shown as JSON Patches"""
+        value = self.request.query_params.get("delta")
+        if value is None:
+            return False
+
+        try:
+            return BooleanField().to_internal_value(value)
+        except ValidationError as exc:
+            raise ValidationError({"delta": exc.detail})
+
+    def validate_history_fields(self) -> None:
+        """
+        validate the `fields` of the history before the RECORDs are serialized, since
+        the errors can't be returned once the RECORDs are streamed
+        """
+        field_names = HistoryRecordSerializer.Meta.fields
+        invalid = sorted(
+            path
+            for path in parse_fields(self.request.query_params.get("fields"))
+            if path.split("__")[0] not in field_names
+            or ("__" in path and not path.startswith("data__"))
+        )
+        if invalid:
+            raise ValidationError(
+                {
+                    "fields": [
+                        _("'fields' query parameter has invalid values: %(fields)s")
+                        % {"fields": ", ".join(invalid)}
+                    ]
+                },
+                code="invalid-fields",
+            )
+
+    def get_history_queryset(self, object: Object) -> models.QuerySet:
+        """
+        filter the RECORDs of the OBJECT and load only the columns and the relations
+        of the selected fields. The corrections are joined instead of being loaded
+        per RECORD.
+        """
+        records = super().filter_queryset(object.records.order_by("id"))
+
+        selected_fields = self.get_selected_fields()
+        names = (
+            get_selected_names(selected_fields) if selected_fields is not None else None
+        )
+        related = [
+            relation
+            for name, relation in (
+                ("correctionFor", "correct"),
+                ("correctedBy", "corrected"),
+            )
+            if names is None or name in names
+        ]
+        # only the index of the corrections is shown
+        deferred = ["_search_text"] + [
+            f"{relation}__{column}"
+            for relation in related
+            for column in ("data", "data_patch", "geometry", "_search_text")
+        ]
+        if names is not None:
+            if "data" not in names:
+                deferred += ["data", "data_patch"]
+            if "geometry" not in names:
+                deferred.append("geometry")
+
+        return (
+            records.select_related(*related).defer(*deferred).with_reconstructed_data()
+        )
 
     @extend_schema(
         description="Perform a (geo) search on OBJECTs.",
@@ -129,12 +625,19 @@ class ObjectViewSet(
     def search(self, request):
         """Perform a (geo) search on OBJECTs"""
         search_input = self.get_search_input()
+        # the queryset is only built if the response isn't cached
+        return self.get_cached_response(partial(self.get_search_response, search_input))
+
+    def get_search_response(self, search_input: dict) -> Response:
         queryset = self.filter_queryset(self.get_queryset())
 
         if "geometry" in search_input:
             within = search_input["geometry"]["within"]
             queryset = queryset.filter(geometry__within=within).distinct()
 
+        if self.uses_row_serializer():
+            return self.get_rows_output(queryset)
+
         return self.get_search_output(queryset)
 
     def get_search_output(self, queryset: models.QuerySet) -> Response:
@@ -149,22 +652,449 @@ class ObjectViewSet(
     # for OAS generation
     search.is_search_action = True
 
+    @extend_schema(
+        description="Create multiple OBJECTs and their initial RECORD in a single "
+        "request. The valid items are created in one transaction, the result of every "
+        "item is returned in the order of the request. The response status is 201 if "
+        "all items are created, 207 if some of the items are created and 400 if none "
+        "of them are created.",
+        request=ObjectSerializer(many=True),
+        responses={
+            "201": BulkResultSerializer(many=True),
+            "207": BulkResultSerializer(many=True),
+            "400": BulkResultSerializer(many=True),
+        },
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Create multiple OBJECTs"""
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        valid_items = self.validate_bulk_create_items(items, results)
+
+        with conditional_atomic(self.notifications_wrap_in_atomic_block)():
+            records = ObjectRecord.objects.bulk_create_with_objects(
+                [
+                    ObjectRecord(object=Object(**object_data), **record_data)
+                    for position, object_data, record_data in valid_items
+                ]
+            )
+            data = self.get_bulk_data(records)
+            self.notify_bulk(data, records)
+
+        positions = [position for position, *item_data in valid_items]
+        return self.get_bulk_response(results, positions, data, status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description="Update multiple OBJECTs by creating a new RECORD with the updated "
+        "values for each of them. Every item should contain the `uuid` of the OBJECT. "
+        "The valid items are updated in one transaction, the result of every item is "
+        "returned in the order of the request. The response status is 200 if all "
+        "items are updated, 207 if some of the items are updated and 400 if none of "
+        "them are updated. Unchanged items return the actual RECORD of the OBJECT.",
+        request=ObjectSerializer(many=True),
+        responses={
+            "200": BulkResultSerializer(many=True),
+            "207": BulkResultSerializer(many=True),
+            "400": BulkResultSerializer(many=True),
+        },
+    )
+    @bulk.mapping.put
+    def bulk_update(self, request):
+        """Update multiple OBJECTs"""
+        return self.perform_bulk_update(request, partial=False)
+
+    @extend_schema(
+        description="Update multiple OBJECTs by creating a new RECORD with the updated "
+        "values for each of them. The provided `record.data` values are merged "
+        "recursively with the existing record data. Every item should contain the "
+        "`uuid` of the OBJECT. The valid items are updated in one transaction, the "
+        "result of every item is returned in the order of the request. The response "
+        "status is 200 if all items are updated, 207 if some of the items are updated "
+        "and 400 if none of them are updated. Unchanged items return the actual RECORD "
+        "of the OBJECT.",
+        request=ObjectSerializer(many=True),
+        responses={
+            "200": BulkResultSerializer(many=True),
+            "207": BulkResultSerializer(many=True),
+            "400": BulkResultSerializer(many=True),
+        },
+    )
+    @bulk.mapping.patch
+    def bulk_partial_update(self, request):
+        """Partially update multiple OBJECTs"""
+        return self.perform_bulk_update(request, partial=True)
+
+    def perform_bulk_update(self, request, partial: bool) -> Response:
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+
+        with conditional_atomic(self.notifications_wrap_in_atomic_block)():
+            valid_items = self.validate_bulk_update_items(items, results, partial)
+            changed_items = [
+                (position, record_data)
+                for position, record_data, unchanged_record in valid_items
+                if unchanged_record is None
+            ]
+            records = ObjectRecord.objects.bulk_create_next_records(
+                [ObjectRecord(**record_data) for position, record_data in changed_items]
+            )
+            data = self.get_bulk_data(records)
+            self.notify_bulk(
+                data, records, action="partial_update" if partial else "update"
+            )
+
+            # unchanged items return their current record and are not notified
+            unchanged_items = [
+                (position, unchanged_record)
+                for position, record_data, unchanged_record in valid_items
+                if unchanged_record is not None
+            ]
+            unchanged_data = self.get_bulk_data(
+                [record for position, record in unchanged_items]
+            )
+
+        positions = [position for position, record_data in changed_items] + [
+            position for position, record in unchanged_items
+        ]
+        return self.get_bulk_response(
+            results, positions, [*data, *unchanged_data], status.HTTP_200_OK
+        )
+
+    def get_bulk_items(self, request) -> list:
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError(
+                _("Expected a list of objects."), code="invalid-bulk-data"
+            )
+        if len(items) > self.bulk_max_size:
+            raise ValidationError(
+                _("At most %(max)s objects can be processed in one request.")
+                % {"max": self.bulk_max_size},
+                code="bulk-max-size",
+            )
+        return items
+
+    def get_bulk_data(self, records: list) -> list:
+        models.prefetch_related_objects(
+            records, *self.get_queryset()._prefetch_related_lookups
+        )
+        return self.get_serializer(records, many=True).data
+
+    def get_bulk_response(
+        self, results: list, positions: list, data: list, success_status: int
+    ) -> Response:
+        """add the processed items to the results of the invalid items"""
+        for position, item_data in zip(positions, data):
+            results[position] = {"status": success_status, "object": item_data}
+
+        if len(positions) == len(results):
+            response_status = success_status
+        elif positions:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=response_status)
+
+    def has_write_permission(self, object_type) -> bool:
+        if bypass_permissions(self.request):
+            return True
+
+        permission = self.request.auth.get_permission_for_object_type(object_type)
+        return bool(permission and permission.mode == PermissionModes.read_and_write)
+
+    def validate_bulk_create_items(self, items: list, results: list) -> list:
+        """
+        validate the items and store the errors of invalid items in the results.
+
+        The OBJECTTYPEs, their JSON schemas and the permissions are looked up once per
+        OBJECTTYPE (version) for all items.
+        """
+        valid_items = []
+        for position, item in enumerate(items):
+            serializer = self.get_serializer(data=item)
+            if not serializer.is_valid():
+                results[position] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": serializer.errors,
+                }
+                continue
+
+            record_data = dict(serializer.validated_data)
+            object_data = record_data.pop("object")
+            if not self.has_write_permission(object_data["object_type"]):
+                results[position] = BULK_PERMISSION_DENIED
+                continue
+
+            valid_items.append((position, object_data, record_data))
+
+        # the uuids of the objects must be unique
+        uuids = [item[1]["uuid"] for item in valid_items if item[1].get("uuid")]
+        existing_uuids = set(
+            Object.objects.filter(uuid__in=uuids).values_list("uuid", flat=True)
+        )
+        unique_items = []
+        for position, object_data, record_data in valid_items:
+            uuid = object_data.get("uuid")
+            if uuid and uuid in existing_uuids:
+                results[position] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": {"uuid": [_("An OBJECT with this uuid already exists.")]},
+                }
+                continue
+
+            if uuid:
+                existing_uuids.add(uuid)
+            unique_items.append((position, object_data, record_data))
+
+        return unique_items
+
+    def validate_bulk_update_items(
+        self, items: list, results: list, partial: bool
+    ) -> list:
+        """
+        validate the items against the latest records of their objects and store the
+        errors of invalid items in the results. The objects are locked until the end
+        of the transaction, like in `ObjectRecord.save`. Unchanged items keep their
+        latest record.
+        """
+        uuids = [
+            parse_uuid(item.get("uuid")) if isinstance(item, dict) else None
+            for item in items
+        ]
+        existing_uuids = [uuid for uuid in uuids if uuid]
+        # the objects are locked before their latest records are read, so the records
+        # are read in a new snapshot after concurrent updates of the objects commit
+        list(
+            Object.objects.select_for_update()
+            .filter(uuid__in=existing_uuids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        latest_records = {
+            record.object.uuid: record
+            for record in self.get_queryset().filter(
+                object__uuid__in=existing_uuids, is_latest=True
+            )
+        }
+
+        valid_items = []
+        updated_uuids = set()
+        for position, (item, uuid) in enumerate(zip(items, uuids)):
+            instance = latest_records.get(uuid)
+            if not instance:
+                results[position] = {
+                    "status": status.HTTP_404_NOT_FOUND,
+                    "errors": {"uuid": [_("OBJECT with this uuid does not exist.")]},
+                }
+                continue
+
+            if not self.has_write_permission(instance.object.object_type):
+                results[position] = BULK_PERMISSION_DENIED
+                continue
+
+            if instance.object.uuid in updated_uuids:
+                results[position] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": {
+                        "uuid": [_("An OBJECT can be updated only once per request.")]
+                    },
+                }
+                continue
+
+            serializer = self.get_serializer(instance, data=item, partial=partial)
+            if not serializer.is_valid():
+                results[position] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": serializer.errors,
+                }
+                continue
+
+            record_data = serializer.record_data
+            # the start date closes the previous record
+            if not record_data.get("start_at"):
+                results[position] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": {"record": {"startAt": [_("This field is required.")]}},
+                }
+                continue
+
+            updated_uuids.add(instance.object.uuid)
+            valid_items.append(
+                (position, record_data, instance if serializer.unchanged else None)
+            )
+
+        return valid_items
+
+    @extend_schema(
+        description="Export all OBJECTs and their actual RECORD in a single streamed "
+        "response, as newline delimited JSON (`Accept: application/x-ndjson`) or as a "
+        "JSON array. The export supports the same filters and `fields` as the list. "
+        "The `fields` are validated before the response is streamed, attributes of "
+        "the data which are not allowed to display are left out without a warning "
+        "header.",
+        responses={"200": ObjectSerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[JSONRenderer, NDJSONRenderer],
+        pagination_class=None,
+    )
+    def export(self, request):
+        """Export all OBJECTs as a stream"""
+        self.validate_export_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_export_rows(queryset)
+
+        renderer = request.accepted_renderer
+        if isinstance(renderer, NDJSONRenderer):
+            content = (renderer.render_item(row) for row in rows)
+        else:
+            content = self.get_json_array(renderer, rows)
+
+        return StreamingHttpResponse(content, content_type=renderer.media_type)
+
+    def validate_export_fields(self) -> None:
+        """
+        validate the `fields` of the export before the OBJECTs are serialized, since
+        the errors can't be returned once the OBJECTs are streamed. The fields must
+        exist and, except for the attributes of the data, be allowed by the
+        field-based permissions of the token for all versions of the OBJECTTYPE.
+        """
+        query_fields = parse_fields(self.request.query_params.get("fields"))
+        if not query_fields:
+            return
+
+        record_field_names = ObjectRecordSerializer.Meta.fields
+        invalid = set()
+        for path in query_fields:
+            name, _sep, record_path = path.partition("__")
+            if name not in ObjectSerializer.Meta.fields or (
+                record_path
+                and (
+                    name != "record"
+                    or record_path.split("__")[0] not in record_field_names
+                    or ("__" in record_path and not record_path.startswith("data__"))
+                )
+            ):
+                invalid.add(path)
+
+        # the absent attributes of the data are left out of the projection
+        restricted_paths = [
+            path
+            for path in query_fields
+            if path not in invalid and not path.startswith("record__data__")
+        ]
+        for permission in self.get_export_permissions():
+            if not (
+                permission.mode == PermissionModes.read_only and permission.use_fields
+            ):
+                continue
+
+            for allowed_fields in permission.fields.values():
+                invalid.update(
+                    path
+                    for path in restricted_paths
+                    if not any(
+                        allowed == path
+                        or allowed.startswith(f"{path}__")
+                        or path.startswith(f"{allowed}__")
+                        for allowed in allowed_fields
+                    )
+                )
+
+        if invalid:
+            raise ValidationError(
+                {
+                    "fields": [
+                        _(
+                            "'fields' query parameter has invalid or unauthorized "
+                            "values: %(fields)s"
+                        )
+                        % {"fields": ", ".join(sorted(invalid))}
+                    ]
+                },
+                code="invalid-fields",
+            )
+
+    def get_export_permissions(self) -> list:
+        """return the permissions of the token for the exported OBJECTTYPEs"""
+        auth_context = getattr(self.request.auth, "auth_context", None)
+        if not auth_context or bypass_permissions(self.request):
+            return []
+
+        if not self.request.query_params.get("type"):
+            return list(auth_context.permissions.values())
+
+        object_type = self.get_requested_object_type()
+        if not object_type:
+            return []
+
+        permission = auth_context.permissions.get(object_type.pk)
+        return [permission] if permission else []
+
+    def get_export_rows(self, queryset: models.QuerySet):
+        if not self.uses_row_serializer():
+            yield from self.serialize_in_chunks(queryset)
+            return
+
+        serializer = ObjectRowSerializer(context=self.get_serializer_context())
+        rows = serializer.get_rows(queryset).iterator(chunk_size=self.export_chunk_size)
+        while True:
+            chunk = list(islice(rows, self.export_chunk_size))
+            if not chunk:
+                return
+
+            yield from serializer.get_data(chunk)
+
+    def serialize_in_chunks(self, queryset: models.QuerySet):
+        """
+        serialize the records in chunks, which are read with a server-side cursor
+        """
+        # prefetch_related() is ignored by iterator(), so it's done per chunk
+        prefetch_lookups = queryset._prefetch_related_lookups
+        records = queryset.prefetch_related(None).iterator(
+            chunk_size=self.export_chunk_size
+        )
+        while True:
+            chunk = list(islice(records, self.export_chunk_size))
+            if not chunk:
+                return
+
+            models.prefetch_related_objects(chunk, *prefetch_lookups)
+            yield from self.get_serializer(chunk, many=True).data
+
+    def get_json_array(self, renderer, rows):
+        yield b"["
+        for index, row in enumerate(rows):
+            yield (b"," if index else b"") + renderer.render(row)
+        yield b"]"
+
     def finalize_response(self, request, response, *args, **kwargs):
         """add warning header if not all data is allowed to display"""
 
-        if response.status_code == 200:
-            serializer = getattr(response.data, "serializer", None) or getattr(
-                response.data.get("results"), "serializer", None
-            )
-            if self.action == "retrieve" and serializer.not_allowed:
-                self.headers[
-                    settings.UNAUTHORIZED_FIELDS_HEADER
-                ] = serializer.not_allowed.pretty()
+        if response.status_code == 200 and not response.streaming:
+            serializer = getattr(response.data, "serializer", None)
+            if serializer is None and isinstance(response.data, dict):
+                serializer = getattr(response.data.get("results"), "serializer", None)
+            # the rows of ObjectRowSerializer have no serializer, they contain all
+            # the fields
+            if self.action in ("list", "search") and serializer is not None:
+                serializer = serializer.child
+
+            not_allowed = getattr(serializer, "not_allowed", None)
+            if self.action in ("retrieve", "list", "search") and not_allowed:
+                self.headers[settings.UNAUTHORIZED_FIELDS_HEADER] = not_allowed.pretty()
 
-            elif self.action in ("list", "search") and serializer.child.not_allowed:
-                self.headers[
-                    settings.UNAUTHORIZED_FIELDS_HEADER
-                ] = serializer.child.not_allowed.pretty()
+            if self.response_cache_key:
+                response_cache.set(
+                    self.response_cache_key,
+                    (
+                        response.data,
+                        self.headers.get(settings.UNAUTHORIZED_FIELDS_HEADER),
+                    ),
+                )
 
         return super().finalize_response(request, response, *args, **kwargs)
 
@@ -3,8 +3,8 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 from rest_framework.fields import get_attribute
-from zds_client.client import ClientError
 
+from objects.core.loaders import get_objecttype_loader
 from objects.core.utils import check_objecttype
 
 from .constants import Operators
@@ -16,6 +16,10 @@ class JsonSchemaValidator:
     requires_context = True
 
     def __call__(self, attrs, serializer):
+        # an unchanged update keeps the data of the latest record
+        if getattr(serializer, "unchanged", False):
+            return
+
         instance = getattr(serializer, "instance", None)
         object_type = (
             attrs.get("object", {}).get("object_type") or instance.object.object_type
@@ -26,8 +30,9 @@ class JsonSchemaValidator:
         if not object_type or not version or not data:
             return
 
+        loader = get_objecttype_loader(serializer.context.get("request"))
         try:
-            check_objecttype(object_type, version, data)
+            check_objecttype(object_type, version, data, loader=loader)
         except ValidationError as exc:
             raise serializers.ValidationError(exc.args[0], code=self.code) from exc
 
@@ -93,14 +98,6 @@ class GeometryValidator:
         if not geometry:
             return
 
-        client = object_type.service.build_client()
-        try:
-            response = client.retrieve("objecttype", url=object_type.url)
-        except ClientError as exc:
-            msg = f"Object type can not be retrieved: {exc.args[0]}"
-            raise ValidationError(msg)
-
-        allow_geometry = response.get("allowGeometry", True)
-
-        if geometry and not allow_geometry:
+        loader = get_objecttype_loader(serializer.context.get("request"))
+        if not loader.allows_geometry(object_type):
             raise serializers.ValidationError(self.message, code=self.code)
@@ -114,3 +114,4 @@ SPECTACULAR_SETTINGS = {
 OAS_SERVERS = {"v1": [{"url": "/api/v1"}], "v2": [{"url": "/api/v2"}]}
 
 UNAUTHORIZED_FIELDS_HEADER = "X-Unauthorized-Fields"
+UNCHANGED_OBJECT_HEADER = "X-Object-Unchanged"
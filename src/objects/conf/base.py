@@ -412,6 +412,56 @@ CUSTOM_CLIENT_FETCHER = "objects.utils.client.get_client"
 # settings for sending notifications
 NOTIFICATIONS_KANAAL = "objecten"
 NOTIFICATIONS_DISABLED = config("NOTIFICATIONS_DISABLED", False)
+# notifications are stored in an outbox and sent by the `send_notifications` command.
+# A failed notification is retried with an exponential backoff (in seconds)
+NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS = config("NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS", 10)
+NOTIFICATIONS_OUTBOX_RETRY_BACKOFF = config("NOTIFICATIONS_OUTBOX_RETRY_BACKOFF", 10)
+NOTIFICATIONS_OUTBOX_RETRY_BACKOFF_MAX = config(
+    "NOTIFICATIONS_OUTBOX_RETRY_BACKOFF_MAX", 3600
+)
+
+# tokens and their permissions can be cached to authenticate requests without queries.
+# A revoked token or permission is only removed from the cache of the process which
+# makes the change, other processes use it until the timeout (in seconds) expires.
+# The cache is disabled if the timeout is 0
+TOKEN_AUTH_CACHE_TIMEOUT = config("TOKEN_AUTH_CACHE_TIMEOUT", 0)
+TOKEN_AUTH_CACHE_SIZE = config("TOKEN_AUTH_CACHE_SIZE", 1024)
+# alias of the Django cache to share the tokens between processes, which should be a
+# cross-process cache like Redis
+TOKEN_AUTH_CACHE_ALIAS = config("TOKEN_AUTH_CACHE_ALIAS", "")
+
+# the responses of the list and search of objects can be stored in a shared cache for
+# the timeout (in seconds). The cache is disabled if the timeout is 0
+OBJECTS_RESPONSE_CACHE_TIMEOUT = config("OBJECTS_RESPONSE_CACHE_TIMEOUT", 0)
+OBJECTS_RESPONSE_CACHE_ALIAS = config("OBJECTS_RESPONSE_CACHE_ALIAS", "responses")
+# the fraction of the cache lookups which is counted in the hits and misses
+OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE = config(
+    "OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE", 0.1
+)
+
+#
+# Objecttypes API
+#
+# JSON schemas of OBJECTTYPE versions are cached to validate object records locally.
+# The cache is disabled if the timeout is 0
+OBJECTTYPE_SCHEMA_CACHE_TIMEOUT = config("OBJECTTYPE_SCHEMA_CACHE_TIMEOUT", 5 * 60)
+OBJECTTYPE_SCHEMA_CACHE_SIZE = config("OBJECTTYPE_SCHEMA_CACHE_SIZE", 256)
+# alias of the Django cache to share the JSON schemas between processes
+OBJECTTYPE_SCHEMA_CACHE_ALIAS = config("OBJECTTYPE_SCHEMA_CACHE_ALIAS", "")
+# OBJECTTYPE urls are resolved to ObjectTypes with a process-wide cache of the
+# services and ObjectTypes. The cache is disabled if the timeout is 0
+OBJECTTYPE_RESOLVER_CACHE_TIMEOUT = config("OBJECTTYPE_RESOLVER_CACHE_TIMEOUT", 5 * 60)
+OBJECTTYPE_RESOLVER_CACHE_SIZE = config("OBJECTTYPE_RESOLVER_CACHE_SIZE", 1024)
+# OBJECTTYPEs and their versions are mirrored locally. Mirrored data older than the
+# max age (in seconds) is refreshed, the refresh is disabled if the max age is 0
+OBJECTTYPE_MIRROR_MAX_AGE = config("OBJECTTYPE_MIRROR_MAX_AGE", 24 * 60 * 60)
+OBJECTTYPE_MIRROR_BACKGROUND_REFRESH = config(
+    "OBJECTTYPE_MIRROR_BACKGROUND_REFRESH", True
+)
+
+# the data_icontains filter searches in the trigram-indexed search text of the records
+# ("trigram") or evaluates a jsonpath regex on the data of all records ("jsonpath")
+DATA_ICONTAINS_MODE = config("DATA_ICONTAINS_MODE", "trigram")
 
 #
 # Maykin fork of DJANGO-TWO-FACTOR-AUTH
@@ -17,6 +17,7 @@ CACHES = {
     "oas": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "sessions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
 LOGGING = None  # Quiet is nice
@@ -30,6 +31,12 @@ AXES_BEHIND_REVERSE_PROXY = False
 
 NOTIFICATIONS_DISABLED = True
 
+# process-wide caches are enabled explicitly in the tests which need them
+OBJECTTYPE_SCHEMA_CACHE_TIMEOUT = 0
+TOKEN_AUTH_CACHE_TIMEOUT = 0
+OBJECTTYPE_RESOLVER_CACHE_TIMEOUT = 0
+OBJECTTYPE_MIRROR_BACKGROUND_REFRESH = False
+
 
 #
 # Maykin fork of django-two-factor-auth
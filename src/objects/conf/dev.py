@@ -87,6 +87,7 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     },
     "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
 AXES_CACHE = "axes_cache"
@@ -104,6 +105,11 @@ if "test" in sys.argv:
     NOTIFICATIONS_DISABLED = True
     TWO_FACTOR_PATCH_ADMIN = False
     TWO_FACTOR_FORCE_OTP_ADMIN = False
+    # process-wide caches are enabled explicitly in the tests which need them
+    OBJECTTYPE_SCHEMA_CACHE_TIMEOUT = 0
+    TOKEN_AUTH_CACHE_TIMEOUT = 0
+    OBJECTTYPE_RESOLVER_CACHE_TIMEOUT = 0
+    OBJECTTYPE_MIRROR_BACKGROUND_REFRESH = False
 
 # Override settings with local settings.
 try:
@@ -21,6 +21,16 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     },
     "oidc": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # shared cache of the responses of the objects API, which is used if
+    # OBJECTS_RESPONSE_CACHE_TIMEOUT is set
+    "responses": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_RESPONSES', 'localhost:6379/1')}",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
 
 # Deal with being hosted on a subpath
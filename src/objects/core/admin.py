@@ -1,13 +1,40 @@
 from django.contrib import admin
 from django.contrib.gis import forms
 from django.contrib.gis.db.models import GeometryField
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-from .models import Object, ObjectRecord, ObjectType
+from .constants import NotificationStatus
+from .models import (
+    IndexedAttribute,
+    Object,
+    ObjectRecord,
+    ObjectType,
+    ObjectTypeVersion,
+    OutgoingNotification,
+)
+
+
+class ObjectTypeVersionInline(admin.TabularInline):
+    model = ObjectTypeVersion
+    extra = 0
+    fields = ("version", "status", "published_at", "last_synced")
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class IndexedAttributeInline(admin.TabularInline):
+    model = IndexedAttribute
+    extra = 0
+    readonly_fields = ("index_status",)
 
 
 @admin.register(ObjectType)
 class ObjectTypeAdmin(admin.ModelAdmin):
-    readonly_fields = ("_name",)
+    readonly_fields = ("_name", "allow_geometry", "last_synced")
+    inlines = [IndexedAttributeInline, ObjectTypeVersionInline]
 
 
 class ObjectRecordInline(admin.TabularInline):
@@ -27,6 +54,9 @@ class ObjectRecordInline(admin.TabularInline):
     )
     formfield_overrides = {GeometryField: {"widget": forms.OSMWidget}}
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_reconstructed_data()
+
     def has_delete_permission(self, request, obj=None):
         return False
 
@@ -64,3 +94,34 @@ class ObjectAdmin(admin.ModelAdmin):
             readonly_fields = ("uuid", "object_type") + readonly_fields
 
         return readonly_fields
+
+
+@admin.register(OutgoingNotification)
+class OutgoingNotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "main_object",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("main_object",)
+    readonly_fields = ("main_object", "message", "created_at", "last_error")
+    actions = ["retry"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def retry(self, request, queryset):
+        updated = queryset.update(
+            status=NotificationStatus.pending,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(
+            request, _("%(count)s notifications will be retried") % {"count": updated}
+        )
+
+    retry.short_description = _("Retry the selected notifications")
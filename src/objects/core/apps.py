@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "objects.core"
+
+    def ready(self):
+        from . import signals  # noqa
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.core.cache import caches
+
+import jsonschema
+
+from objects.utils.cache import TTLCache
+
+
+def compile_validator(schema: dict):
+    """build a reusable jsonschema validator, the same way `jsonschema.validate` does"""
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema, format_checker=jsonschema.FormatChecker())
+
+
+class SchemaCache:
+    """
+    Cache of the JSON schemas of OBJECTTYPE versions in front of the local mirror.
+
+    There are two tiers:
+
+    * an in-process LRU cache, which holds compiled validators, so the validation
+      of the record data is a local call
+    * an optional shared Django cache (``OBJECTTYPE_SCHEMA_CACHE_ALIAS``), which
+      holds raw JSON schemas, so all the processes share the mirror lookups
+
+    Entries are kept for ``OBJECTTYPE_SCHEMA_CACHE_TIMEOUT`` seconds. ``0`` disables
+    the cache.
+    """
+
+    key_prefix = "objecttype-schema"
+
+    def __init__(self):
+        self._validators = TTLCache(
+            maxsize=lambda: settings.OBJECTTYPE_SCHEMA_CACHE_SIZE,
+            timeout=lambda: settings.OBJECTTYPE_SCHEMA_CACHE_TIMEOUT,
+        )
+
+    @staticmethod
+    def get_key(object_type, version: int = None) -> tuple:
+        key = (object_type.service_id, str(object_type.uuid))
+        return key if version is None else key + (int(version),)
+
+    def get_shared_key(self, key: tuple) -> str:
+        return ":".join([self.key_prefix] + [str(part) for part in key])
+
+    def get_shared_cache(self):
+        alias = settings.OBJECTTYPE_SCHEMA_CACHE_ALIAS
+        if not alias or not self._validators.enabled:
+            return None
+        return caches[alias]
+
+    def _get_shared(self, key: tuple, fetch) -> dict:
+        shared_cache = self.get_shared_cache()
+        if not shared_cache:
+            return fetch()
+
+        shared_key = self.get_shared_key(key)
+        value = shared_cache.get(shared_key)
+        if value is None:
+            value = fetch()
+            shared_cache.set(
+                shared_key, value, timeout=settings.OBJECTTYPE_SCHEMA_CACHE_TIMEOUT
+            )
+        return value
+
+    def get_schema(self, object_type, version: int) -> dict:
+        # the mirror depends on the models, which depend on this module
+        from .mirror import get_mirrored_version
+
+        return self._get_shared(
+            self.get_key(object_type, version),
+            lambda: get_mirrored_version(object_type, version).json_schema,
+        )
+
+    def get_validator(self, object_type, version: int):
+        key = self.get_key(object_type, version)
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = compile_validator(self.get_schema(object_type, version))
+            self._validators.set(key, validator)
+        return validator
+
+    def invalidate(self, object_type, version: int = None) -> None:
+        """remove cached schemas of the OBJECTTYPE (version) from both tiers"""
+        objecttype_key = self.get_key(object_type)
+        if version is not None:
+            keys = [self.get_key(object_type, version)]
+        else:
+            keys = [key for key in self._validators.keys() if key[:2] == objecttype_key]
+
+        for key in keys:
+            self._validators.delete(key)
+
+        shared_cache = self.get_shared_cache()
+        if not shared_cache:
+            return
+
+        shared_cache.delete_many([self.get_shared_key(key) for key in keys])
+        if version is None and hasattr(shared_cache, "delete_pattern"):
+            # django-redis can also drop the versions cached by other processes
+            prefix = self.get_shared_key(objecttype_key)
+            shared_cache.delete_pattern(f"{prefix}:*")
+
+    def clear(self) -> None:
+        self._validators.clear()
+
+
+schema_cache = SchemaCache()
@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ObjectVersionStatus(models.TextChoices):
+    published = "published", _("Published")
+    draft = "draft", _("Draft")
+    deprecated = "deprecated", _("Deprecated")
+
+
+class DataAttributeTypes(models.TextChoices):
+    string = "string", _("String")
+    number = "number", _("Number")
+    date = "date", _("Date")
+
+
+class IndexStatus(models.TextChoices):
+    pending = "pending", _("Pending")
+    ready = "ready", _("Ready")
+    failed = "failed", _("Failed")
+
+
+class NotificationStatus(models.TextChoices):
+    pending = "pending", _("Pending")
+    failed = "failed", _("Failed")
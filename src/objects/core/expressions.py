@@ -0,0 +1,120 @@
+from django.contrib.postgres.fields import DateRangeField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Validity(models.Func):
+    """
+    The material validity period of a record as a date range with inclusive bounds.
+
+    A record without ``end_at`` is valid indefinitely. A record which ends before it
+    starts is never valid. The SQL is the same as the one of the GiST index on
+    ``ObjectRecord``, so the queries can use the index.
+    """
+
+    template = (
+        "(CASE WHEN %(end)s < %(start)s THEN 'empty'::daterange "
+        "ELSE daterange(%(start)s, %(end)s, '[]') END)"
+    )
+    arity = 2
+    output_field = DateRangeField()
+
+    def __init__(self, start="start_at", end="end_at", **extra):
+        super().__init__(start, end, **extra)
+
+    def as_sql(self, compiler, connection, template=None, **extra_context):
+        start, end = self.get_source_expressions()
+        start_sql, start_params = compiler.compile(start)
+        end_sql, end_params = compiler.compile(end)
+
+        template = template or self.template
+        sql = template % {"start": start_sql, "end": end_sql}
+        params = [*end_params, *start_params, *start_params, *end_params]
+        return sql, params
+
+
+class DataAttribute(models.Func):
+    """
+    The JSON value of an attribute in the record data.
+
+    The `path` has the same format as the keys of the ``data_attrs`` filter, i.e.
+    nested attributes are separated by double underscores. The values are compared
+    as ``jsonb``, like the ``data_attrs`` filter compares the data, so the filters
+    return the same records with and without the index. The SQL is the same as the
+    one of the indexes of ``IndexedAttribute``.
+    """
+
+    template = "(%(data)s #> %(path)s::text[])"
+    arity = 1
+    output_field = models.JSONField(encoder=DjangoJSONEncoder)
+
+    def __init__(self, path: str, data="data", **extra):
+        self.path = path
+        super().__init__(data, **extra)
+
+    def get_path_param(self) -> str:
+        return "{%s}" % ",".join(self.path.split("__"))
+
+    def as_sql(self, compiler, connection, template=None, **extra_context):
+        (data,) = self.get_source_expressions()
+        data_sql, data_params = compiler.compile(data)
+
+        template = template or self.template
+        sql = template % {"data": data_sql, "path": "%s"}
+        return sql, [*data_params, self.get_path_param()]
+
+
+class DataProjection(models.Func):
+    """
+    The record data with only the given top-level keys.
+
+    Absent keys stay absent, rather than becoming ``null``. Data which isn't an
+    object is returned as it is.
+    """
+
+    template = (
+        "(CASE WHEN jsonb_typeof(%(data)s) = 'object' THEN ('{}'::jsonb%(keys)s) "
+        "ELSE %(data)s END)"
+    )
+    key_template = (
+        " || (CASE WHEN %(data)s ? %%s THEN jsonb_build_object(%%s, %(data)s -> %%s) "
+        "ELSE '{}'::jsonb END)"
+    )
+    arity = 1
+    output_field = models.JSONField()
+
+    def __init__(self, keys, data="data", **extra):
+        self.keys = tuple(keys)
+        super().__init__(data, **extra)
+
+    def as_sql(self, compiler, connection, template=None, **extra_context):
+        (data,) = self.get_source_expressions()
+        data_sql, data_params = compiler.compile(data)
+
+        keys_sql = self.key_template % {"data": data_sql} * len(self.keys)
+        template = template or self.template
+        sql = template % {"data": data_sql, "keys": keys_sql}
+
+        params = [*data_params]
+        for key in self.keys:
+            params += [*data_params, key, key, *data_params, key]
+        params += data_params
+        return sql, params
+
+
+class ReconstructedData(models.Func):
+    """
+    The data of a compacted record, reconstructed in the database.
+
+    The JSON Patches of the record and of the next compacted records are applied to
+    the data of the first next record which isn't compacted, the same as
+    ``ObjectRecordQuerySet.get_data``. The function is created by the migration
+    ``0045_objectrecord_reconstructed_data``. It's only meant for compacted records.
+    """
+
+    function = "core_objectrecord_reconstructed_data"
+    arity = 2
+    output_field = models.JSONField()
+
+    def __init__(self, object_id="object_id", index="index", **extra):
+        super().__init__(object_id, index, **extra)
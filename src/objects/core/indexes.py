@@ -0,0 +1,100 @@
+"""
+Partial expression indexes of the indexed attributes on the record data.
+
+The indexes are built by the ``build_indexes`` management command, not in the
+request which changes the ``IndexedAttribute``, since building an index reads the
+whole records table. Outside of a transaction they are created and dropped
+concurrently, so the records table stays writable. The status of the index is stored
+on the ``IndexedAttribute`` and the filters only use ready indexes.
+"""
+import logging
+
+from django.db import DatabaseError, connection, models
+
+from .constants import IndexStatus
+from .models import IndexedAttribute, ObjectRecord
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME_PREFIX = "core_objectrecord_attr_"
+
+
+def create_index(index: models.Index) -> None:
+    concurrently = not connection.in_atomic_block
+    with connection.schema_editor(atomic=False) as schema_editor:
+        # an interrupted concurrent build leaves an invalid index behind
+        schema_editor.remove_index(ObjectRecord, index, concurrently=concurrently)
+        schema_editor.add_index(ObjectRecord, index, concurrently=concurrently)
+
+
+def drop_index(index_name: str) -> None:
+    concurrently = not connection.in_atomic_block
+    with connection.schema_editor(atomic=False) as schema_editor:
+        schema_editor.remove_index(
+            ObjectRecord,
+            models.Index(fields=["id"], name=index_name),
+            concurrently=concurrently,
+        )
+
+
+def get_index_names() -> set:
+    """return the names of the indexes of indexed attributes in the database"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s "
+            "AND indexname LIKE %s",
+            [ObjectRecord._meta.db_table, f"{INDEX_NAME_PREFIX}%"],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def drop_unused_indexes() -> list:
+    """drop the indexes of deleted and changed indexed attributes"""
+    used_names = {
+        indexed_attribute.index_name
+        for indexed_attribute in IndexedAttribute.objects.all()
+    }
+    unused_names = sorted(get_index_names() - used_names)
+    for index_name in unused_names:
+        drop_index(index_name)
+    return unused_names
+
+
+def build_index(indexed_attribute: IndexedAttribute) -> str:
+    """build the index of the attribute and store the status of the index"""
+    try:
+        create_index(indexed_attribute.get_index())
+    except DatabaseError:
+        logger.exception("Failed to create index %s", indexed_attribute.index_name)
+        status = IndexStatus.failed
+    else:
+        status = IndexStatus.ready
+
+    # the attribute may be changed while the index was built
+    IndexedAttribute.objects.filter(
+        pk=indexed_attribute.pk,
+        object_type=indexed_attribute.object_type_id,
+        path=indexed_attribute.path,
+        type=indexed_attribute.type,
+    ).update(index_status=status)
+    indexed_attribute.index_status = status
+    return status
+
+
+def build_indexes(retry_failed: bool = False) -> list:
+    """
+    drop the unused indexes and build the indexes of the pending attributes, and
+    optionally retry the failed ones
+    """
+    drop_unused_indexes()
+
+    statuses = [IndexStatus.pending]
+    if retry_failed:
+        statuses.append(IndexStatus.failed)
+
+    indexed_attributes = list(
+        IndexedAttribute.objects.filter(index_status__in=statuses).order_by("pk")
+    )
+    for indexed_attribute in indexed_attributes:
+        build_index(indexed_attribute)
+    return indexed_attributes
@@ -0,0 +1,65 @@
+from django.db import models
+
+from .cache import schema_cache
+
+
+class ObjectTypeLoader:
+    """
+    Request-scoped loader of OBJECTTYPE metadata.
+
+    The ObjectType is resolved from its url and the OBJECTTYPE and its versions are
+    looked up at most once per request, regardless of how many validators, fields,
+    filters and permissions need them. Only lookups with unfiltered querysets are
+    shared. The process-scoped ``schema_cache`` and the local mirror are used for the
+    OBJECTTYPE data.
+    """
+
+    def __init__(self):
+        self._object_types = {}
+        self._objecttypes = {}
+        self._validators = {}
+
+    def get_by_url(self, url: str, queryset: models.QuerySet = None):
+        from .models import ObjectType
+
+        if queryset is None:
+            queryset = ObjectType.objects.all()
+
+        # filtered querysets can't share the result with other querysets
+        if queryset.query.has_filters():
+            return queryset.get_by_url(url)
+
+        key = (queryset.model, url)
+        if key not in self._object_types:
+            self._object_types[key] = queryset.get_by_url(url)
+
+        return self._object_types[key]
+
+    def get_validator(self, object_type, version: int):
+        key = schema_cache.get_key(object_type, version)
+        if key not in self._validators:
+            self._validators[key] = schema_cache.get_validator(object_type, version)
+        return self._validators[key]
+
+    def get_objecttype(self, object_type):
+        from .mirror import get_mirrored_objecttype
+
+        key = schema_cache.get_key(object_type)
+        if key not in self._objecttypes:
+            self._objecttypes[key] = get_mirrored_objecttype(object_type)
+        return self._objecttypes[key]
+
+    def allows_geometry(self, object_type) -> bool:
+        return self.get_objecttype(object_type).allow_geometry
+
+
+def get_objecttype_loader(request=None) -> ObjectTypeLoader:
+    """return the loader bound to the (DRF or Django) request"""
+    if request is None:
+        return ObjectTypeLoader()
+
+    http_request = getattr(request, "_request", request)
+    loader = getattr(http_request, "_objecttype_loader", None)
+    if loader is None:
+        loader = http_request._objecttype_loader = ObjectTypeLoader()
+    return loader
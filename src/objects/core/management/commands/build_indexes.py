@@ -0,0 +1,29 @@
+from django.core.management import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from objects.core.constants import IndexStatus
+from objects.core.indexes import build_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the database indexes of the pending indexed attributes and drop the "
+        "indexes of deleted and changed attributes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help=_("Also build the indexes which failed before"),
+        )
+
+    def handle(self, *args, **options):
+        indexed_attributes = build_indexes(retry_failed=options["retry_failed"])
+        for indexed_attribute in indexed_attributes:
+            if indexed_attribute.index_status == IndexStatus.ready:
+                self.stdout.write(f"Built index of {indexed_attribute}")
+            else:
+                self.stderr.write(f"Failed to build index of {indexed_attribute}")
+
+        self.stdout.write(f"Processed {len(indexed_attributes)} indexed attributes")
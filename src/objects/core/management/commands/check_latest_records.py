@@ -0,0 +1,56 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils.translation import gettext_lazy as _
+
+from objects.core.models import Object
+
+
+def get_inconsistent_objects() -> models.QuerySet:
+    """
+    return objects which don't have exactly one latest record or the latest record
+    of which doesn't have the largest index
+    """
+    latest = models.Q(records__is_latest=True)
+    return (
+        Object.objects.annotate(
+            max_index=models.Max("records__index"),
+            latest_index=models.Max("records__index", filter=latest),
+            latest_count=models.Count("records", filter=latest),
+        )
+        .filter(max_index__isnull=False)
+        .exclude(latest_count=1, latest_index=models.F("max_index"))
+        .order_by("id")
+    )
+
+
+class Command(BaseCommand):
+    help = "Check that the latest record of every object is flagged as such"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help=_("Flag the record with the largest index as the latest record"),
+        )
+
+    def handle(self, *args, **options):
+        inconsistent_objects = get_inconsistent_objects()
+        count = 0
+        for obj in inconsistent_objects.iterator():
+            count += 1
+            self.stdout.write(f"Object {obj.uuid} has inconsistent latest records")
+
+            if options["fix"]:
+                with transaction.atomic():
+                    obj.records.filter(is_latest=True).update(is_latest=False)
+                    obj.records.filter(index=obj.max_index).update(is_latest=True)
+
+        if not count:
+            self.stdout.write("The latest records of all objects are consistent")
+        elif options["fix"]:
+            self.stdout.write(f"Fixed the latest records of {count} objects")
+        else:
+            raise CommandError(
+                f"{count} objects have inconsistent latest records, "
+                "run the command with --fix to fix them"
+            )
@@ -0,0 +1,40 @@
+import datetime
+
+from django.core.management import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from objects.core.models import ObjectRecord
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the data of old records: store it as a JSON Patch against the data "
+        "of the next record of the object"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help=_("Compact the records which ended more than this number of days ago"),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help=_("The number of records which are compacted per transaction"),
+        )
+
+    def handle(self, *args, **options):
+        ended_before = datetime.date.today() - datetime.timedelta(days=options["days"])
+        total = 0
+        for count in ObjectRecord.objects.compact(
+            ended_before, batch_size=options["batch_size"]
+        ):
+            total += count
+            self.stdout.write(f"Compacted {count} records")
+
+        self.stdout.write(
+            f"Compacted {total} records which ended before {ended_before}"
+        )
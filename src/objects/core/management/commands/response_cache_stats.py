@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from objects.api.cache import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show the hits and misses of the response cache of the objects API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help=_("Reset the counters after showing them"),
+        )
+
+    def handle(self, *args, **options):
+        if not response_cache.enabled:
+            self.stdout.write("The response cache is disabled")
+            return
+
+        stats = response_cache.get_stats()
+        self.stdout.write(f"hits: {stats.hits}")
+        self.stdout.write(f"misses: {stats.misses}")
+        self.stdout.write(f"hit_ratio: {stats.hit_ratio:.2f}")
+
+        if options["reset"]:
+            response_cache.reset_stats()
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management import BaseCommand
+from django.utils.translation import gettext_lazy as _
+
+from objects.core.outbox import get_stats, send_batch
+
+
+class Command(BaseCommand):
+    help = "Send the notifications in the outbox to the Notifications API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help=_("Number of notifications which are sent in one transaction"),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help=_("Number of seconds to wait when there are no due notifications"),
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help=_("Send all due notifications and exit"),
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help=_("Show the statistics of the outbox and exit"),
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            stats = get_stats()
+            for name, value in vars(stats).items():
+                self.stdout.write(f"{name}: {value}")
+            return
+
+        try:
+            while True:
+                result = send_batch(options["batch_size"])
+                if result:
+                    self.stdout.write(
+                        f"Sent {result.sent} notifications, {result.retried} will "
+                        f"be retried and {result.failed} failed"
+                    )
+                    continue
+
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            return
@@ -0,0 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ValidationError
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from requests.exceptions import RequestException
+from zds_client.client import ClientError
+
+from objects.core.mirror import (
+    fetch_objecttype,
+    fetch_objecttype_versions,
+    store_objecttype,
+    store_objecttype_version,
+)
+from objects.core.models import ObjectType
+
+
+def fetch(object_type: ObjectType) -> tuple:
+    return fetch_objecttype(object_type), fetch_objecttype_versions(object_type)
+
+
+class Command(BaseCommand):
+    help = "Mirror the objecttypes and their versions from the Objecttypes API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "uuids",
+            nargs="*",
+            help=_("UUIDs of the objecttypes to sync. Defaults to all objecttypes"),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help=_("Number of concurrent requests to the Objecttypes API"),
+        )
+
+    def handle(self, *args, **options):
+        object_types = ObjectType.objects.select_related("service")
+        if options["uuids"]:
+            object_types = object_types.filter(uuid__in=options["uuids"])
+        object_types = list(object_types)
+
+        # the Objecttypes API is requested concurrently, the mirror is stored
+        # in the main thread
+        with ThreadPoolExecutor(max_workers=max(options["workers"], 1)) as executor:
+            futures = [
+                (object_type, executor.submit(fetch, object_type))
+                for object_type in object_types
+            ]
+
+            failed = 0
+            for object_type, future in futures:
+                try:
+                    objecttype_data, versions = future.result()
+                except (ClientError, RequestException, ValidationError) as exc:
+                    failed += 1
+                    self.stderr.write(f"Failed to sync {object_type.url}: {exc}")
+                    continue
+
+                with transaction.atomic():
+                    store_objecttype(object_type, objecttype_data)
+                    for version_data in versions:
+                        store_objecttype_version(object_type, version_data)
+
+                self.stdout.write(
+                    f"Synced {object_type.url} with {len(versions)} versions"
+                )
+
+        self.stdout.write(
+            f"Synced {len(object_types) - failed} of {len(object_types)} objecttypes"
+        )
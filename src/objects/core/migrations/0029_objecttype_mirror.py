@@ -0,0 +1,104 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0028_alter_objectrecord_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objecttype",
+            name="allow_geometry",
+            field=models.BooleanField(
+                default=True,
+                help_text="Mirrored `allowGeometry` attribute of the objecttype retrieved from the Objecttype API",
+                verbose_name="allow geometry",
+            ),
+        ),
+        migrations.AddField(
+            model_name="objecttype",
+            name="last_synced",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="The last time the objecttype was synced with the Objecttype API",
+                null=True,
+                verbose_name="last synced",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ObjectTypeVersion",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveSmallIntegerField(
+                        help_text="Integer version of the OBJECTTYPE",
+                        verbose_name="version",
+                    ),
+                ),
+                (
+                    "json_schema",
+                    models.JSONField(
+                        default=dict,
+                        help_text="JSON schema for Object validation",
+                        verbose_name="JSON schema",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("published", "Published"),
+                            ("draft", "Draft"),
+                            ("deprecated", "Deprecated"),
+                        ],
+                        help_text="Status of the OBJECTTYPE version",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "published_at",
+                    models.DateField(
+                        blank=True,
+                        help_text="Date of Version publication",
+                        null=True,
+                        verbose_name="published at",
+                    ),
+                ),
+                (
+                    "last_synced",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="The last time the version was synced with the Objecttype API",
+                        verbose_name="last synced",
+                    ),
+                ),
+                (
+                    "object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="versions",
+                        to="core.objecttype",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("object_type", "version")},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0029_objecttype_mirror"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objectrecord",
+            name="is_latest",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Whether the record has the largest index of the object",
+                verbose_name="is latest",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="objectrecord",
+            index=models.Index(
+                condition=models.Q(("is_latest", True)),
+                fields=["id"],
+                name="core_objectrecord_latest_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="objectrecord",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_latest", True)),
+                fields=("object",),
+                name="unique_latest_record_per_object",
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 10000
+
+
+def fill_is_latest(apps, _):
+    Object = apps.get_model("core", "Object")
+    ObjectRecord = apps.get_model("core", "ObjectRecord")
+
+    max_index = (
+        ObjectRecord.objects.filter(object=OuterRef("object"))
+        .order_by()
+        .values("object")
+        .annotate(max_index=Max("index"))
+        .values("max_index")
+    )
+    max_object_id = Object.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+
+    # the migration is not atomic, so every batch of objects is committed separately
+    for start in range(0, max_object_id + 1, BATCH_SIZE):
+        ObjectRecord.objects.filter(
+            object_id__gte=start,
+            object_id__lt=start + BATCH_SIZE,
+            index=Subquery(max_index),
+        ).update(is_latest=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0030_objectrecord_is_latest"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_is_latest, migrations.RunPython.noop),
+    ]
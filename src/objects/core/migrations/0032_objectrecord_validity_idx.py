@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:36
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+import objects.core.expressions
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0031_fill_objectrecord_is_latest"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="objectrecord",
+            index=django.contrib.postgres.indexes.GistIndex(
+                objects.core.expressions.Validity(),
+                name="core_objectrecord_validity_idx",
+            ),
+        ),
+    ]
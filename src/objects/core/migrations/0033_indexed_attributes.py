@@ -0,0 +1,78 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:39
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0032_objectrecord_validity_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objectrecord",
+            name="_object_type",
+            field=models.ForeignKey(
+                editable=False,
+                help_text="Denormalized OBJECTTYPE of the object, used in partial indexes",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.objecttype",
+            ),
+        ),
+        migrations.CreateModel(
+            name="IndexedAttribute",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="Path of the attribute in the record data, in the format of the `data_attrs` filter, for example `dimensions__height`",
+                        max_length=255,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                "^[\\w-]+$",
+                                message="Path can contain only letters, digits, hyphens and underscores. Nested attributes are separated by double underscores.",
+                            )
+                        ],
+                        verbose_name="path",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("string", "String"),
+                            ("number", "Number"),
+                            ("date", "Date"),
+                        ],
+                        help_text="Type of the attribute. Filters on indexed attributes compare values of this type only: strings support `exact`, numbers and dates support `exact`, `gt`, `gte`, `lt` and `lte`",
+                        max_length=20,
+                        verbose_name="type",
+                    ),
+                ),
+                (
+                    "object_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="indexed_attributes",
+                        to="core.objecttype",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("object_type", "path")},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 10000
+
+
+def fill_object_type(apps, _):
+    Object = apps.get_model("core", "Object")
+    ObjectRecord = apps.get_model("core", "ObjectRecord")
+
+    object_type = Object.objects.filter(pk=OuterRef("object")).values("object_type")
+    max_object_id = Object.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+
+    # the migration is not atomic, so every batch of objects is committed separately
+    for start in range(0, max_object_id + 1, BATCH_SIZE):
+        ObjectRecord.objects.filter(
+            object_id__gte=start, object_id__lt=start + BATCH_SIZE
+        ).update(_object_type=Subquery(object_type[:1]))
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0033_indexed_attributes"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_object_type, migrations.RunPython.noop),
+    ]
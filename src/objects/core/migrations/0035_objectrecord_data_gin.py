@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:41
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0034_fill_objectrecord_object_type"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="objectrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["data"],
+                name="core_objectrecord_data_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
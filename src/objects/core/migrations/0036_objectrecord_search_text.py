@@ -0,0 +1,23 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:43
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0035_objectrecord_data_gin"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="objectrecord",
+            name="_search_text",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="Lower-cased string values of the data, used to search in the data",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import connection, migrations
+from django.db.models import Max
+
+BATCH_SIZE = 10000
+
+# the same projection as objects.core.utils.get_search_text
+FILL_SEARCH_TEXT = r"""
+UPDATE core_objectrecord SET _search_text = COALESCE((
+    SELECT string_agg(lower(value #>> '{}'), E'\n')
+    FROM jsonb_path_query(data, 'strict $.** ? (@.type() == "string")') AS value
+), '')
+WHERE object_id >= %s AND object_id < %s
+"""
+
+
+def fill_search_text(apps, _):
+    Object = apps.get_model("core", "Object")
+
+    max_object_id = Object.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+
+    # the migration is not atomic, so every batch of objects is committed separately
+    with connection.cursor() as cursor:
+        for start in range(0, max_object_id + 1, BATCH_SIZE):
+            cursor.execute(FILL_SEARCH_TEXT, [start, start + BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0036_objectrecord_search_text"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+    ]
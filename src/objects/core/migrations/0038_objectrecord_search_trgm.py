@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:43
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0037_fill_objectrecord_search_text"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="objectrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["_search_text"],
+                name="core_objectrecord_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
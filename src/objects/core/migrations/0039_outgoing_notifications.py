@@ -0,0 +1,94 @@
+# Generated by Django 3.2.23 on 2026-10-18 20:54
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0038_objectrecord_search_trgm"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutgoingNotification",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "main_object",
+                    models.CharField(
+                        help_text="URL of the main object of the notification. The notifications of a main object are sent in the order they are created.",
+                        max_length=1000,
+                        verbose_name="main object",
+                    ),
+                ),
+                (
+                    "message",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        help_text="Message for the Notifications API",
+                        verbose_name="message",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of failed attempts to send",
+                        verbose_name="attempts",
+                    ),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="The notification is not sent before this moment",
+                        verbose_name="next attempt at",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="created at"),
+                ),
+                ("last_error", models.TextField(blank=True, verbose_name="last error")),
+            ],
+            options={
+                "verbose_name": "outgoing notification",
+                "verbose_name_plural": "outgoing notifications",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="outgoingnotification",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["next_attempt_at"],
+                name="core_notification_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outgoingnotification",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["main_object", "id"],
+                name="core_notification_order_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0039_outgoing_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objecttype",
+            name="generation",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Change counter of the objects of the objecttype, which is incremented after every change. It's used in the ETags of the lists of objects",
+                verbose_name="generation",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:24
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0040_objecttype_generation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objectrecord",
+            name="data_patch",
+            field=models.JSONField(
+                editable=False,
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+                help_text="JSON Patch which transforms the data of the next record into the data of this record. If it's set, the data is compacted and it's reconstructed from the next records when the record is loaded.",
+                null=True,
+                verbose_name="data patch",
+            ),
+        ),
+    ]
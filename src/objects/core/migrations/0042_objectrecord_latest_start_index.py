@@ -0,0 +1,23 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:38
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0041_objectrecord_data_patch"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="objectrecord",
+            index=models.Index(
+                condition=models.Q(("is_latest", True)),
+                fields=["start_at"],
+                name="core_objectrecord_latest_start",
+            ),
+        ),
+    ]
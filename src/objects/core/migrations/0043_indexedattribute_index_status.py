@@ -0,0 +1,61 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:39
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def get_index_name(indexed_attribute) -> str:
+    # the same as `IndexedAttribute.index_name`
+    digest = hashlib.md5(
+        f"{indexed_attribute.object_type_id}:{indexed_attribute.path}:"
+        f"{indexed_attribute.type}".encode()
+    ).hexdigest()
+    return f"core_objectrecord_attr_{digest[:12]}"
+
+
+def mark_built_indexes_ready(apps, schema_editor):
+    """the indexes of the existing attributes were built when they were saved"""
+    IndexedAttribute = apps.get_model("core", "IndexedAttribute")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT index_class.relname FROM pg_index "
+            "JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid "
+            "WHERE pg_index.indisvalid AND index_class.relname LIKE %s",
+            ["core_objectrecord_attr_%"],
+        )
+        valid_names = {row[0] for row in cursor.fetchall()}
+
+    ready_ids = [
+        indexed_attribute.pk
+        for indexed_attribute in IndexedAttribute.objects.all()
+        if get_index_name(indexed_attribute) in valid_names
+    ]
+    IndexedAttribute.objects.filter(pk__in=ready_ids).update(index_status="ready")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0042_objectrecord_latest_start_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="indexedattribute",
+            name="index_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                editable=False,
+                help_text="Status of the database index of the attribute. The index is built by the `build_indexes` management command and used by the filters once it's ready",
+                max_length=20,
+                verbose_name="index status",
+            ),
+        ),
+        migrations.RunPython(mark_built_indexes_ready, migrations.RunPython.noop),
+    ]
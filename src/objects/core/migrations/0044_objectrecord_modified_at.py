@@ -0,0 +1,21 @@
+# Generated by Django 3.2.23 on 2026-10-18 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0043_indexedattribute_index_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="objectrecord",
+            name="modified_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text="The date and time when the record was last saved",
+                verbose_name="modified at",
+            ),
+        ),
+    ]
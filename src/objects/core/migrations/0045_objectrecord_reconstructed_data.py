@@ -0,0 +1,87 @@
+# Generated by Django 3.2.23 on 2026-10-18 23:05
+
+from django.db import migrations
+
+# the same as `ObjectRecordQuerySet.get_data` and `apply_json_patch`, used to filter
+# on the data of compacted records
+CREATE_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION core_objectrecord_reconstructed_data(
+    record_object_id integer, record_index integer
+) RETURNS jsonb
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    document jsonb;
+    patches jsonb[] := '{}';
+    patch jsonb;
+    operation jsonb;
+    next_record record;
+    pointer text[];
+    parent text[];
+BEGIN
+    FOR next_record IN
+        SELECT data, data_patch FROM core_objectrecord
+        WHERE object_id = record_object_id AND index >= record_index
+        ORDER BY index
+    LOOP
+        IF next_record.data_patch IS NULL THEN
+            document := next_record.data;
+            EXIT;
+        END IF;
+        -- the patches are applied from the last compacted record backwards
+        patches := array_prepend(next_record.data_patch, patches);
+    END LOOP;
+
+    IF document IS NULL THEN
+        RETURN '{}'::jsonb;
+    END IF;
+
+    FOREACH patch IN ARRAY patches LOOP
+        FOR operation IN SELECT value FROM jsonb_array_elements(patch) LOOP
+            IF operation->>'path' = '' THEN
+                document := operation->'value';
+                CONTINUE;
+            END IF;
+
+            SELECT array_agg(
+                replace(replace(token, '~1', '/'), '~0', '~') ORDER BY position
+            ) INTO pointer
+            FROM unnest(string_to_array(substr(operation->>'path', 2), '/'))
+                WITH ORDINALITY AS tokens(token, position);
+            parent := pointer[1:array_length(pointer, 1) - 1];
+
+            IF operation->>'op' = 'remove' THEN
+                document := document #- pointer;
+            ELSIF operation->>'op' = 'replace' THEN
+                document := jsonb_set(document, pointer, operation->'value', false);
+            ELSIF jsonb_typeof(document #> parent) = 'array' THEN
+                IF pointer[array_length(pointer, 1)] = '-' THEN
+                    document := jsonb_insert(
+                        document, parent || '-1'::text, operation->'value', true
+                    );
+                ELSE
+                    document := jsonb_insert(document, pointer, operation->'value');
+                END IF;
+            ELSE
+                document := jsonb_set(document, pointer, operation->'value', true);
+            END IF;
+        END LOOP;
+    END LOOP;
+
+    RETURN document;
+END;
+$$;
+"""
+
+DROP_FUNCTION = """
+DROP FUNCTION IF EXISTS core_objectrecord_reconstructed_data(integer, integer);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0044_objectrecord_modified_at"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTION, DROP_FUNCTION),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.23 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+def mark_indexes_pending(apps, schema_editor):
+    """
+    the indexes are built on the JSON values now, under new names. The
+    `build_indexes` management command drops the old indexes and builds the new ones
+    """
+    IndexedAttribute = apps.get_model("core", "IndexedAttribute")
+    IndexedAttribute.objects.update(index_status="pending")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0045_objectrecord_reconstructed_data"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="indexedattribute",
+            name="type",
+            field=models.CharField(
+                choices=[("string", "String"), ("number", "Number"), ("date", "Date")],
+                help_text="Type of the attribute, which determines the filters using the index: strings support `exact`, numbers and dates support `exact`, `gt`, `gte`, `lt` and `lte` with a number or date value",
+                max_length=20,
+                verbose_name="type",
+            ),
+        ),
+        migrations.RunPython(mark_indexes_pending, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.23 on 2026-10-18 22:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0046_indexedattribute_jsonb_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outgoingnotification",
+            name="main_object",
+            field=models.CharField(
+                help_text="URL of the main object of the notification. The notifications of a main object are sent in the order they are created, a failed notification holds back the later ones.",
+                max_length=1000,
+                verbose_name="main object",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outgoingnotification",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "failed"])),
+                fields=["main_object", "id"],
+                name="core_notification_queue_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="outgoingnotification",
+            name="core_notification_order_idx",
+        ),
+    ]
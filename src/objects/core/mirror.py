@@ -0,0 +1,200 @@
+"""
+Local mirror of the OBJECTTYPEs and their versions in the Objecttypes API.
+
+Validation runs against the mirror, so writes don't depend on the availability of
+the Objecttypes API once an OBJECTTYPE version is mirrored:
+
+* a version which is not mirrored yet is retrieved from the Objecttypes API and
+  stored (on-miss fetch)
+* a mirrored version older than ``OBJECTTYPE_MIRROR_MAX_AGE`` is used as is and
+  refreshed in a background thread
+* the ``sync_objecttypes`` management command mirrors all the OBJECTTYPEs at once
+"""
+import copy
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from requests.exceptions import RequestException
+from zds_client.client import ClientError
+
+from .cache import schema_cache
+from .models import ObjectType, ObjectTypeVersion
+from .resolver import object_type_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_objecttype(object_type: ObjectType) -> dict:
+    """retrieve the OBJECTTYPE from the Objecttypes API"""
+    client = object_type.service.build_client()
+    try:
+        return client.retrieve("objecttype", url=object_type.url)
+    except ClientError as exc:
+        msg = f"Object type can not be retrieved: {exc.args[0]}"
+        raise ValidationError(msg)
+
+
+def fetch_objecttype_version(object_type: ObjectType, version: int) -> dict:
+    """retrieve the OBJECTTYPE version from the Objecttypes API"""
+    client = object_type.service.build_client()
+    objecttype_version_url = f"{object_type.url}/versions/{version}"
+
+    try:
+        response = client.retrieve("objectversion", url=objecttype_version_url)
+    except ClientError as exc:
+        msg = f"Object type version can not be retrieved: {exc.args[0]}"
+        raise ValidationError(msg)
+
+    if "jsonSchema" not in response:
+        msg = f"{objecttype_version_url} does not appear to be a valid objecttype."
+        raise ValidationError(msg)
+
+    return response
+
+
+def fetch_objecttype_versions(object_type: ObjectType) -> list:
+    """retrieve all the versions of the OBJECTTYPE from the Objecttypes API"""
+    client = object_type.service.build_client()
+    url = f"{object_type.url}/versions"
+
+    versions = []
+    while url:
+        response = client.request(url, "objectversion_list")
+        if not isinstance(response, dict):
+            return versions + response
+
+        versions += response["results"]
+        url = response.get("next")
+    return versions
+
+
+def store_objecttype(object_type: ObjectType, objecttype_data: dict) -> ObjectType:
+    object_type.allow_geometry = objecttype_data.get("allowGeometry", True)
+    object_type.last_synced = timezone.now()
+    if not object_type._name:
+        object_type._name = objecttype_data.get("name", "")
+
+    ObjectType.objects.filter(pk=object_type.pk).update(
+        _name=object_type._name,
+        allow_geometry=object_type.allow_geometry,
+        last_synced=object_type.last_synced,
+    )
+    # the update doesn't send signals
+    object_type_resolver.invalidate(object_type)
+    return object_type
+
+
+def store_objecttype_version(
+    object_type: ObjectType, version_data: dict
+) -> ObjectTypeVersion:
+    version = int(version_data["version"])
+    published_at = version_data.get("publishedAt")
+
+    mirrored, created = ObjectTypeVersion.objects.update_or_create(
+        object_type=object_type,
+        version=version,
+        defaults={
+            "json_schema": version_data["jsonSchema"],
+            "status": version_data.get("status", ""),
+            "published_at": parse_date(published_at) if published_at else None,
+            "last_synced": timezone.now(),
+        },
+    )
+    if not created:
+        schema_cache.invalidate(object_type, version)
+    return mirrored
+
+
+def is_stale(last_synced) -> bool:
+    max_age = settings.OBJECTTYPE_MIRROR_MAX_AGE
+    if not max_age or last_synced is None:
+        return False
+    return last_synced < timezone.now() - timedelta(seconds=max_age)
+
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh(key: tuple, refresh) -> None:
+    try:
+        refresh()
+    except (ClientError, RequestException, ValidationError):
+        # the stale mirror stays in use until the Objecttypes API is reachable
+        logger.warning("Failed to refresh the mirror of %s", key, exc_info=True)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(key: tuple, refresh) -> None:
+    try:
+        _refresh(key, refresh)
+    finally:
+        close_old_connections()
+
+
+def schedule_refresh(key: tuple, refresh) -> None:
+    """
+    refresh a stale mirror entry, at most once at the same time per entry.
+
+    The refresh runs in a background thread unless
+    ``OBJECTTYPE_MIRROR_BACKGROUND_REFRESH`` is disabled
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    if not settings.OBJECTTYPE_MIRROR_BACKGROUND_REFRESH:
+        _refresh(key, refresh)
+        return
+
+    thread = threading.Thread(
+        target=_refresh_in_background, args=(key, refresh), daemon=True
+    )
+    thread.start()
+
+
+def get_mirrored_objecttype(object_type: ObjectType) -> ObjectType:
+    """return the ObjectType with the mirrored attributes of the OBJECTTYPE"""
+    if object_type.last_synced is None:
+        return store_objecttype(object_type, fetch_objecttype(object_type))
+
+    if is_stale(object_type.last_synced):
+        # the request goes on with the instance as it is
+        stale_object_type = copy.copy(object_type)
+        schedule_refresh(
+            schema_cache.get_key(object_type),
+            lambda: store_objecttype(
+                stale_object_type, fetch_objecttype(stale_object_type)
+            ),
+        )
+    return object_type
+
+
+def get_mirrored_version(object_type: ObjectType, version: int) -> ObjectTypeVersion:
+    """return the mirrored OBJECTTYPE version"""
+    mirrored = ObjectTypeVersion.objects.filter(
+        object_type=object_type, version=version
+    ).first()
+    if mirrored is None:
+        return store_objecttype_version(
+            object_type, fetch_objecttype_version(object_type, version)
+        )
+
+    if is_stale(mirrored.last_synced):
+        schedule_refresh(
+            schema_cache.get_key(object_type, version),
+            lambda: store_objecttype_version(
+                object_type, fetch_objecttype_version(object_type, version)
+            ),
+        )
+    return mirrored
@@ -1,18 +1,35 @@
 import datetime
+import hashlib
 import uuid
+from decimal import Decimal, InvalidOperation
 
 from django.contrib.gis.db.models import GeometryField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
 from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.core.validators import RegexValidator
+from django.db import models, router, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from requests.exceptions import ConnectionError
 from zds_client.client import ClientError
 from zgw_consumers.models import Service
 
-from .query import ObjectQuerySet, ObjectRecordQuerySet, ObjectTypeQuerySet
-from .utils import check_objecttype
+from .constants import (
+    DataAttributeTypes,
+    IndexStatus,
+    NotificationStatus,
+    ObjectVersionStatus,
+)
+from .expressions import DataAttribute, Validity
+from .query import (
+    ObjectQuerySet,
+    ObjectRecordQuerySet,
+    ObjectTypeQuerySet,
+    OutgoingNotificationQuerySet,
+)
+from .utils import check_objecttype, get_search_text
 
 
 class ObjectType(models.Model):
@@ -26,6 +43,29 @@ class ObjectType(models.Model):
         max_length=100,
         help_text=_("Cached name of the objecttype retrieved from the Objecttype API"),
     )
+    allow_geometry = models.BooleanField(
+        _("allow geometry"),
+        default=True,
+        help_text=_(
+            "Mirrored `allowGeometry` attribute of the objecttype retrieved from the "
+            "Objecttype API"
+        ),
+    )
+    last_synced = models.DateTimeField(
+        _("last synced"),
+        null=True,
+        blank=True,
+        help_text=_("The last time the objecttype was synced with the Objecttype API"),
+    )
+    generation = models.PositiveBigIntegerField(
+        _("generation"),
+        default=0,
+        editable=False,
+        help_text=_(
+            "Change counter of the objects of the objecttype, which is incremented "
+            "after every change. It's used in the ETags of the lists of objects"
+        ),
+    )
 
     objects = ObjectTypeQuerySet.as_manager()
 
@@ -40,6 +80,17 @@ class ObjectType(models.Model):
         # zds_client.get_operation_url() can be used here but it increases HTTP overhead
         return f"{self.service.api_root}objecttypes/{self.uuid}"
 
+    def save(self, *args, **kwargs):
+        # the generation is only changed with `increment_generation`, so the
+        # increments of other processes aren't overwritten by a stale instance
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "generation"
+            ]
+        super().save(*args, **kwargs)
+
     def clean(self):
         client = self.service.build_client()
         try:
@@ -50,6 +101,143 @@ class ObjectType(models.Model):
         if not self._name:
             self._name = object_type_data["name"]
 
+        self.allow_geometry = object_type_data.get("allowGeometry", True)
+        self.last_synced = timezone.now()
+
+
+class ObjectTypeVersion(models.Model):
+    """
+    Local mirror of the OBJECTTYPE versions in the Objecttypes API
+    """
+
+    object_type = models.ForeignKey(
+        ObjectType, on_delete=models.CASCADE, related_name="versions"
+    )
+    version = models.PositiveSmallIntegerField(
+        _("version"), help_text=_("Integer version of the OBJECTTYPE")
+    )
+    json_schema = models.JSONField(
+        _("JSON schema"),
+        default=dict,
+        help_text=_("JSON schema for Object validation"),
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=20,
+        choices=ObjectVersionStatus.choices,
+        blank=True,
+        help_text=_("Status of the OBJECTTYPE version"),
+    )
+    published_at = models.DateField(
+        _("published at"),
+        null=True,
+        blank=True,
+        help_text=_("Date of Version publication"),
+    )
+    last_synced = models.DateTimeField(
+        _("last synced"),
+        default=timezone.now,
+        help_text=_("The last time the version was synced with the Objecttype API"),
+    )
+
+    class Meta:
+        unique_together = ("object_type", "version")
+
+    def __str__(self):
+        return f"{self.object_type} v{self.version}"
+
+
+class IndexedAttribute(models.Model):
+    """
+    Attribute of the record data of an OBJECTTYPE, which is indexed for filtering
+    """
+
+    object_type = models.ForeignKey(
+        ObjectType, on_delete=models.CASCADE, related_name="indexed_attributes"
+    )
+    path = models.CharField(
+        _("path"),
+        max_length=255,
+        validators=[
+            RegexValidator(
+                r"^[\w-]+$",
+                message=_(
+                    "Path can contain only letters, digits, hyphens and underscores. "
+                    "Nested attributes are separated by double underscores."
+                ),
+            )
+        ],
+        help_text=_(
+            "Path of the attribute in the record data, in the format of the "
+            "`data_attrs` filter, for example `dimensions__height`"
+        ),
+    )
+    type = models.CharField(
+        _("type"),
+        max_length=20,
+        choices=DataAttributeTypes.choices,
+        help_text=_(
+            "Type of the attribute, which determines the filters using the index: "
+            "strings support `exact`, numbers and dates support `exact`, `gt`, "
+            "`gte`, `lt` and `lte` with a number or date value"
+        ),
+    )
+    index_status = models.CharField(
+        _("index status"),
+        max_length=20,
+        choices=IndexStatus.choices,
+        default=IndexStatus.pending,
+        editable=False,
+        help_text=_(
+            "Status of the database index of the attribute. The index is built by the "
+            "`build_indexes` management command and used by the filters once it's "
+            "ready"
+        ),
+    )
+
+    class Meta:
+        unique_together = ("object_type", "path")
+
+    def __str__(self):
+        return f"{self.object_type}: {self.path} ({self.type})"
+
+    @property
+    def index_name(self) -> str:
+        # the index is the same for all the types
+        digest = hashlib.md5(f"{self.object_type_id}:{self.path}".encode()).hexdigest()
+        return f"core_objectrecord_attr_{digest[:12]}"
+
+    def get_index(self) -> models.Index:
+        return models.Index(
+            DataAttribute(self.path),
+            condition=models.Q(_object_type=self.object_type_id),
+            name=self.index_name,
+        )
+
+    def supports(self, operator: str, value: str) -> bool:
+        """whether the `data_attrs` filter part can use the index"""
+        # the filter looks up a numeric top-level key as an array index
+        if self.path.isdigit():
+            return False
+
+        if self.type == DataAttributeTypes.string:
+            return operator == "exact"
+
+        if operator not in ("exact", "gt", "gte", "lt", "lte"):
+            return False
+
+        if self.type == DataAttributeTypes.number:
+            try:
+                return Decimal(value).is_finite()
+            except InvalidOperation:
+                return False
+
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            return False
+        return True
+
 
 class Object(models.Model):
     uuid = models.UUIDField(
@@ -86,6 +274,14 @@ class ObjectRecord(models.Model):
         help_text=_("Incremental index number of the object record."),
     )
     object = models.ForeignKey(Object, on_delete=models.CASCADE, related_name="records")
+    _object_type = models.ForeignKey(
+        ObjectType,
+        on_delete=models.PROTECT,
+        null=True,
+        editable=False,
+        related_name="+",
+        help_text=_("Denormalized OBJECTTYPE of the object, used in partial indexes"),
+    )
     version = models.PositiveSmallIntegerField(
         _("version"),
         help_text=_("Version of the OBJECTTYPE for data in the object record"),
@@ -107,6 +303,11 @@ class ObjectRecord(models.Model):
         default=datetime.date.today,
         help_text=_("The date when the record was registered in the system"),
     )
+    modified_at = models.DateTimeField(
+        _("modified at"),
+        auto_now=True,
+        help_text=_("The date and time when the record was last saved"),
+    )
     correct = models.OneToOneField(
         "core.ObjectRecord",
         verbose_name="correction for",
@@ -128,10 +329,67 @@ class ObjectRecord(models.Model):
         ),
     )
 
+    is_latest = models.BooleanField(
+        _("is latest"),
+        default=False,
+        editable=False,
+        help_text=_("Whether the record has the largest index of the object"),
+    )
+
+    data_patch = models.JSONField(
+        _("data patch"),
+        null=True,
+        editable=False,
+        encoder=DjangoJSONEncoder,
+        help_text=_(
+            "JSON Patch which transforms the data of the next record into the data of "
+            "this record. If it's set, the data is compacted and it's reconstructed "
+            "from the next records when the record is loaded."
+        ),
+    )
+
+    _search_text = models.TextField(
+        default="",
+        editable=False,
+        help_text=_(
+            "Lower-cased string values of the data, used to search in the data"
+        ),
+    )
+
     objects = ObjectRecordQuerySet.as_manager()
 
     class Meta:
         unique_together = ("object", "index")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["object"],
+                condition=models.Q(is_latest=True),
+                name="unique_latest_record_per_object",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(is_latest=True),
+                name="core_objectrecord_latest_idx",
+            ),
+            models.Index(
+                fields=["start_at"],
+                condition=models.Q(is_latest=True),
+                name="core_objectrecord_latest_start",
+            ),
+            GistIndex(Validity(), name="core_objectrecord_validity_idx"),
+            GinIndex(
+                fields=["data"],
+                opclasses=["jsonb_path_ops"],
+                name="core_objectrecord_data_gin",
+            ),
+            GinIndex(
+                fields=["_search_text"],
+                opclasses=["gin_trgm_ops"],
+                name="core_objectrecord_search_trgm",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.version} ({self.start_at})"
@@ -143,12 +401,123 @@ class ObjectRecord(models.Model):
             check_objecttype(self.object.object_type, self.version, self.data)
 
     def save(self, *args, **kwargs):
-        if not self.id and self.object.last_record:
-            self.index = self.object.last_record.index + 1
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        if self.id:
+            self.save_existing(using, *args, **kwargs)
+            return
+
+        with transaction.atomic(using=using, savepoint=False):
+            # the object is locked, so concurrent updates of the object create their
+            # records one after the other
+            Object.objects.using(using).select_for_update().only("id").get(
+                pk=self.object_id
+            )
 
             #  add end_at to previous record
-            previous_record = self.object.last_record
-            previous_record.end_at = self.start_at
-            previous_record.save()
+            previous_index = ObjectRecord.objects.using(using).close_latest_record(
+                self.object_id, self.start_at
+            )
+            if previous_index is not None:
+                self.index = previous_index + 1
 
-        super().save(*args, **kwargs)
+            self.is_latest = True
+            self.fill_denormalized_fields()
+            super().save(*args, **kwargs)
+
+    def save_existing(self, using: str, *args, **kwargs):
+        """
+        save the changes of an existing record. The data of a compacted record must be
+        reconstructed first, and the previous record, which may be compacted against
+        the data of this record, is compacted again against the saved data.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "data" not in update_fields:
+            self.fill_denormalized_fields()
+            super().save(*args, **kwargs)
+            return
+
+        if self.data_patch is not None:
+            raise ValueError(
+                "The data of a compacted record can't be saved, load the record "
+                "with `with_reconstructed_data()`"
+            )
+
+        with transaction.atomic(using=using, savepoint=False):
+            previous = (
+                ObjectRecord.objects.using(using)
+                .filter(
+                    object_id=self.object_id,
+                    index=self.index - 1,
+                    data_patch__isnull=False,
+                )
+                .only("id", "object", "index", "data", "data_patch")
+                .with_reconstructed_data()
+                .first()
+            )
+
+            self.fill_denormalized_fields()
+            super().save(*args, **kwargs)
+
+            if previous:
+                ObjectRecord.objects.using(using).update_data_patch(previous, self.data)
+
+    def fill_denormalized_fields(self):
+        """fill the fields which are derived from the object and the data"""
+        self._object_type_id = self.object.object_type_id
+        self._search_text = get_search_text(self.data)
+
+
+class OutgoingNotification(models.Model):
+    main_object = models.CharField(
+        _("main object"),
+        max_length=1000,
+        help_text=_(
+            "URL of the main object of the notification. The notifications of a main "
+            "object are sent in the order they are created, a failed notification "
+            "holds back the later ones."
+        ),
+    )
+    message = models.JSONField(
+        _("message"),
+        encoder=DjangoJSONEncoder,
+        help_text=_("Message for the Notifications API"),
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=20,
+        choices=NotificationStatus.choices,
+        default=NotificationStatus.pending,
+    )
+    attempts = models.PositiveIntegerField(
+        _("attempts"), default=0, help_text=_("Number of failed attempts to send")
+    )
+    next_attempt_at = models.DateTimeField(
+        _("next attempt at"),
+        default=timezone.now,
+        help_text=_("The notification is not sent before this moment"),
+    )
+    created_at = models.DateTimeField(_("created at"), auto_now_add=True)
+    last_error = models.TextField(_("last error"), blank=True)
+
+    objects = OutgoingNotificationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("outgoing notification")
+        verbose_name_plural = _("outgoing notifications")
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status=NotificationStatus.pending),
+                name="core_notification_due_idx",
+            ),
+            models.Index(
+                fields=["main_object", "id"],
+                condition=models.Q(
+                    status__in=[NotificationStatus.pending, NotificationStatus.failed]
+                ),
+                name="core_notification_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.message.get('actie')} {self.main_object}"
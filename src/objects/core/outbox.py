@@ -0,0 +1,137 @@
+"""
+Outbox of the notifications for the Notifications API.
+
+The API stores the notifications in the same transaction as the changes of the
+objects, the ``send_notifications`` management command sends them afterwards.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from vng_api_common.notifications.models import NotificationsConfig
+
+from .constants import NotificationStatus
+from .models import OutgoingNotification
+
+logger = logging.getLogger(__name__)
+
+
+def add_notifications(messages: list) -> list:
+    """store the messages in the outbox"""
+    return OutgoingNotification.objects.bulk_create(
+        [
+            OutgoingNotification(main_object=message["hoofdObject"], message=message)
+            for message in messages
+        ]
+    )
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """exponential backoff after the failed attempts"""
+    delay = settings.NOTIFICATIONS_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(
+        seconds=min(delay, settings.NOTIFICATIONS_OUTBOX_RETRY_BACKOFF_MAX)
+    )
+
+
+@dataclass
+class BatchResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    def __bool__(self):
+        return bool(self.sent or self.retried or self.failed)
+
+
+def send_batch(batch_size: int, client=None) -> BatchResult:
+    """
+    Send a batch of due notifications. The notifications are locked while they are
+    sent, so multiple workers can drain the outbox concurrently.
+    """
+    client = client or NotificationsConfig.get_client()
+    if client is None:
+        raise RuntimeError("Could not build a client for Notifications API")
+
+    result = BatchResult()
+    with transaction.atomic():
+        notifications = list(
+            OutgoingNotification.objects.due(timezone.now()).select_for_update(
+                skip_locked=True
+            )[:batch_size]
+        )
+
+        sent_ids = []
+        for notification in notifications:
+            try:
+                client.create("notificaties", notification.message)
+            # the worker keeps running on any error, the notification is retried
+            except Exception as exc:
+                logger.warning(
+                    "Could not deliver message to %s",
+                    client.base_url,
+                    exc_info=True,
+                    extra={"notification_msg": notification.message},
+                )
+                notification.attempts += 1
+                notification.last_error = str(exc)
+                if notification.attempts >= settings.NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS:
+                    notification.status = NotificationStatus.failed
+                    result.failed += 1
+                else:
+                    notification.next_attempt_at = timezone.now() + get_retry_delay(
+                        notification.attempts
+                    )
+                    result.retried += 1
+                notification.save(
+                    update_fields=[
+                        "attempts",
+                        "last_error",
+                        "status",
+                        "next_attempt_at",
+                    ]
+                )
+            else:
+                sent_ids.append(notification.id)
+
+        OutgoingNotification.objects.filter(id__in=sent_ids).delete()
+        result.sent = len(sent_ids)
+
+    return result
+
+
+@dataclass
+class OutboxStats:
+    pending: int
+    due: int
+    failed: int
+    oldest_pending_age: Optional[float]
+
+
+def get_stats() -> OutboxStats:
+    now = timezone.now()
+    stats = OutgoingNotification.objects.aggregate(
+        pending=models.Count("id", filter=models.Q(status=NotificationStatus.pending)),
+        due=models.Count(
+            "id",
+            filter=models.Q(
+                status=NotificationStatus.pending, next_attempt_at__lte=now
+            ),
+        ),
+        failed=models.Count("id", filter=models.Q(status=NotificationStatus.failed)),
+        oldest_pending=models.Min(
+            "created_at", filter=models.Q(status=NotificationStatus.pending)
+        ),
+    )
+    oldest_pending = stats.pop("oldest_pending")
+    return OutboxStats(
+        **stats,
+        oldest_pending_age=(
+            (now - oldest_pending).total_seconds() if oldest_pending else None
+        ),
+    )
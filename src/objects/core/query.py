@@ -1,38 +1,453 @@
-from django.db import models
+import datetime
+import json
+import operator
+from functools import reduce
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, transaction
+from django.utils import timezone
 
 from vng_api_common.utils import get_uuid_from_path
-from zgw_consumers.models import Service
+
+from objects.utils.json_patch import apply_json_patch, get_json_patch
+
+from .constants import NotificationStatus
+from .expressions import DataAttribute, DataProjection, ReconstructedData, Validity
+from .resolver import object_type_resolver
 
 
 class ObjectTypeQuerySet(models.QuerySet):
     def get_by_url(self, url):
-        service = Service.get_service(url)
+        # the process-wide resolver caches the unrestricted lookups
+        if not self.query.has_filters():
+            return object_type_resolver.get_by_url(url)
+
+        service = object_type_resolver.get_service(url)
         uuid = get_uuid_from_path(url)
-        return self.get(service=service, uuid=uuid)
+        object_type = self.get(service=service, uuid=uuid)
+        # the service is needed to build the url, don't query it again
+        object_type.service = service
+        return object_type
+
+    def increment_generation(self, ids) -> None:
+        """
+        Increment the change counters of the OBJECTTYPEs after the commit of the
+        current transaction, so a new counter is never used with the previous
+        objects.
+
+        The ids are collected per connection and the first callback on commit
+        increments all of them with a single UPDATE, the callbacks of the other
+        writes of the transaction have nothing left to do. The UPDATE runs outside
+        of the writing transaction, so the rows of the counters are only locked for
+        that statement.
+        """
+        ids = set(ids)
+        if not ids:
+            return
+
+        connection = connections[self.db]
+        if not hasattr(connection, "pending_generation_ids"):
+            connection.pending_generation_ids = set()
+        # the ids of a rolled back transaction are incremented with the next one,
+        # which only invalidates the ETags of the OBJECTTYPEs once more
+        connection.pending_generation_ids.update(ids)
+
+        def increment():
+            pending_ids = connection.pending_generation_ids
+            if not pending_ids:
+                return
+
+            connection.pending_generation_ids = set()
+            self.filter(pk__in=pending_ids).update(
+                generation=models.F("generation") + 1
+            )
+
+        transaction.on_commit(increment, using=self.db)
 
 
 class ObjectQuerySet(models.QuerySet):
     def filter_for_date(self, date):
-        return (
-            self.filter(records__start_at__lte=date)
-            .filter(
-                models.Q(records__end_at__gte=date)
-                | models.Q(records__end_at__isnull=True)
-            )
-            .distinct()
-        )
+        record_model = self.model._meta.get_field("records").related_model
+        actual_records = record_model.objects.filter(
+            object=models.OuterRef("pk")
+        ).filter_for_date(date)
+        return self.filter(models.Exists(actual_records))
 
     def filter_for_registration_date(self, date):
         return self.filter(records__registration_at__lte=date).distinct()
 
 
+def _build_path(target: dict, path: list, value) -> dict:
+    node = target
+    for key in path[:-1]:
+        node = node.setdefault(key, {})
+    node[path[-1]] = value
+    return target
+
+
+def _merge_path(target: dict, path: list, value) -> bool:
+    """add the value at path to target, unless it conflicts with the target"""
+    node = target
+    for key in path[:-1]:
+        node = node.get(key, {})
+        if not isinstance(node, dict):
+            return False
+    if path[-1] in node:
+        return node[path[-1]] == value
+
+    _build_path(target, path, value)
+    return True
+
+
+def get_data_patch(data, next_data) -> Optional[list]:
+    """
+    return the JSON Patch which transforms the next data into the data, or None if
+    the patch isn't smaller than the data itself
+    """
+    patch = get_json_patch(next_data, data)
+    if len(json.dumps(patch, cls=DjangoJSONEncoder)) >= len(
+        json.dumps(data, cls=DjangoJSONEncoder)
+    ):
+        return None
+    return patch
+
+
+def is_compacted(record) -> bool:
+    """whether the data of the loaded record must be reconstructed"""
+    deferred_fields = record.get_deferred_fields()
+    return (
+        "data" not in deferred_fields
+        and "data_patch" not in deferred_fields
+        and record.data_patch is not None
+    )
+
+
+class ProjectedDataIterable(models.query.ModelIterable):
+    """set the projected data as the data of the records"""
+
+    def __iter__(self):
+        for record in super().__iter__():
+            record.data = record._projected_data
+            yield record
+
+
+class ReconstructedDataIterable(models.query.ModelIterable):
+    """reconstruct the data of the compacted records per chunk"""
+
+    def __iter__(self):
+        records = self.iter_records()
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+
+            self.reconstruct(chunk)
+            yield from chunk
+
+    def iter_records(self) -> Iterator[models.Model]:
+        return super().__iter__()
+
+    def reconstruct(self, records: list) -> None:
+        manager = self.queryset.model._default_manager.using(self.queryset.db)
+        manager.reconstruct_data(records)
+
+
+class ReconstructedProjectedDataIterable(
+    ReconstructedDataIterable, ProjectedDataIterable
+):
+    """reconstruct the compacted data of the records and project it"""
+
+    def reconstruct(self, records: list) -> None:
+        compacted = [record for record in records if is_compacted(record)]
+        super().reconstruct(compacted)
+
+        keys = self.queryset.query.annotations["_projected_data"].keys
+        for record in compacted:
+            if isinstance(record.data, dict):
+                record.data = {
+                    key: record.data[key] for key in keys if key in record.data
+                }
+
+
 class ObjectRecordQuerySet(models.QuerySet):
+    def with_reconstructed_data(self):
+        """
+        Reconstruct the data of the compacted records when they're loaded, see
+        ``compact``. Only the earlier records of the objects can be compacted, so
+        it's needed for the history and the records of a past date.
+        """
+        clone = self._chain()
+        if issubclass(clone._iterable_class, ProjectedDataIterable):
+            clone._iterable_class = ReconstructedProjectedDataIterable
+        else:
+            clone._iterable_class = ReconstructedDataIterable
+        return clone
+
+    def project_data(self, keys):
+        """
+        Load only the given top-level keys of the data. The records are not meant to
+        be saved.
+        """
+        clone = self.defer("data").annotate(_projected_data=DataProjection(keys))
+        if issubclass(clone._iterable_class, ReconstructedDataIterable):
+            clone._iterable_class = ReconstructedProjectedDataIterable
+        else:
+            clone._iterable_class = ProjectedDataIterable
+        return clone
+
+    def get_data(self, keys: Iterable[tuple[int, int]]) -> dict:
+        """
+        Return the data of the records with the (object id, index) keys. The data of
+        compacted records is reconstructed from the data of the first next record
+        which isn't compacted, by applying the patches of the records in between in
+        reverse order. Records which don't exist are left out.
+        """
+        keys = sorted(set(keys), reverse=True)
+        if not keys:
+            return {}
+
+        first_indices = {}
+        for object_id, index in keys:
+            first_indices[object_id] = index
+        manager = self.model._default_manager.using(self.db)
+        patches = {
+            (object_id, index): patch
+            for object_id, index, patch in manager.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        models.Q(object_id=object_id, index__gte=index)
+                        for object_id, index in first_indices.items()
+                    ),
+                ),
+                data_patch__isnull=False,
+            ).values_list("object_id", "index", "data_patch")
+        }
+
+        # the first next record which isn't compacted, per key
+        anchors = {}
+        for object_id, index in keys:
+            anchor = index
+            while (object_id, anchor) in patches and (object_id, anchor) not in anchors:
+                anchor += 1
+            anchor = anchors.get((object_id, anchor), anchor)
+            for between in range(index, anchor + 1):
+                anchors[(object_id, between)] = anchor
+
+        anchor_data = {
+            (object_id, index): data
+            for object_id, index, data in manager.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        models.Q(object_id=object_id, index=index)
+                        for object_id, index in {
+                            (object_id, anchors[(object_id, index)])
+                            for object_id, index in keys
+                        }
+                    ),
+                )
+            ).values_list("object_id", "index", "data")
+        }
+
+        # the keys are in descending order, so the records of the same object
+        # continue from the previous key
+        result = {}
+        previous = {}
+        for object_id, index in keys:
+            anchor = anchors[(object_id, index)]
+            current_index, current = previous.get(object_id, (None, None))
+            if current_index is None or not index < current_index <= anchor:
+                if (object_id, anchor) not in anchor_data:
+                    continue
+                current_index, current = anchor, anchor_data[(object_id, anchor)]
+
+            for patched_index in range(current_index - 1, index - 1, -1):
+                current = apply_json_patch(current, patches[(object_id, patched_index)])
+
+            result[(object_id, index)] = current
+            previous[object_id] = (index, current)
+
+        return result
+
+    def reconstruct_data(self, records: list) -> None:
+        """set the data of the compacted records, which are loaded without it"""
+        compacted = [record for record in records if is_compacted(record)]
+        if not compacted:
+            return
+
+        data = self.get_data((record.object_id, record.index) for record in compacted)
+        for record in compacted:
+            if (record.object_id, record.index) in data:
+                record.data = data[(record.object_id, record.index)]
+                # the record has its full data now, which is saved as is
+                record.data_patch = None
+
+    def reconstruct_rows(self, rows: list) -> None:
+        """
+        set the data of the compacted ``.values()`` rows, which contain the
+        ``object_id``, ``index``, ``data`` and ``data_patch`` values
+        """
+        compacted = [row for row in rows if row["data_patch"] is not None]
+        if not compacted:
+            return
+
+        data = self.get_data((row["object_id"], row["index"]) for row in compacted)
+        for row in compacted:
+            row["data"] = data.get((row["object_id"], row["index"]), row["data"])
+
+    def compact(
+        self, ended_before: datetime.date, batch_size: int = 1000
+    ) -> Iterator[int]:
+        """
+        Replace the data of the records, which ended before the date, by a JSON Patch
+        against the data of the next record. The records are compacted in batches,
+        one transaction per batch, and the number of compacted records of every
+        batch is yielded. The data is kept if the patch isn't smaller.
+        """
+        manager = self.model._default_manager.using(self.db)
+        candidates = (
+            self.filter(
+                is_latest=False, end_at__lt=ended_before, data_patch__isnull=True
+            )
+            .only("id", "object", "index", "data")
+            .order_by("id")
+        )
+        last_id = 0
+        while True:
+            with transaction.atomic(using=self.db):
+                records = list(candidates.filter(id__gt=last_id)[:batch_size])
+                if not records:
+                    return
+
+                last_id = records[-1].id
+                next_data = manager.get_data(
+                    (record.object_id, record.index + 1) for record in records
+                )
+                compacted = []
+                for record in records:
+                    key = (record.object_id, record.index + 1)
+                    if key not in next_data:
+                        continue
+
+                    patch = get_data_patch(record.data, next_data[key])
+                    if patch is None:
+                        continue
+
+                    record.data, record.data_patch = {}, patch
+                    compacted.append(record)
+
+                manager.bulk_update(compacted, ["data", "data_patch"])
+
+            yield len(compacted)
+
+    def update_data_patch(self, record, next_data) -> None:
+        """
+        Compact the reconstructed data of the record again against the changed data
+        of the next record, or store the data itself if the patch isn't smaller
+        """
+        patch = get_data_patch(record.data, next_data)
+        self.filter(pk=record.pk).update(
+            data=record.data if patch is None else {}, data_patch=patch
+        )
+
     def filter_for_token(self, token):
         if not token:
             return self.none()
-        allowed_object_types = token.permissions.values("object_type")
-        return self.filter(
-            object__object_type__in=models.Subquery(allowed_object_types)
+        return self.filter(object__object_type__in=token.get_object_type_ids())
+
+    def bulk_create_with_objects(self, records: list, batch_size=None) -> list:
+        """
+        Create new objects and their initial records in bulk. Every record refers
+        to an unsaved object, which is created first.
+        """
+        objects = [record.object for record in records]
+        self.model._meta.get_field("object").related_model.objects.bulk_create(
+            objects, batch_size=batch_size
+        )
+
+        corrected = self.model._meta.get_field("corrected")
+        for record in records:
+            # set the foreign key of the created object
+            record.object = record.object
+            record.index = 1
+            record.is_latest = True
+            record.fill_denormalized_fields()
+            # new records aren't corrected yet
+            corrected.set_cached_value(record, None)
+
+        records = self.bulk_create(records, batch_size=batch_size)
+        self.increment_object_type_generation(records)
+        return records
+
+    def close_latest_record(self, object_id: int, end_at) -> Optional[int]:
+        """
+        Close the latest record of the object with a single UPDATE ... RETURNING
+        statement and return its index, or None if the object has no records yet.
+        The object should be locked by the caller.
+        """
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        index = connection.ops.quote_name("index")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                # like `auto_now` of `modified_at`, which the ETags are based on
+                f"UPDATE {table} SET end_at = %s, is_latest = false, modified_at = %s "
+                f"WHERE object_id = %s AND is_latest RETURNING {index}",
+                [end_at, timezone.now(), object_id],
+            )
+            row = cursor.fetchone()
+
+        return row[0] if row else None
+
+    def bulk_create_next_records(self, records: list) -> list:
+        """
+        Create new records of existing objects in bulk. The latest records of the
+        objects are closed with a single UPDATE ... FROM statement instead of a save
+        per record, the objects should be locked by the caller.
+        """
+        if not records:
+            return []
+
+        latest_records = {
+            record.object_id: record
+            for record in self.filter(
+                object__in=[record.object for record in records], is_latest=True
+            ).only("id", "object", "index")
+        }
+
+        table = connections[self.db].ops.quote_name(self.model._meta.db_table)
+        values = ", ".join(["(%s, %s::date)"] * len(records))
+        params = []
+        for record in records:
+            params += [latest_records[record.object_id].id, record.start_at]
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET end_at = closed.end_at, is_latest = false, "
+                f"modified_at = %s FROM (VALUES {values}) AS closed (id, end_at) "
+                f"WHERE {table}.id = closed.id",
+                [timezone.now(), *params],
+            )
+
+        corrected = self.model._meta.get_field("corrected")
+        for record in records:
+            record.index = latest_records[record.object_id].index + 1
+            record.is_latest = True
+            record.fill_denormalized_fields()
+            corrected.set_cached_value(record, None)
+
+        records = self.bulk_create(records)
+        self.increment_object_type_generation(records)
+        return records
+
+    def increment_object_type_generation(self, records: list) -> None:
+        """increment the change counters of the OBJECTTYPEs of the records"""
+        object_type_model = self.model._meta.get_field("_object_type").related_model
+        object_type_model.objects.increment_generation(
+            record._object_type_id for record in records
         )
 
     def keep_max_record_per_object(self):
@@ -48,6 +463,131 @@ class ObjectRecordQuerySet(models.QuerySet):
         )
         return self.filter(index=models.Subquery(grouped_records))
 
+    def filter_indexed_attribute(self, indexed_attribute, lookup: str, value):
+        """
+        Filter on an attribute of the record data, so the index of the
+        ``IndexedAttribute`` is used. The `lookup` and the `value` are the ones of the
+        ``data_attrs`` filter without the index, e.g. ``in`` with the exact values.
+        """
+        alias = f"indexed_attribute_{indexed_attribute.pk}"
+        return (
+            self.filter(_object_type=indexed_attribute.object_type_id)
+            .alias(**{alias: DataAttribute(indexed_attribute.path)})
+            .filter(**{f"{alias}__{lookup}": value})
+        )
+
+    def filter_data(self, *alternatives: dict, reconstructed: bool = False):
+        """
+        Filter on lookups of the record data, the records match any of the
+        alternatives, which are dicts of lookups starting with ``data``.
+
+        With `reconstructed` the compacted records, whose data isn't stored, are
+        matched on their data reconstructed in the database. Only the records of a
+        past date can be compacted.
+        """
+        queryset = self
+        if reconstructed and "_reconstructed_data" not in self.query.annotations:
+            queryset = self.alias(_reconstructed_data=ReconstructedData())
+
+        condition = models.Q()
+        for lookups in alternatives:
+            if not reconstructed:
+                condition |= models.Q(**lookups)
+                continue
+
+            # the stored data is matched with its indexes
+            condition |= models.Q(data_patch__isnull=True, **lookups) | models.Q(
+                data_patch__isnull=False,
+                **{
+                    f"_reconstructed_{lookup}": value
+                    for lookup, value in lookups.items()
+                },
+            )
+        return queryset.filter(condition)
+
+    def filter_data_exact(self, exact_values: list, reconstructed: bool = False):
+        """
+        Filter on exact values of (nested) attributes of the record data with
+        ``data @> {...}`` containment predicates, which use the GIN index.
+
+        `exact_values` is a list of ``(path, values)`` tuples. The attribute at
+        `path` (the list of keys) matches if it's equal to any of the `values`.
+        Single values are combined into one containment predicate.
+        """
+        queryset = self
+        contained = {}
+        for path, values in exact_values:
+            if any(key.isdigit() for key in path):
+                # JSON key lookups treat numeric keys as array indexes
+                lookup = "__".join(["data", *path, "in"])
+                queryset = queryset.filter_data(
+                    {lookup: values}, reconstructed=reconstructed
+                )
+                continue
+
+            if len(values) == 1 and _merge_path(contained, path, values[0]):
+                continue
+
+            queryset = queryset.filter_data(
+                *({"data__contains": _build_path({}, path, value)} for value in values),
+                reconstructed=reconstructed,
+            )
+
+        if contained:
+            queryset = queryset.filter_data(
+                {"data__contains": contained}, reconstructed=reconstructed
+            )
+        return queryset
+
+    def filter_data_icontains(self, value: str):
+        """
+        case-insensitive substring search in all string values of the data, using
+        the trigram index of the search text
+        """
+        return self.filter(_search_text__contains=value.lower())
+
+    def filter_data_like_regex(self, value: str, reconstructed: bool = False):
+        """
+        case-insensitive regex search in all string values of the data, using a
+        jsonpath query over the full data of every record. With `reconstructed` the
+        compacted records are matched on their reconstructed data, see
+        ``filter_data``.
+        """
+        # where data @? '$.** ? (@ like_regex "$value" flag "i")'
+        jsonpath = (
+            "CONCAT('$.** ? (@ like_regex \"',%s::text,'\" flag \"i\")')::jsonpath"
+        )
+        if not reconstructed:
+            where_str = f"core_objectrecord.data @? {jsonpath}"
+            return self.extra(where=[where_str], params=[value])
+
+        where_str = (
+            f"((core_objectrecord.data_patch IS NULL "
+            f"AND core_objectrecord.data @? {jsonpath}) "
+            f"OR (core_objectrecord.data_patch IS NOT NULL "
+            f"AND core_objectrecord_reconstructed_data(core_objectrecord.object_id, "
+            f"core_objectrecord.index) @? {jsonpath}))"
+        )
+        return self.extra(where=[where_str], params=[value, value])
+
+    def keep_latest_record_per_object(self):
+        """
+        Return the record with the largest index for the object, which is found with
+        the ``is_latest`` flag and its partial index.
+
+        The records are the actual records today, unless the latest record of an
+        object starts in the future, see ``has_latest_records_after``.
+        """
+        return self.filter(is_latest=True)
+
+    def has_latest_records_after(self, date) -> bool:
+        """
+        Return whether the latest record of any of the objects starts after `date`.
+        An earlier record of such an object is the one valid on `date`, which is only
+        found with ``filter_for_date(date).keep_max_record_per_object()``.
+        """
+        return self.filter(is_latest=True, start_at__gt=date).exists()
+
     def filter_for_date(self, date):
         """
         Return records as seen on `date` from a material historical perspective.
@@ -56,11 +596,9 @@ class ObjectRecordQuerySet(models.QuerySet):
         the given `date`. If there is no `end_at` date, it means the record is
         still actual.
 
-
+        The validity period is a date range, which is indexed with a GiST index.
         """
-        return self.filter(start_at__lte=date).filter(
-            models.Q(end_at__gte=date) | models.Q(end_at__isnull=True)
-        )
+        return self.alias(validity=Validity()).filter(validity__contains=date)
 
     def filter_for_registration_date(self, date):
         """
@@ -68,3 +606,23 @@ class ObjectRecordQuerySet(models.QuerySet):
         perspective.
         """
         return self.filter(registration_at__lte=date)
+
+
+class OutgoingNotificationQuerySet(models.QuerySet):
+    def due(self, now):
+        """
+        Return the pending notifications which can be sent. A notification is held
+        back while an earlier notification of the same main object is pending or
+        failed, until the failed notification is retried or deleted.
+        """
+        earlier_unsent = self.model.objects.filter(
+            main_object=models.OuterRef("main_object"),
+            status__in=[NotificationStatus.pending, NotificationStatus.failed],
+            id__lt=models.OuterRef("id"),
+        )
+        return (
+            self.filter(status=NotificationStatus.pending, next_attempt_at__lte=now)
+            .alias(has_earlier_unsent=models.Exists(earlier_unsent))
+            .filter(has_earlier_unsent=False)
+            .order_by("id")
+        )
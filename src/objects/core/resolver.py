@@ -0,0 +1,109 @@
+import copy
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from django.conf import settings
+
+from vng_api_common.utils import get_uuid_from_path
+from zgw_consumers.models import Service
+
+from objects.utils.cache import TTLCache
+
+
+def get_scheme_and_domain(url: str) -> str:
+    return urlunsplit(urlsplit(url)[:2] + ("", "", ""))
+
+
+class ObjectTypeResolver:
+    """
+    Process-wide resolver of OBJECTTYPE urls to ObjectTypes.
+
+    The API roots of the services are indexed by their scheme and domain, with the
+    longest roots first, so the service of a url is found without a query. The
+    resolved ObjectTypes are cached by their service and uuid.
+
+    Both are invalidated by the signals of the models and expire after
+    ``OBJECTTYPE_RESOLVER_CACHE_TIMEOUT`` seconds, so the changes made in other
+    processes are picked up. ``0`` disables the cache.
+    """
+
+    services_key = "services"
+
+    def __init__(self):
+        self._services = TTLCache(
+            maxsize=1, timeout=lambda: settings.OBJECTTYPE_RESOLVER_CACHE_TIMEOUT
+        )
+        self._object_types = TTLCache(
+            maxsize=lambda: settings.OBJECTTYPE_RESOLVER_CACHE_SIZE,
+            timeout=lambda: settings.OBJECTTYPE_RESOLVER_CACHE_TIMEOUT,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._object_types.enabled
+
+    def get_services_index(self) -> dict:
+        index = self._services.get(self.services_key)
+        if index is None:
+            index = defaultdict(list)
+            for service in Service.objects.all():
+                index[get_scheme_and_domain(service.api_root)].append(service)
+            for services in index.values():
+                services.sort(key=lambda service: len(service.api_root), reverse=True)
+
+            index = dict(index)
+            self._services.set(self.services_key, index)
+        return index
+
+    def get_service(self, url: str) -> Optional[Service]:
+        """the same as `Service.get_service`, without a query"""
+        if not self.enabled:
+            return Service.get_service(url)
+
+        candidates = self.get_services_index().get(get_scheme_and_domain(url), [])
+        for candidate in candidates:
+            if url.startswith(candidate.api_root):
+                return candidate
+        return None
+
+    def get_by_url(self, url: str):
+        """
+        return a copy of the cached ObjectType, so the requests don't share the
+        instance
+        """
+        from .models import ObjectType
+
+        service = self.get_service(url)
+        uuid = get_uuid_from_path(url)
+        if service is None:
+            raise ObjectType.DoesNotExist("ObjectType matching query does not exist.")
+
+        key = (service.id, uuid)
+        object_type = self._object_types.get(key)
+        if object_type is None:
+            object_type = ObjectType.objects.get(service=service, uuid=uuid)
+            # the service is needed to build the url, don't query it again
+            object_type.service = service
+            self._object_types.set(key, object_type)
+
+        return copy.copy(object_type)
+
+    def invalidate(self, object_type=None) -> None:
+        """remove the ObjectType or all ObjectTypes from the cache"""
+        if object_type is None:
+            self._object_types.clear()
+            return
+
+        for key in self._object_types.keys():
+            if key[0] == object_type.service_id:
+                cached = self._object_types.get(key)
+                if cached is None or cached.pk == object_type.pk:
+                    self._object_types.delete(key)
+
+    def clear(self) -> None:
+        self._services.clear()
+        self._object_types.clear()
+
+
+object_type_resolver = ObjectTypeResolver()
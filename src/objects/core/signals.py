@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from zgw_consumers.models import Service
+
+from .cache import schema_cache
+from .constants import IndexStatus
+from .models import IndexedAttribute, Object, ObjectRecord, ObjectType
+from .resolver import object_type_resolver
+
+
+@receiver([post_save, post_delete], sender=ObjectType)
+def invalidate_schema_cache(sender, instance: ObjectType, **kwargs):
+    schema_cache.invalidate(instance)
+    object_type_resolver.invalidate(instance)
+
+
+@receiver(post_save, sender=ObjectType)
+def increment_generation_on_object_type_save(sender, instance: ObjectType, **kwargs):
+    # the url of the OBJECTTYPE is part of the objects
+    if not kwargs["created"]:
+        ObjectType.objects.increment_generation([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_object_type_resolver(sender, instance: Service, **kwargs):
+    object_type_resolver.clear()
+
+
+@receiver(post_save, sender=Service)
+def increment_generation_on_service_save(sender, instance: Service, **kwargs):
+    # the api root of the service is part of the urls of the OBJECTTYPEs
+    if kwargs["created"]:
+        return
+
+    ObjectType.objects.increment_generation(
+        instance.object_types.values_list("pk", flat=True)
+    )
+
+
+@receiver(post_save, sender=ObjectRecord)
+def increment_generation_on_save(sender, instance: ObjectRecord, **kwargs):
+    ObjectType.objects.increment_generation([instance._object_type_id])
+
+
+@receiver(post_delete, sender=Object)
+def increment_generation_on_delete(sender, instance: Object, **kwargs):
+    ObjectType.objects.increment_generation([instance.object_type_id])
+
+
+@receiver(pre_save, sender=IndexedAttribute)
+def reset_index_status(sender, instance: IndexedAttribute, **kwargs):
+    # a new or changed attribute needs a new index, which is built by the
+    # `build_indexes` management command
+    previous = IndexedAttribute.objects.filter(pk=instance.pk).first()
+    if not previous or previous.index_name != instance.index_name:
+        instance.index_status = IndexStatus.pending
@@ -9,7 +9,7 @@ from factory.fuzzy import BaseFuzzyAttribute
 from zgw_consumers.constants import APITypes, AuthTypes
 from zgw_consumers.models import Service
 
-from ..models import Object, ObjectRecord, ObjectType
+from ..models import Object, ObjectRecord, ObjectType, ObjectTypeVersion
 
 
 class ServiceFactory(factory.django.DjangoModelFactory):
@@ -31,6 +31,26 @@ class ObjectTypeFactory(factory.django.DjangoModelFactory):
         model = ObjectType
 
 
+class ObjectTypeVersionFactory(factory.django.DjangoModelFactory):
+    object_type = factory.SubFactory(ObjectTypeFactory)
+    version = factory.Sequence(lambda n: n + 1)
+    json_schema = factory.LazyFunction(
+        lambda: {
+            "type": "object",
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "required": ["diameter"],
+            "properties": {
+                "diameter": {"type": "integer", "description": "size in cm."},
+                "plantDate": {"type": "string", "format": "date"},
+            },
+        }
+    )
+    status = "published"
+
+    class Meta:
+        model = ObjectTypeVersion
+
+
 class FuzzyPoint(BaseFuzzyAttribute):
     def fuzz(self):
         return Point(random.uniform(-180.0, 180.0), random.uniform(-90.0, 90.0))
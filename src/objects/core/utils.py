@@ -1,28 +1,36 @@
 from django.core.exceptions import ValidationError
 
 import jsonschema
-from zds_client.client import ClientError
 
+from .loaders import get_objecttype_loader
 
-def check_objecttype(object_type, version, data):
-    client = object_type.service.build_client()
-    objecttype_version_url = f"{object_type.url}/versions/{version}"
+SEARCH_TEXT_SEPARATOR = "\n"
 
-    try:
-        response = client.retrieve("objectversion", url=objecttype_version_url)
-    except ClientError as exc:
-        msg = f"Object type version can not be retrieved: {exc.args[0]}"
-        raise ValidationError(msg)
 
-    try:
-        schema = response["jsonSchema"]
-    except KeyError:
-        msg = f"{objecttype_version_url} does not appear to be a valid objecttype."
-        raise ValidationError(msg)
+def check_objecttype(object_type, version, data, loader=None):
+    loader = loader or get_objecttype_loader()
+    validator = loader.get_validator(object_type, version)
 
     # TODO: Set warning header if objecttype is not published.
 
-    try:
-        jsonschema.validate(data, schema)
-    except jsonschema.exceptions.ValidationError as exc:
-        raise ValidationError(exc.args[0]) from exc
+    error = jsonschema.exceptions.best_match(validator.iter_errors(data))
+    if error is not None:
+        raise ValidationError(error.args[0]) from error
+
+
+def get_search_text(data) -> str:
+    """
+    return the lower-cased string values of the (nested) data, one value per line
+    """
+    values = []
+    nodes = [data]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, str):
+            values.append(node.lower())
+        elif isinstance(node, dict):
+            nodes.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            nodes.extend(reversed(node))
+
+    return SEARCH_TEXT_SEPARATOR.join(values)
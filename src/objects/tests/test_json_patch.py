@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from objects.api.utils import decode_history_delta, encode_history_delta
+from objects.utils.json_patch import apply_json_patch, get_json_patch
+
+
+class JSONPatchTests(TestCase):
+    def test_get_json_patch(self):
+        test_data = [
+            ({"a": "b"}, {"a": "b"}, []),
+            ({"a": "b"}, {"a": "c"}, [{"op": "replace", "path": "/a", "value": "c"}]),
+            ({"a": "b"}, {}, [{"op": "remove", "path": "/a"}]),
+            ({}, {"a": None}, [{"op": "add", "path": "/a", "value": None}]),
+            ({"a": 1}, {"a": True}, [{"op": "replace", "path": "/a", "value": True}]),
+            (
+                {"a": {"b": [1, {"c": 2}]}},
+                {"a": {"b": [1, {"c": 3}]}},
+                [{"op": "replace", "path": "/a/b/1/c", "value": 3}],
+            ),
+            (
+                {"a": [1]},
+                {"a": [1, 2]},
+                [{"op": "replace", "path": "/a", "value": [1, 2]}],
+            ),
+            (
+                {"a/b": 1, "c~d": 1},
+                {"a/b": 2, "c~d": 2},
+                [
+                    {"op": "replace", "path": "/a~1b", "value": 2},
+                    {"op": "replace", "path": "/c~0d", "value": 2},
+                ],
+            ),
+            ({"a": "b"}, ["c"], [{"op": "replace", "path": "", "value": ["c"]}]),
+        ]
+
+        for source, target, expected in test_data:
+            with self.subTest(source=source, target=target):
+                patch = get_json_patch(source, target)
+
+                self.assertEqual(patch, expected)
+                self.assertEqual(apply_json_patch(source, patch), target)
+
+    def test_apply_json_patch_keeps_document(self):
+        document = {"a": {"b": [1, 2]}}
+
+        result = apply_json_patch(
+            document,
+            [
+                {"op": "add", "path": "/a/b/-", "value": 3},
+                {"op": "remove", "path": "/a/b/0"},
+            ],
+        )
+
+        self.assertEqual(result, {"a": {"b": [2, 3]}})
+        self.assertEqual(document, {"a": {"b": [1, 2]}})
+
+    def test_apply_unsupported_operation(self):
+        with self.assertRaises(ValueError):
+            apply_json_patch({}, [{"op": "move", "from": "/a", "path": "/b"}])
+
+    def test_history_delta_round_trip(self):
+        records = [
+            {"index": 1, "data": {"name": "first", "size": 1}, "endAt": "2021-01-01"},
+            {"index": 2, "data": {"name": "first", "size": 2}, "endAt": None},
+            {"index": 3, "data": {"name": "third"}, "endAt": None},
+            {"index": 3, "data": {"name": "third"}, "endAt": None},
+        ]
+
+        items = list(encode_history_delta(records))
+
+        self.assertEqual(items[0], records[0])
+        self.assertEqual(
+            items[1],
+            {
+                "patch": [
+                    {"op": "replace", "path": "/index", "value": 2},
+                    {"op": "replace", "path": "/data/size", "value": 2},
+                    {"op": "replace", "path": "/endAt", "value": None},
+                ]
+            },
+        )
+        self.assertEqual(items[3], {"patch": []})
+        self.assertEqual(list(decode_history_delta(items)), records)
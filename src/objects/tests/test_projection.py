@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+from glom import GlomError, glom
+
+from objects.utils.serializers import (
+    ProjectionError,
+    build_spec,
+    get_field_names,
+    get_projection_plan,
+    get_removed_field_names,
+)
+
+DATA = {
+    "url": "http://testserver/api/v2/objects/1",
+    "type": "http://testserver/objecttypes/1",
+    "record": {
+        "index": 1,
+        "typeVersion": 1,
+        "data": {
+            "name": "demo",
+            "dimensions": {"height": 10, "sizes": [1, 2]},
+            "tags": [{"name": "a"}],
+            "empty": {},
+            "nothing": None,
+        },
+        "geometry": None,
+        "startAt": "2020-01-01",
+    },
+}
+
+
+class ProjectionPlanTests(TestCase):
+    def test_same_result_as_glom(self):
+        test_fields = [
+            ["url"],
+            ["url", "type"],
+            ["record"],
+            ["url", "record__index", "record__startAt"],
+            ["record__data"],
+            ["record__data__name"],
+            ["record__data__dimensions__height", "record__data__missing"],
+            ["record__data__tags__0", "record__data__tags__name"],
+            ["record__data__nothing__name", "record__data__empty"],
+            ["url", "some"],
+            ["record__geometry__type"],
+            ["record__index__value"],
+        ]
+        for fields in test_fields:
+            with self.subTest(fields=fields):
+                try:
+                    expected = glom(DATA, build_spec(fields))
+                except GlomError as exc:
+                    with self.assertRaises(ProjectionError) as context:
+                        get_projection_plan(tuple(fields)).project(DATA)
+                    self.assertEqual(str(context.exception.args[0]), str(exc.args[0]))
+                    continue
+
+                result = get_projection_plan(tuple(fields)).project(DATA)
+
+                self.assertEqual(result, expected)
+                self.assertEqual(list(result), list(expected))
+                self.assertEqual(
+                    get_removed_field_names(DATA, result),
+                    set(get_field_names(DATA)) - set(get_field_names(expected)),
+                )
+
+    def test_field_takes_precedence_over_nested_fields(self):
+        for fields in [("record", "record__index"), ("record__index", "record")]:
+            with self.subTest(fields=fields):
+                result = get_projection_plan(fields).project(DATA)
+
+                self.assertEqual(result, {"record": DATA["record"]})
+
+    def test_plan_is_compiled_once(self):
+        plan = get_projection_plan(("url", "record__data__name"))
+
+        self.assertIs(get_projection_plan(("url", "record__data__name")), plan)
@@ -0,0 +1,348 @@
+import uuid
+from datetime import date
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.notifications.models import NotificationsConfig
+from zgw_consumers.constants import APITypes
+from zgw_consumers.models import Service
+
+from objects.core.models import Object, ObjectRecord, OutgoingNotification
+from objects.core.outbox import send_batch
+from objects.core.tests.factories import (
+    ObjectFactory,
+    ObjectRecordFactory,
+    ObjectTypeFactory,
+    ObjectTypeVersionFactory,
+)
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from ..utils import notifications_client_mock
+from .utils import reverse_lazy
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+class BulkCreateTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-bulk")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(
+            service__api_root=OBJECT_TYPES_API,
+            allow_geometry=True,
+            last_synced=timezone.now(),
+        )
+        ObjectTypeVersionFactory.create(
+            object_type=cls.object_type, version=1, last_synced=timezone.now()
+        )
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+        cls.read_only_object_type = ObjectTypeFactory(
+            service=cls.object_type.service,
+            allow_geometry=True,
+            last_synced=timezone.now(),
+        )
+        ObjectTypeVersionFactory.create(
+            object_type=cls.read_only_object_type,
+            version=1,
+            last_synced=timezone.now(),
+        )
+        PermissionFactory.create(
+            object_type=cls.read_only_object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def _item(self, object_type=None, **record):
+        return {
+            "type": (object_type or self.object_type).url,
+            "record": {
+                "typeVersion": 1,
+                "data": {"diameter": 30},
+                "startAt": "2020-01-01",
+                **record,
+            },
+        }
+
+    def test_bulk_create(self):
+        object_uuid = uuid.uuid4()
+        items = [
+            self._item(),
+            {"uuid": str(object_uuid), **self._item(data={"diameter": 10})},
+        ]
+
+        response = self.client.post(self.url, items, **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Object.objects.count(), 2)
+
+        data = response.json()
+        self.assertEqual([item["status"] for item in data], [201, 201])
+        self.assertEqual(data[1]["object"]["uuid"], str(object_uuid))
+        self.assertEqual(data[1]["object"]["record"]["data"], {"diameter": 10})
+        self.assertEqual(data[1]["object"]["record"]["index"], 1)
+
+        record = ObjectRecord.objects.get(object__uuid=object_uuid)
+        self.assertTrue(record.is_latest)
+        self.assertEqual(record._object_type, self.object_type)
+
+    def test_bulk_create_partially(self):
+        existing_object = ObjectFactory.create(object_type=self.object_type)
+        items = [
+            self._item(),
+            self._item(data={"plantDate": "2020-04-12"}),
+            self._item(object_type=self.read_only_object_type),
+            {"uuid": str(existing_object.uuid), **self._item()},
+        ]
+
+        response = self.client.post(self.url, items, **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(Object.objects.count(), 2)
+
+        data = response.json()
+        self.assertEqual([item["status"] for item in data], [201, 400, 403, 400])
+        self.assertEqual(
+            data[1]["errors"],
+            {"non_field_errors": ["'diameter' is a required property"]},
+        )
+        self.assertEqual(
+            data[3]["errors"], {"uuid": ["An OBJECT with this uuid already exists."]}
+        )
+
+    def test_bulk_create_invalid(self):
+        response = self.client.post(
+            self.url, [self._item(typeVersion=None)], **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()[0]["status"], 400)
+        self.assertFalse(Object.objects.exists())
+
+    def test_bulk_create_too_many(self):
+        with patch("objects.api.v2.views.ObjectViewSet.bulk_max_size", 1):
+            response = self.client.post(
+                self.url, [self._item(), self._item()], **GEO_WRITE_KWARGS
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Object.objects.exists())
+
+    @freeze_time("2018-09-07T00:00:00Z")
+    @override_settings(NOTIFICATIONS_DISABLED=False)
+    @patch("zds_client.Client.from_url", side_effect=notifications_client_mock)
+    def test_bulk_create_notifications(self, mock_client):
+        config = NotificationsConfig.get_solo()
+        Service.objects.update_or_create(
+            api_root=config.api_root,
+            defaults=dict(
+                api_type=APITypes.nrc,
+                client_id="test",
+                secret="test",
+                user_id="test",
+                user_representation="Test",
+            ),
+        )
+        client = mock_client.return_value
+
+        response = self.client.post(
+            self.url, [self._item(), self._item()], **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(OutgoingNotification.objects.count(), 2)
+
+        send_batch(batch_size=10)
+
+        self.assertEqual(client.create.call_count, 2)
+        for item, call in zip(response.json(), client.create.call_args_list):
+            self.assertEqual(
+                call.args,
+                (
+                    "notificaties",
+                    {
+                        "kanaal": "objecten",
+                        "hoofdObject": item["object"]["url"],
+                        "resource": "object",
+                        "resourceUrl": item["object"]["url"],
+                        "actie": "create",
+                        "aanmaakdatum": "2018-09-07T02:00:00+02:00",
+                        "kenmerken": {"objectType": self.object_type.url},
+                    },
+                ),
+            )
+
+
+class BulkUpdateTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-bulk")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(
+            service__api_root=OBJECT_TYPES_API,
+            allow_geometry=True,
+            last_synced=timezone.now(),
+        )
+        ObjectTypeVersionFactory.create(
+            object_type=cls.object_type, version=1, last_synced=timezone.now()
+        )
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+
+    def test_bulk_update(self):
+        record1 = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"diameter": 10, "plantDate": "2020-04-12"},
+            version=1,
+        )
+        record2 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"diameter": 20}, version=1
+        )
+        ObjectRecordFactory.create(object=record2.object, data={"diameter": 21})
+        items = [
+            {
+                "uuid": str(record1.object.uuid),
+                "type": self.object_type.url,
+                "record": {
+                    "typeVersion": 1,
+                    "data": {"diameter": 11},
+                    "startAt": "2021-01-01",
+                },
+            },
+            {
+                "uuid": str(record2.object.uuid),
+                "type": self.object_type.url,
+                "record": {
+                    "typeVersion": 1,
+                    "data": {"diameter": 22},
+                    "startAt": "2021-01-01",
+                },
+            },
+        ]
+
+        response = self.client.put(self.url, items, **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()
+        self.assertEqual([item["status"] for item in data], [200, 200])
+        self.assertEqual(data[0]["object"]["record"]["index"], 2)
+        self.assertEqual(data[0]["object"]["record"]["data"], {"diameter": 11})
+        self.assertEqual(data[1]["object"]["record"]["index"], 3)
+
+        record1.refresh_from_db()
+        self.assertFalse(record1.is_latest)
+        self.assertEqual(record1.end_at, date(2021, 1, 1))
+        self.assertEqual(
+            list(
+                ObjectRecord.objects.filter(is_latest=True)
+                .order_by("object")
+                .values_list("index", flat=True)
+            ),
+            [2, 3],
+        )
+
+    def test_bulk_partial_update(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"diameter": 10, "plantDate": "2020-04-12"},
+            version=1,
+        )
+
+        response = self.client.patch(
+            self.url,
+            [
+                {
+                    "uuid": str(record.object.uuid),
+                    "record": {"data": {"plantDate": None}, "startAt": "2021-01-01"},
+                }
+            ],
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()[0]["object"]["record"]["data"], {"diameter": 10}
+        )
+
+    def test_bulk_update_partially(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"diameter": 10}, version=1
+        )
+        read_only_record = ObjectRecordFactory.create(version=1)
+        PermissionFactory.create(
+            object_type=read_only_record.object.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=self.token_auth,
+        )
+        record_data = {"data": {"diameter": 11}, "startAt": "2021-01-01"}
+        items = [
+            {"uuid": str(record.object.uuid), "record": record_data},
+            {"uuid": str(record.object.uuid), "record": record_data},
+            {"uuid": str(uuid.uuid4()), "record": record_data},
+            {"uuid": str(read_only_record.object.uuid), "record": record_data},
+            {"uuid": "invalid", "record": record_data},
+        ]
+
+        response = self.client.patch(self.url, items, **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [item["status"] for item in response.json()], [200, 400, 404, 403, 404]
+        )
+        self.assertEqual(record.object.records.count(), 2)
+        self.assertEqual(read_only_record.object.records.count(), 1)
+
+    def test_bulk_update_locks_objects_before_reading_records(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"diameter": 10}, version=1
+        )
+        items = [
+            {
+                "uuid": str(record.object.uuid),
+                "record": {"data": {"diameter": 11}, "startAt": "2021-01-01"},
+            }
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(self.url, items, **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        locks = [
+            position
+            for position, query in enumerate(context.captured_queries)
+            if query["sql"].startswith('SELECT "core_object"."id" FROM "core_object"')
+            and query["sql"].endswith("FOR UPDATE")
+        ]
+        reads = [
+            position
+            for position, query in enumerate(context.captured_queries)
+            if query["sql"].startswith('SELECT "core_objectrecord"')
+            and '"core_object"."uuid" IN' in query["sql"]
+            and "FOR UPDATE" not in query["sql"]
+        ]
+        self.assertTrue(locks)
+        self.assertTrue(reads)
+        # the latest records are read in a separate statement after the lock
+        self.assertLess(locks[0], reads[0])
@@ -0,0 +1,286 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.expressions import ReconstructedData
+from objects.core.models import ObjectRecord
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+DESCRIPTION = "A tree in the park, which is planted by the municipality. " * 3
+
+
+class CompactHistoryTests(TokenAuthMixin, APITestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        start_dates = [
+            date(2020, 1, 1),
+            date(2020, 6, 1),
+            date(2021, 1, 1),
+            date.today() - timedelta(days=1),
+        ]
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"name": "tree", "description": DESCRIPTION, "height": 1},
+            start_at=start_dates[0],
+            registration_at=start_dates[0],
+        )
+        self.object = record.object
+        for height, start_at in enumerate(start_dates[1:], start=2):
+            data = {"name": "tree", "description": DESCRIPTION, "height": height}
+            if height == 3:
+                data["leaves"] = ["green", "yellow"]
+            ObjectRecordFactory.create(
+                object=self.object,
+                version=record.version,
+                data=data,
+                start_at=start_at,
+                registration_at=start_at,
+            )
+
+    def compact(self) -> str:
+        stdout = StringIO()
+        call_command("compact_history", days=30, batch_size=1, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_compact(self):
+        output = self.compact()
+
+        self.assertIn("Compacted 2 records which ended before", output)
+        stored = list(
+            ObjectRecord.objects.filter(object=self.object)
+            .order_by("index")
+            .values_list("index", "data", "data_patch")
+        )
+        self.assertEqual(
+            stored[:2],
+            [
+                (1, {}, [{"op": "replace", "path": "/height", "value": 1}]),
+                (
+                    2,
+                    {},
+                    [
+                        {"op": "replace", "path": "/height", "value": 2},
+                        {"op": "remove", "path": "/leaves"},
+                    ],
+                ),
+            ],
+        )
+        # the recent and the latest records are kept
+        self.assertEqual([row[1]["height"] for row in stored[2:]], [3, 4])
+        self.assertEqual([row[2] for row in stored[2:]], [None, None])
+
+        # the data is reconstructed on request
+        records = ObjectRecord.objects.filter(object=self.object).order_by("index")
+        self.assertEqual(
+            [record.data.get("height") for record in records],
+            [None, None, 3, 4],
+        )
+        self.assertEqual(
+            [record.data["height"] for record in records.with_reconstructed_data()],
+            [1, 2, 3, 4],
+        )
+        self.assertEqual(
+            [
+                record.data
+                for record in records.with_reconstructed_data().project_data(["height"])
+            ],
+            [{"height": 1}, {"height": 2}, {"height": 3}, {"height": 4}],
+        )
+
+    def test_compact_again(self):
+        self.compact()
+
+        self.assertIn("Compacted 0 records which ended before", self.compact())
+
+    def get_heights(self) -> list:
+        return [
+            record.data["height"]
+            for record in ObjectRecord.objects.filter(object=self.object)
+            .order_by("index")
+            .with_reconstructed_data()
+        ]
+
+    def test_save_compacted_record(self):
+        self.compact()
+        record = (
+            ObjectRecord.objects.filter(object=self.object, index=2)
+            .with_reconstructed_data()
+            .get()
+        )
+
+        record.data["height"] = 20
+        record.save()
+
+        record.refresh_from_db()
+        self.assertEqual(record.data["height"], 20)
+        self.assertIsNone(record.data_patch)
+        self.assertEqual(self.get_heights(), [1, 20, 3, 4])
+        # the previous record is compacted against the saved data
+        self.assertEqual(
+            ObjectRecord.objects.get(object=self.object, index=1).data_patch,
+            [{"op": "replace", "path": "/height", "value": 1}],
+        )
+
+    def test_save_anchor_record(self):
+        self.compact()
+        record = ObjectRecord.objects.get(object=self.object, index=3)
+
+        record.data["height"] = 30
+        record.save()
+
+        self.assertEqual(self.get_heights(), [1, 2, 30, 4])
+
+    def test_save_compacted_record_without_data(self):
+        self.compact()
+        record = ObjectRecord.objects.get(object=self.object, index=2)
+
+        with self.assertRaises(ValueError):
+            record.save()
+
+        # the other fields can be saved
+        record.start_at = date(2020, 5, 1)
+        record.save(update_fields=["start_at"])
+        self.assertEqual(self.get_heights(), [1, 2, 3, 4])
+
+    def test_keep_data_if_patch_is_larger(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"a": 1},
+            start_at=date(2020, 1, 1),
+        )
+        ObjectRecordFactory.create(
+            object=record.object,
+            version=record.version,
+            data={"b": 2},
+            start_at=date(2020, 2, 1),
+        )
+
+        self.compact()
+
+        record.refresh_from_db()
+        self.assertEqual(record.data, {"a": 1})
+        self.assertIsNone(record.data_patch)
+
+    def test_history(self):
+        url = reverse("object-history", args=[self.object.uuid])
+        all_params = ({}, {"fields": "index,data__height"}, {"delta": "true"})
+        expected = [self.client.get(url, params).json() for params in all_params]
+
+        self.compact()
+
+        for params, expected_data in zip(all_params, expected):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.json(), expected_data)
+
+    def test_list_for_date(self):
+        url = reverse("object-list")
+        all_params = (
+            {"date": "2020-03-01"},
+            {"registrationDate": "2020-07-01"},
+            {"date": "2020-07-01", "fields": "record__index,record__data__height"},
+        )
+        expected = [self.client.get(url, params).json() for params in all_params]
+
+        self.compact()
+
+        for params, expected_data in zip(all_params, expected):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.json(), expected_data)
+
+        self.assertEqual(
+            expected[2]["results"], [{"record": {"index": 2, "data": {"height": 2}}}]
+        )
+
+    def test_data_filters_for_date(self):
+        url = reverse("object-list")
+        all_params = (
+            {"date": "2020-03-01", "data_attrs": "height__exact__1"},
+            {"date": "2020-03-01", "data_attrs": "height__exact__2"},
+            {"date": "2020-07-01", "data_attrs": "height__gte__2,name__icontains__TRE"},
+            {"date": "2020-07-01", "data_attrs": "leaves__1__exact__yellow"},
+            {"date": "2021-07-01", "data_attrs": "leaves__1__exact__yellow"},
+            {"registrationDate": "2020-07-01", "data_attrs": "height__lt__2"},
+            {"registrationDate": "2021-07-01", "data_attrs": "name__exact__tree"},
+        )
+        expected = [self.client.get(url, params).json() for params in all_params]
+
+        self.compact()
+
+        for params, expected_data in zip(all_params, expected):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.json(), expected_data)
+
+        # the filters match the compacted records
+        self.assertEqual([data["count"] for data in expected], [1, 0, 1, 0, 1, 1, 1])
+        self.assertEqual(expected[5]["results"][0]["record"]["index"], 1)
+
+    @override_settings(DATA_ICONTAINS_MODE="jsonpath")
+    def test_data_icontains_jsonpath_for_date(self):
+        url = reverse("object-list")
+        all_params = (
+            {"date": "2020-03-01", "data_icontains": "TREE"},
+            {"registrationDate": "2020-07-01", "data_icontains": "tree"},
+            {"registrationDate": "2021-07-01", "data_icontains": "yellow"},
+            {"date": "2020-07-01", "data_icontains": "yellow"},
+        )
+        expected = [self.client.get(url, params).json() for params in all_params]
+
+        self.compact()
+
+        for params, expected_data in zip(all_params, expected):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.json(), expected_data)
+
+        self.assertEqual([data["count"] for data in expected], [1, 1, 1, 0])
+
+    def test_reconstructed_data_in_database(self):
+        self.compact()
+
+        records = (
+            ObjectRecord.objects.filter(object=self.object)
+            .annotate(reconstructed_data=ReconstructedData())
+            .order_by("index")
+        )
+
+        self.assertEqual(
+            [record.reconstructed_data for record in records],
+            [record.data for record in records.with_reconstructed_data()],
+        )
@@ -0,0 +1,221 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.models import ObjectType
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.cache import auth_cache
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@override_settings(TOKEN_AUTH_CACHE_TIMEOUT=60, TOKEN_AUTH_CACHE_ALIAS="")
+class ObjectETagTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.permission = PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        auth_cache.clear()
+        self.addCleanup(auth_cache.clear)
+
+        self.record = ObjectRecordFactory.create(object__object_type=self.object_type)
+        self.url = reverse("object-detail", args=[self.record.object.uuid])
+
+    def test_retrieve_not_modified(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        # the latest record is found with a single query
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_retrieve_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        ObjectRecordFactory.create(object=self.record.object)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["record"]["index"], 2)
+
+    def test_retrieve_record_changed_in_place(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.record.data = {"plantDate": "2020-04-12"}
+        self.record.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["record"]["data"], {"plantDate": "2020-04-12"})
+
+    def test_retrieve_object_type_url_changed(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        service = self.object_type.service
+        service.api_root = "https://other.example.com/objecttypes/v1/"
+        service.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            response.json()["type"].startswith(
+                "https://other.example.com/objecttypes/v1/"
+            )
+        )
+
+    def test_history_earlier_record_changed_in_place(self):
+        url = reverse("object-history", args=[self.record.object.uuid])
+        ObjectRecordFactory.create(object=self.record.object)
+        etag = self.client.get(url)["ETag"]
+
+        self.record.data = {"plantDate": "2020-04-12"}
+        self.record.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_fields_and_permission(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        fields_etag = self.client.get(self.url, {"fields": "record__data"})["ETag"]
+        self.assertNotEqual(fields_etag, etag)
+
+        self.permission.use_fields = True
+        self.permission.fields = {"1": ["record__index"]}
+        self.permission.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_history_not_modified(self):
+        url = reverse("object-history", args=[self.record.object.uuid])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], self.client.get(self.url)["ETag"])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_allowed_object_without_etag(self):
+        record = ObjectRecordFactory.create()
+        url = reverse("object-detail", args=[record.object.uuid])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn("ETag", response)
+
+    def test_list_not_modified(self):
+        url = reverse("object-list")
+        params = {"type": self.object_type.url}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ObjectRecordFactory.create(object__object_type=self.object_type)
+
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 2)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_without_type(self):
+        response = self.client.get(reverse("object-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", response)
+
+
+class ObjectTypeGenerationTests(TestCase):
+    def test_increment_after_commit(self):
+        record = ObjectRecordFactory.create()
+        object_type = record.object.object_type
+        object_type.refresh_from_db()
+        generation = object_type.generation
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            ObjectRecordFactory.create(object=record.object)
+            object_type.refresh_from_db()
+            # the counter isn't changed before the commit
+            self.assertEqual(object_type.generation, generation)
+
+        self.assertEqual(len(callbacks), 2)
+        object_type.refresh_from_db()
+        # the writes of a transaction increment the counter once
+        self.assertEqual(object_type.generation, generation + 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            record.object.delete()
+
+        object_type.refresh_from_db()
+        self.assertEqual(object_type.generation, generation + 2)
+
+    def test_increment_once_per_transaction(self):
+        object_type = ObjectTypeFactory.create()
+        other_object_type = ObjectTypeFactory.create()
+
+        with CaptureQueriesContext(connection) as context:
+            with self.captureOnCommitCallbacks(execute=True):
+                ObjectRecordFactory.create_batch(3, object__object_type=object_type)
+                ObjectRecordFactory.create(object__object_type=other_object_type)
+
+        updates = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith('UPDATE "core_objecttype"')
+        ]
+        self.assertEqual(len(updates), 1)
+
+        object_type.refresh_from_db()
+        other_object_type.refresh_from_db()
+        self.assertEqual(object_type.generation, 1)
+        self.assertEqual(other_object_type.generation, 1)
+
+    def test_save_keeps_generation(self):
+        object_type = ObjectTypeFactory.create()
+        stale = ObjectType.objects.get(pk=object_type.pk)
+        ObjectType.objects.filter(pk=object_type.pk).update(generation=5)
+
+        stale.save()
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.generation, 5)
@@ -0,0 +1,144 @@
+import json
+from datetime import date, timedelta
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse_lazy
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+class ExportTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-export")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.permission = PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def test_export_ndjson(self):
+        record1 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"name": "first"}
+        )
+        record2 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"name": "second"}
+        )
+        # objects of other objecttypes are not allowed
+        ObjectRecordFactory.create()
+
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        data = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            [item["uuid"] for item in data],
+            [str(record2.object.uuid), str(record1.object.uuid)],
+        )
+        self.assertEqual(data[0]["record"]["data"], {"name": "second"})
+
+    def test_export_json(self):
+        record = ObjectRecordFactory.create(object__object_type=self.object_type)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+        data = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
+    def test_export_filters_and_fields(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"name": "first"},
+            start_at=date.today() - timedelta(days=10),
+        )
+        ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"name": "second"}
+        )
+
+        response = self.client.get(
+            self.url,
+            {"data_attrs": "name__exact__first", "fields": "uuid,record__data"},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"uuid": str(record.object.uuid), "record": {"data": {"name": "first"}}}],
+        )
+
+    def test_export_invalid_filter(self):
+        response = self.client.get(
+            self.url, {"data_attrs": "name"}, HTTP_ACCEPT="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_export_invalid_fields(self):
+        ObjectRecordFactory.create(object__object_type=self.object_type)
+
+        for fields in ("bogus", "record__bogus", "uuid__bogus", "record__index__bogus"):
+            with self.subTest(fields=fields):
+                response = self.client.get(
+                    self.url, {"fields": fields}, HTTP_ACCEPT="application/x-ndjson"
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertFalse(response.streaming)
+                error = json.loads(response.content)
+                self.assertEqual(error["invalidParams"][0]["code"], "invalid-fields")
+
+    def test_export_unauthorized_fields(self):
+        self.permission.use_fields = True
+        self.permission.fields = {"1": ["record__data__name", "record__index"]}
+        self.permission.save()
+        ObjectRecordFactory.create(
+            object__object_type=self.object_type, version=1, data={"name": "first"}
+        )
+
+        response = self.client.get(
+            self.url,
+            {"fields": "record__geometry"},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.streaming)
+
+        response = self.client.get(
+            self.url,
+            {"fields": "record__index,record__data__name"},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"record": {"index": 1, "data": {"name": "first"}}}],
+        )
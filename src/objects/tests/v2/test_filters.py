@@ -2,6 +2,7 @@ from datetime import date, timedelta
 from unittest.mock import patch
 
 from django.db.utils import ProgrammingError
+from django.test import override_settings
 
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -142,6 +143,69 @@ class FilterDataAttrsTests(TokenAuthMixin, APITestCase):
             f"http://testserver{reverse('object-detail', args=[record.object.uuid])}",
         )
 
+    def test_filter_exact_number_or_string(self):
+        record_number = ObjectRecordFactory.create(
+            data={"diameter": 4.0}, object__object_type=self.object_type
+        )
+        record_string = ObjectRecordFactory.create(
+            data={"diameter": "4"}, object__object_type=self.object_type
+        )
+        ObjectRecordFactory.create(
+            data={"diameter": "4.0"}, object__object_type=self.object_type
+        )
+
+        response = self.client.get(self.url, {"data_attrs": "diameter__exact__4"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()["results"]
+
+        self.assertEqual(
+            {result["uuid"] for result in data},
+            {str(record_number.object.uuid), str(record_string.object.uuid)},
+        )
+
+    def test_filter_exact_combined(self):
+        record = ObjectRecordFactory.create(
+            data={"name": "demo", "dimensions": {"height": 3, "width": "wide"}},
+            object__object_type=self.object_type,
+        )
+        ObjectRecordFactory.create(
+            data={"name": "demo", "dimensions": {"height": 3, "width": "narrow"}},
+            object__object_type=self.object_type,
+        )
+        ObjectRecordFactory.create(
+            data={"name": "demo", "dimensions": [{"height": 3, "width": "wide"}]},
+            object__object_type=self.object_type,
+        )
+
+        response = self.client.get(
+            self.url,
+            {
+                "data_attrs": "name__exact__demo,dimensions__width__exact__wide,"
+                "dimensions__height__exact__3"
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()["results"]
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
+    def test_filter_exact_conflicting_values(self):
+        ObjectRecordFactory.create(
+            data={"name": "demo"}, object__object_type=self.object_type
+        )
+
+        response = self.client.get(
+            self.url, {"data_attrs": "name__exact__demo,name__exact__other"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+
     def test_filter_exact_date(self):
         record = ObjectRecordFactory.create(
             data={"date": "2000-11-01"}, object__object_type=self.object_type
@@ -465,6 +529,27 @@ class FilterDateTests(TokenAuthMixin, APITestCase):
         )
         self.assertEqual(data[0]["record"]["index"], record11.index)
 
+    def test_filter_date_list_validity_bounds(self):
+        # object 1 - show, the validity period includes both dates
+        record1 = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            start_at="2020-07-01",
+            end_at="2020-07-01",
+        )
+        # object 2 - don't show, the record ends before it starts
+        ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            start_at="2020-07-01",
+            end_at="2020-06-01",
+        )
+
+        response = self.client.get(reverse_lazy("object-list"), {"date": "2020-07-01"})
+
+        data = response.json()["results"]
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record1.object.uuid))
+
     def test_filter_registration_date_detail(self):
         object = ObjectFactory.create(object_type=self.object_type)
         record1 = ObjectRecordFactory.create(
@@ -596,6 +681,59 @@ class FilterDataIcontainsTests(TokenAuthMixin, APITestCase):
             f"http://testserver{reverse('object-detail', args=[record.object.uuid])}",
         )
 
+    def test_filter_string_values_only(self):
+        record = ObjectRecordFactory.create(
+            data={"name": "Percentage", "tags": ["50%", "other"]},
+            object__object_type=self.object_type,
+        )
+        ObjectRecordFactory.create(
+            data={"name": "Per", "description": "centage", "percentage": 50},
+            object__object_type=self.object_type,
+        )
+
+        for value in ["PERCENT", "50%"]:
+            with self.subTest(value=value):
+                response = self.client.get(self.url, {"data_icontains": value})
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+                data = response.json()["results"]
+
+                self.assertEqual(len(data), 1)
+                self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
+    def test_filter_updated_data(self):
+        record = ObjectRecordFactory.create(
+            data={"name": "Something important"}, object__object_type=self.object_type
+        )
+        record.data = {"name": "Nothing important"}
+        record.save()
+
+        response = self.client.get(self.url, {"data_icontains": "some"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+
+    @override_settings(DATA_ICONTAINS_MODE="jsonpath")
+    def test_filter_jsonpath(self):
+        record = ObjectRecordFactory.create(
+            data={"person": {"name": "Something important"}},
+            object__object_type=self.object_type,
+        )
+        ObjectRecordFactory.create(
+            data={"person": {"name": "Nothing important"}},
+            object__object_type=self.object_type,
+        )
+
+        response = self.client.get(self.url, {"data_icontains": "^some"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.json()["results"]
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
     @patch(
         "objects.core.query.ObjectRecordQuerySet._fetch_all",
         side_effect=ProgrammingError("'jsonpath' is not found"),
@@ -0,0 +1,220 @@
+import json
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.api.utils import decode_history_delta
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+class HistoryTests(TokenAuthMixin, APITestCase):
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            data={"name": "first"},
+            start_at=date(2020, 1, 1),
+            registration_at=date(2020, 1, 1),
+        )
+        self.object = record.object
+        for name, start_at in (
+            ("second", date(2021, 1, 1)),
+            ("third", date(2022, 1, 1)),
+        ):
+            ObjectRecordFactory.create(
+                object=self.object,
+                version=record.version,
+                data={"name": name},
+                start_at=start_at,
+                registration_at=start_at,
+            )
+        self.url = reverse("object-history", args=[self.object.uuid])
+
+    def test_history_without_cursor(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([record["index"] for record in response.json()], [1, 2, 3])
+
+    def test_history_cursor_pagination(self):
+        response = self.client.get(self.url, {"cursor": "", "pageSize": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([record["index"] for record in data["results"]], [1, 2])
+        self.assertIsNotNone(data["next"])
+
+        data = self.client.get(data["next"]).json()
+
+        self.assertEqual([record["index"] for record in data["results"]], [3])
+        self.assertIsNone(data["next"])
+
+    def test_history_range_filters(self):
+        for params, indices in (
+            ({"index__gte": 2}, [2, 3]),
+            ({"index__lte": 2}, [1, 2]),
+            ({"startAt__gte": "2021-01-01", "startAt__lte": "2021-12-31"}, [2]),
+            ({"registrationAt__lte": "2020-12-31"}, [1]),
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [record["index"] for record in response.json()], indices
+                )
+
+    def test_history_invalid_filter(self):
+        response = self.client.get(self.url, {"index__gte": "first"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_history_fields(self):
+        response = self.client.get(self.url, {"fields": "index,data__name,data__size"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                {"index": 1, "data": {"name": "first"}},
+                {"index": 2, "data": {"name": "second"}},
+                {"index": 3, "data": {"name": "third"}},
+            ],
+        )
+
+    def test_history_invalid_fields(self):
+        for fields in ("index,size", "index__value"):
+            with self.subTest(fields=fields):
+                response = self.client.get(self.url, {"fields": fields})
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("fields", response.json()["invalidParams"][0]["name"])
+
+    def test_history_ndjson(self):
+        response = self.client.get(
+            self.url, {"index__gte": 2}, HTTP_ACCEPT="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(
+            [json.loads(line)["data"] for line in lines],
+            [{"name": "second"}, {"name": "third"}],
+        )
+
+    def test_history_etag_depends_on_media_type(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(
+            self.url, HTTP_ACCEPT="application/x-ndjson", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_history_delta(self):
+        records = self.client.get(self.url).json()
+
+        response = self.client.get(self.url, {"delta": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data[0], records[0])
+        self.assertIn(
+            {"op": "replace", "path": "/data/name", "value": "second"},
+            data[1]["patch"],
+        )
+        self.assertEqual(list(decode_history_delta(data)), records)
+
+    def test_history_delta_pages(self):
+        records = self.client.get(self.url).json()
+
+        data = self.client.get(
+            self.url, {"delta": "true", "cursor": "", "pageSize": 2}
+        ).json()
+        next_data = self.client.get(data["next"]).json()
+
+        # every page starts with a full record
+        self.assertEqual(next_data["results"], [records[2]])
+        self.assertEqual(list(decode_history_delta(data["results"])), records[:2])
+
+    def test_history_delta_ndjson(self):
+        records = self.client.get(self.url, {"fields": "index,data"}).json()
+
+        response = self.client.get(
+            self.url,
+            {"delta": "true", "fields": "index,data"},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        items = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            items[1:],
+            [
+                {
+                    "patch": [
+                        {"op": "replace", "path": "/data/name", "value": name},
+                        {"op": "replace", "path": "/index", "value": index},
+                    ]
+                }
+                for index, name in ((2, "second"), (3, "third"))
+            ],
+        )
+        self.assertEqual(list(decode_history_delta(items)), records)
+
+    def test_history_invalid_delta(self):
+        response = self.client.get(self.url, {"delta": "maybe"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_history_corrections_without_extra_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+
+        records = list(self.object.records.order_by("index"))
+        for record in records[1:]:
+            ObjectRecordFactory.create(
+                object=self.object,
+                version=record.version,
+                start_at=record.start_at,
+                correct=record,
+            )
+
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.client.get(self.url)
+
+        self.assertEqual(
+            [record["correctedBy"] for record in response.json()],
+            [None, 4, 5, None, None],
+        )
@@ -0,0 +1,328 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.constants import IndexStatus
+from objects.core.indexes import get_index_names
+from objects.core.models import IndexedAttribute
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse, reverse_lazy
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+class IndexedAttributeTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-list")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def _create_indexed_attribute(self, **kwargs) -> IndexedAttribute:
+        indexed_attribute = IndexedAttribute.objects.create(
+            object_type=self.object_type, **kwargs
+        )
+        self._build_indexes()
+        indexed_attribute.refresh_from_db()
+        return indexed_attribute
+
+    def _build_indexes(self) -> str:
+        stdout = StringIO()
+        call_command("build_indexes", stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def test_index_lifecycle(self):
+        indexed_attribute = IndexedAttribute.objects.create(
+            object_type=self.object_type, path="dimensions__height", type="number"
+        )
+        height_index_name = indexed_attribute.index_name
+
+        # the index isn't built when the attribute is saved
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.pending)
+        self.assertNotIn(height_index_name, get_index_names())
+
+        self.assertIn("Built index of", self._build_indexes())
+
+        indexed_attribute.refresh_from_db()
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.ready)
+        self.assertIn(height_index_name, get_index_names())
+
+        # the index is the same for all the types
+        indexed_attribute.type = "string"
+        indexed_attribute.save()
+
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.ready)
+
+        indexed_attribute.path = "dimensions__width"
+        indexed_attribute.save()
+
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.pending)
+
+        self._build_indexes()
+
+        self.assertNotIn(height_index_name, get_index_names())
+        self.assertIn(indexed_attribute.index_name, get_index_names())
+
+        indexed_attribute.delete()
+        self._build_indexes()
+
+        self.assertNotIn(indexed_attribute.index_name, get_index_names())
+
+    def test_index_status_unchanged_on_save(self):
+        indexed_attribute = self._create_indexed_attribute(path="name", type="string")
+
+        indexed_attribute.save()
+
+        indexed_attribute.refresh_from_db()
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.ready)
+
+    def test_failed_index(self):
+        indexed_attribute = IndexedAttribute.objects.create(
+            object_type=self.object_type, path="name", type="string"
+        )
+
+        with patch(
+            "objects.core.indexes.create_index", side_effect=DatabaseError("timeout")
+        ):
+            self._build_indexes()
+
+        indexed_attribute.refresh_from_db()
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.failed)
+
+        # failed indexes are only built again on request
+        self._build_indexes()
+        indexed_attribute.refresh_from_db()
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.failed)
+
+        call_command("build_indexes", retry_failed=True, stdout=StringIO())
+        indexed_attribute.refresh_from_db()
+        self.assertEqual(indexed_attribute.index_status, IndexStatus.ready)
+
+    def test_filter_without_ready_index(self):
+        IndexedAttribute.objects.create(
+            object_type=self.object_type, path="dimensions__height", type="number"
+        )
+        ObjectRecordFactory.create(
+            data={"dimensions": {"height": 10}}, object__object_type=self.object_type
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url,
+                {
+                    "type": self.object_type.url,
+                    "data_attrs": "dimensions__height__exact__10",
+                },
+            )
+
+        self.assertEqual(response.json()["count"], 1)
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if "::text[]" in query["sql"]
+            ]
+        )
+
+    def test_filter_number(self):
+        self._create_indexed_attribute(path="dimensions__height", type="number")
+        record = ObjectRecordFactory.create(
+            data={"dimensions": {"height": 10}}, object__object_type=self.object_type
+        )
+        ObjectRecordFactory.create(
+            data={"dimensions": {"height": 9}}, object__object_type=self.object_type
+        )
+        ObjectRecordFactory.create(
+            data={"dimensions": {"height": "10"}}, object__object_type=self.object_type
+        )
+
+        response = self.client.get(
+            self.url,
+            {
+                "type": self.object_type.url,
+                "data_attrs": "dimensions__height__gte__9.5",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(
+            data[0]["url"],
+            f"http://testserver{reverse('object-detail', args=[record.object.uuid])}",
+        )
+
+    def test_filter_string(self):
+        self._create_indexed_attribute(path="name", type="string")
+        record = ObjectRecordFactory.create(
+            data={"name": "demo"}, object__object_type=self.object_type
+        )
+        ObjectRecordFactory.create(
+            data={"name": "demo2"}, object__object_type=self.object_type
+        )
+
+        response = self.client.get(
+            self.url,
+            {"type": self.object_type.url, "data_attrs": "name__exact__demo"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
+    def test_filter_date(self):
+        self._create_indexed_attribute(path="plantDate", type="date")
+        record = ObjectRecordFactory.create(
+            data={"plantDate": "2020-10-10"}, object__object_type=self.object_type
+        )
+        ObjectRecordFactory.create(
+            data={"plantDate": "2020-01-01"}, object__object_type=self.object_type
+        )
+
+        response = self.client.get(
+            self.url,
+            {"type": self.object_type.url, "data_attrs": "plantDate__gt__2020-06-01"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["uuid"], str(record.object.uuid))
+
+    def test_filter_uses_index_expression(self):
+        indexed_attribute = self._create_indexed_attribute(
+            path="dimensions__height", type="number"
+        )
+        ObjectRecordFactory.create(
+            data={"dimensions": {"height": 10}}, object__object_type=self.object_type
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.url,
+                {
+                    "type": self.object_type.url,
+                    "data_attrs": "dimensions__height__exact__10",
+                },
+            )
+
+        self.assertEqual(response.json()["count"], 1)
+        filter_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "::text[]" in query["sql"]
+        ]
+        self.assertTrue(filter_queries)
+        for query in filter_queries:
+            with self.subTest(query=query):
+                # the condition of the partial index
+                self.assertIn(
+                    f'"core_objectrecord"."_object_type_id" = {self.object_type.id}',
+                    query,
+                )
+        self.assertIn(indexed_attribute.index_name, get_index_names())
+
+    def _get_uuids(self, data_attrs: str) -> list:
+        response = self.client.get(
+            self.url,
+            {"type": self.object_type.url, "data_attrs": data_attrs, "pageSize": 100},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(result["uuid"] for result in response.json()["results"])
+
+    def _assert_same_results(self, indexed_attribute_kwargs: dict, all_data_attrs):
+        expected = [self._get_uuids(data_attrs) for data_attrs in all_data_attrs]
+
+        self._create_indexed_attribute(**indexed_attribute_kwargs)
+
+        for data_attrs, expected_uuids in zip(all_data_attrs, expected):
+            with self.subTest(data_attrs=data_attrs):
+                with CaptureQueriesContext(connection) as context:
+                    uuids = self._get_uuids(data_attrs)
+
+                self.assertEqual(uuids, expected_uuids)
+                # the index is used
+                self.assertTrue(
+                    [
+                        query["sql"]
+                        for query in context.captured_queries
+                        if "::text[]" in query["sql"]
+                    ]
+                )
+
+    def test_filter_mixed_types(self):
+        for value in [
+            8,
+            8.0,
+            9.5,
+            "8",
+            "8.0",
+            "10",
+            "demo",
+            "true",
+            True,
+            False,
+            None,
+            [8],
+            {"value": 8},
+            "2020-10-10",
+            "2020-01-01",
+        ]:
+            ObjectRecordFactory.create(
+                data={"dimensions": {"height": value}, "name": value},
+                object__object_type=self.object_type,
+            )
+        ObjectRecordFactory.create(data={}, object__object_type=self.object_type)
+
+        number_data_attrs = [
+            "dimensions__height__exact__8",
+            "dimensions__height__exact__8.0",
+            "dimensions__height__gt__8",
+            "dimensions__height__gte__8",
+            "dimensions__height__lt__9",
+            "dimensions__height__lte__9.5",
+        ]
+        self._assert_same_results(
+            {"path": "dimensions__height", "type": "number"}, number_data_attrs
+        )
+
+        string_data_attrs = [
+            "name__exact__8",
+            "name__exact__demo",
+            "name__exact__true",
+            "name__exact__2020-10-10",
+        ]
+        self._assert_same_results({"path": "name", "type": "string"}, string_data_attrs)
+
+    def test_filter_mixed_types_date(self):
+        for value in ["2020-10-10", "2020-01-01", "2020", 2021, True, None, "demo"]:
+            ObjectRecordFactory.create(
+                data={"plantDate": value}, object__object_type=self.object_type
+            )
+
+        self._assert_same_results(
+            {"path": "plantDate", "type": "date"},
+            [
+                "plantDate__exact__2020-10-10",
+                "plantDate__gt__2020-06-01",
+                "plantDate__lte__2020-06-01",
+            ],
+        )
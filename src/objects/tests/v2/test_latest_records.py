@@ -0,0 +1,196 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.models import ObjectRecord
+from objects.core.tests.factories import (
+    ObjectFactory,
+    ObjectRecordFactory,
+    ObjectTypeFactory,
+)
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@freeze_time("2020-08-08")
+class LatestRecordTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def test_new_record_is_latest(self):
+        object = ObjectFactory.create(object_type=self.object_type)
+        record1 = ObjectRecordFactory.create(object=object, start_at=date(2020, 1, 1))
+        self.assertTrue(record1.is_latest)
+
+        record2 = ObjectRecordFactory.create(object=object, start_at=date(2020, 2, 1))
+        record3 = ObjectRecordFactory.create(
+            object=object, start_at=date(2020, 2, 1), correct=record2
+        )
+
+        self.assertEqual(
+            list(object.records.filter(is_latest=True)),
+            [record3],
+        )
+
+    def test_list_actual_records(self):
+        object = ObjectFactory.create(object_type=self.object_type)
+        ObjectRecordFactory.create(object=object, start_at=date(2020, 1, 1))
+        record = ObjectRecordFactory.create(object=object, start_at=date.today())
+
+        response = self.client.get(reverse("object-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["record"]["index"], record.index)
+
+    def test_list_latest_record_in_future(self):
+        object = ObjectFactory.create(object_type=self.object_type)
+        record = ObjectRecordFactory.create(object=object, start_at=date(2020, 1, 1))
+        ObjectRecordFactory.create(
+            object=object, start_at=date.today() + timedelta(days=1)
+        )
+
+        response = self.client.get(reverse("object-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["record"]["index"], record.index)
+
+    def test_list_data_attrs_of_actual_records(self):
+        object = ObjectFactory.create(object_type=self.object_type)
+        ObjectRecordFactory.create(
+            object=object, start_at=date(2020, 1, 1), data={"name": "previous"}
+        )
+        record = ObjectRecordFactory.create(
+            object=object, start_at=date.today(), data={"name": "actual"}
+        )
+
+        for name, indices in (("previous", []), ("actual", [record.index])):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse("object-list"), {"data_attrs": f"name__exact__{name}"}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [item["record"]["index"] for item in response.json()["results"]],
+                    indices,
+                )
+
+    def test_list_data_attrs_latest_record_in_future(self):
+        # the filters apply to the records valid today, like with the `date` query
+        # parameter
+        object = ObjectFactory.create(object_type=self.object_type)
+        record = ObjectRecordFactory.create(
+            object=object, start_at=date(2020, 1, 1), data={"name": "actual"}
+        )
+        ObjectRecordFactory.create(
+            object=object,
+            start_at=date.today() + timedelta(days=1),
+            data={"name": "future"},
+        )
+        # an object without a record in the future
+        other_record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            start_at=date(2020, 1, 1),
+            data={"name": "actual"},
+        )
+
+        for name, expected in (
+            (
+                "actual",
+                {
+                    str(object.uuid): record.index,
+                    str(other_record.object.uuid): other_record.index,
+                },
+            ),
+            ("future", {}),
+        ):
+            with self.subTest(name=name):
+                response = self.client.get(
+                    reverse("object-list"), {"data_attrs": f"name__exact__{name}"}
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    {
+                        item["uuid"]: item["record"]["index"]
+                        for item in response.json()["results"]
+                    },
+                    expected,
+                )
+
+    def test_list_type_without_latest_records_in_future(self):
+        other_object_type = ObjectTypeFactory(service=self.object_type.service)
+        PermissionFactory.create(
+            object_type=other_object_type,
+            mode=PermissionModes.read_only,
+            token_auth=self.token_auth,
+        )
+        ObjectRecordFactory.create(
+            object__object_type=other_object_type,
+            start_at=date.today() + timedelta(days=1),
+        )
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type, start_at=date(2020, 1, 1)
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("object-list"), {"type": self.object_type.url}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["uuid"] for item in response.json()["results"]],
+            [str(record.object.uuid)],
+        )
+        # the records in the future of other OBJECTTYPEs don't matter, the latest
+        # records are shown
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if "daterange(" in query["sql"]
+            ]
+        )
+
+    def test_check_latest_records(self):
+        record = ObjectRecordFactory.create(object__object_type=self.object_type)
+        stdout = StringIO()
+
+        call_command("check_latest_records", stdout=stdout)
+
+        self.assertIn("are consistent", stdout.getvalue())
+
+        ObjectRecord.objects.filter(id=record.id).update(is_latest=False)
+
+        with self.assertRaises(CommandError):
+            call_command("check_latest_records", stdout=StringIO())
+
+        call_command("check_latest_records", fix=True, stdout=StringIO())
+
+        record.refresh_from_db()
+        self.assertTrue(record.is_latest)
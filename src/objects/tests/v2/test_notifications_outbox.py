@@ -0,0 +1,157 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from freezegun import freeze_time
+from zds_client import ClientError
+
+from objects.core.constants import NotificationStatus
+from objects.core.models import OutgoingNotification
+from objects.core.outbox import add_notifications, get_stats, send_batch
+
+
+def get_message(main_object: str, action: str = "create") -> dict:
+    return {
+        "kanaal": "objecten",
+        "hoofdObject": main_object,
+        "resource": "object",
+        "resourceUrl": main_object,
+        "actie": action,
+        "aanmaakdatum": "2018-09-07T02:00:00+02:00",
+        "kenmerken": {"objectType": "https://example.com/objecttypes/1"},
+    }
+
+
+@freeze_time("2018-09-07T00:00:00Z")
+@override_settings(
+    NOTIFICATIONS_OUTBOX_MAX_ATTEMPTS=3,
+    NOTIFICATIONS_OUTBOX_RETRY_BACKOFF=10,
+    NOTIFICATIONS_OUTBOX_RETRY_BACKOFF_MAX=15,
+)
+class OutboxTests(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.client = MagicMock(base_url="https://notificaties.example.com/api/v1/")
+
+    def test_send(self):
+        add_notifications([get_message("a"), get_message("b")])
+
+        result = send_batch(batch_size=10, client=self.client)
+
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(
+            [call.args[1]["hoofdObject"] for call in self.client.create.call_args_list],
+            ["a", "b"],
+        )
+        self.assertFalse(OutgoingNotification.objects.exists())
+
+    def test_send_in_order_per_object(self):
+        add_notifications(
+            [
+                get_message("a", "create"),
+                get_message("a", "update"),
+                get_message("b", "create"),
+            ]
+        )
+        self.client.create.side_effect = [ClientError("down"), None]
+
+        result = send_batch(batch_size=10, client=self.client)
+
+        # the update of "a" waits for the create of "a"
+        self.assertEqual((result.sent, result.retried), (1, 1))
+        self.assertEqual(
+            [call.args[1]["hoofdObject"] for call in self.client.create.call_args_list],
+            ["a", "b"],
+        )
+        self.assertEqual(
+            list(
+                OutgoingNotification.objects.order_by("id").values_list(
+                    "message__actie", flat=True
+                )
+            ),
+            ["create", "update"],
+        )
+
+    def test_retry_backoff(self):
+        add_notifications([get_message("a")])
+        self.client.create.side_effect = ClientError("down")
+
+        send_batch(batch_size=10, client=self.client)
+
+        notification = OutgoingNotification.objects.get()
+        self.assertEqual(notification.attempts, 1)
+        self.assertEqual(notification.status, NotificationStatus.pending)
+        self.assertEqual(
+            notification.next_attempt_at, timezone.now() + timedelta(seconds=10)
+        )
+        self.assertEqual(notification.last_error, "down")
+
+        # not due yet
+        self.assertFalse(send_batch(batch_size=10, client=self.client))
+
+        with freeze_time(timezone.now() + timedelta(seconds=10)):
+            send_batch(batch_size=10, client=self.client)
+
+            notification.refresh_from_db()
+            self.assertEqual(notification.attempts, 2)
+            # the backoff is capped
+            self.assertEqual(
+                notification.next_attempt_at, timezone.now() + timedelta(seconds=15)
+            )
+
+    def test_failed_after_max_attempts(self):
+        add_notifications([get_message("a")])
+        OutgoingNotification.objects.update(attempts=2)
+        self.client.create.side_effect = ClientError("down")
+
+        result = send_batch(batch_size=10, client=self.client)
+
+        self.assertEqual(result.failed, 1)
+        notification = OutgoingNotification.objects.get()
+        self.assertEqual(notification.status, NotificationStatus.failed)
+        self.assertEqual(get_stats().failed, 1)
+        self.assertEqual(get_stats().pending, 0)
+
+    def test_failed_holds_later_notifications(self):
+        add_notifications([get_message("a", "create")])
+        OutgoingNotification.objects.update(attempts=2)
+        self.client.create.side_effect = ClientError("down")
+        send_batch(batch_size=10, client=self.client)
+        add_notifications([get_message("a", "update"), get_message("b", "create")])
+        self.client.create.reset_mock(side_effect=True)
+
+        result = send_batch(batch_size=10, client=self.client)
+
+        # the update of "a" waits until the failed create of "a" is retried
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(
+            [call.args[1]["hoofdObject"] for call in self.client.create.call_args_list],
+            ["b"],
+        )
+
+        OutgoingNotification.objects.filter(status=NotificationStatus.failed).update(
+            status=NotificationStatus.pending, attempts=0
+        )
+        send_batch(batch_size=10, client=self.client)
+        send_batch(batch_size=10, client=self.client)
+
+        self.assertEqual(
+            [call.args[1]["actie"] for call in self.client.create.call_args_list[1:]],
+            ["create", "update"],
+        )
+        self.assertFalse(OutgoingNotification.objects.exists())
+
+    def test_stats_command(self):
+        add_notifications([get_message("a")])
+        stdout = StringIO()
+
+        with freeze_time(timezone.now() + timedelta(seconds=30)):
+            call_command("send_notifications", stats=True, stdout=stdout)
+
+        self.assertIn("pending: 1", stdout.getvalue())
+        self.assertIn("oldest_pending_age: 30.0", stdout.getvalue())
@@ -10,6 +10,7 @@ from vng_api_common.notifications.models import NotificationsConfig
 from zgw_consumers.constants import APITypes
 from zgw_consumers.models import Service
 
+from objects.core.outbox import send_batch
 from objects.core.tests.factories import (
     ObjectFactory,
     ObjectRecordFactory,
@@ -95,6 +96,10 @@ class SendNotifTestCase(TokenAuthMixin, APITestCase):
 
         data = response.json()
 
+        # the notification is sent by the outbox worker
+        client.create.assert_not_called()
+        send_batch(batch_size=10)
+
         client.create.assert_called_once_with(
             "notificaties",
             {
@@ -147,6 +152,10 @@ class SendNotifTestCase(TokenAuthMixin, APITestCase):
 
         data = response.json()
 
+        # the notification is sent by the outbox worker
+        client.create.assert_not_called()
+        send_batch(batch_size=10)
+
         client.create.assert_called_once_with(
             "notificaties",
             {
@@ -199,6 +208,10 @@ class SendNotifTestCase(TokenAuthMixin, APITestCase):
 
         data = response.json()
 
+        # the notification is sent by the outbox worker
+        client.create.assert_not_called()
+        send_batch(batch_size=10)
+
         client.create.assert_called_once_with(
             "notificaties",
             {
@@ -238,6 +251,10 @@ class SendNotifTestCase(TokenAuthMixin, APITestCase):
             response.status_code, status.HTTP_204_NO_CONTENT, response.data
         )
 
+        # the notification is sent by the outbox worker
+        client.create.assert_not_called()
+        send_batch(batch_size=10)
+
         client.create.assert_called_once_with(
             "notificaties",
             {
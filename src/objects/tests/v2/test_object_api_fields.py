@@ -1,5 +1,8 @@
 from datetime import date
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -112,3 +115,57 @@ class DynamicFieldsTests(TokenAuthMixin, APITestCase):
                 "'fields' query parameter has invalid or unauthorized values: 'someField'"
             ],
         )
+
+    def test_list_selected_fields_are_loaded(self):
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            start_at=date.today(),
+            data={"name": "demo", "nothing": None, "description": "x" * 1000},
+            geometry="POINT (4.910649523925713 52.37240093589432)",
+        )
+        list_record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            start_at=date.today(),
+            data=["name"],
+        )
+        url = reverse("object-list")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                url,
+                {
+                    "fields": "uuid,record__data__name,record__data__nothing,"
+                    "record__data__absent"
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"uuid": str(list_record.object.uuid), "record": {"data": {}}},
+                {
+                    "uuid": str(record.object.uuid),
+                    "record": {"data": {"name": "demo", "nothing": None}},
+                },
+            ],
+        )
+        list_query = context.captured_queries[-1]["sql"]
+        self.assertNotIn('"core_objectrecord"."geometry"', list_query)
+        self.assertNotIn('"core_objectrecord"."_search_text"', list_query)
+        self.assertNotIn('LEFT OUTER JOIN "core_objectrecord"', list_query)
+        self.assertIn("jsonb_build_object", list_query)
+
+    def test_list_selected_fields_without_data(self):
+        ObjectRecordFactory.create(
+            object__object_type=self.object_type, start_at=date.today()
+        )
+        url = reverse("object-list")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"fields": "url,record__index"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"][0]["record"], {"index": 1})
+        list_query = context.captured_queries[-1]["sql"]
+        self.assertNotIn('"core_objectrecord"."data"', list_query.split("FROM")[0])
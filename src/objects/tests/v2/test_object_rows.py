@@ -0,0 +1,178 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.gis.geos import GeometryCollection, LineString, Point, Polygon
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.api.rows import ObjectRowSerializer
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+# all the fields, so the records are rendered with ObjectSerializer
+ALL_FIELDS = "url,uuid,type,record"
+
+
+class ObjectRowSerializerTests(TokenAuthMixin, APITestCase):
+    """compare the rows with the data of ObjectSerializer"""
+
+    maxDiff = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.other_object_type = ObjectTypeFactory(
+            service__api_root="https://other.example.com/api/v1/"
+        )
+        for object_type in (cls.object_type, cls.other_object_type):
+            PermissionFactory.create(
+                object_type=object_type,
+                mode=PermissionModes.read_only,
+                token_auth=cls.token_auth,
+            )
+
+        today = date.today()
+        record = ObjectRecordFactory.create(
+            object__object_type=cls.object_type,
+            start_at=today - timedelta(days=10),
+            geometry=Point(4.910649523925713, 52.37240093589432),
+            data={"name": "first", "nested": {"value": 1.1, "items": [1, "ü", None]}},
+        )
+        ObjectRecordFactory.create(
+            object=record.object,
+            start_at=today - timedelta(days=5),
+            correct=record,
+            geometry=Polygon(
+                ((4.9, 52.3), (4.9123456789012, 52.4), (5.0, 52.4), (4.9, 52.3))
+            ),
+            data={"name": "correction"},
+        )
+        ObjectRecordFactory.create(
+            object__object_type=cls.object_type,
+            start_at=today - timedelta(days=30),
+            geometry=None,
+            data={},
+        )
+        ObjectRecordFactory.create(
+            object__object_type=cls.other_object_type,
+            start_at=today - timedelta(days=20),
+            end_at=today + timedelta(days=20),
+            geometry=GeometryCollection(
+                Point(0.1, -0.000001), LineString((1, 1), (2, 2.000000000000001))
+            ),
+            data={"name": "other"},
+        )
+
+    def assertSameResults(self, url, params=None, method="get", **kwargs):
+        """
+        compare the results with the results of the same request with all the fields
+        """
+        request = getattr(self.client, method)
+
+        with patch.object(
+            ObjectRowSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=ObjectRowSerializer.to_representation,
+        ) as mock_rows:
+            response = request(url, params, **kwargs)
+            self.assertTrue(mock_rows.called)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("x-unauthorized-fields", response)
+
+        serializer_response = request(f"{url}?fields={ALL_FIELDS}", params, **kwargs)
+
+        self.assertEqual(serializer_response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        expected = serializer_response.json()
+        self.assertEqual(data.get("count"), expected.get("count"))
+        self.assertEqual(data["results"], expected["results"])
+        return data
+
+    def test_list(self):
+        data = self.assertSameResults(reverse("object-list"))
+
+        self.assertEqual(data["count"], 3)
+
+    def test_list_history(self):
+        data = self.assertSameResults(
+            reverse("object-list"), {"date": date.today() - timedelta(days=7)}
+        )
+
+        self.assertEqual(data["count"], 3)
+
+    def test_list_cursor_pagination(self):
+        url = reverse("object-list")
+        params = {"ordering": "record__data__name", "pageSize": 2, "cursor": ""}
+
+        data = self.assertSameResults(url, params)
+
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNotNone(data["next"])
+
+    def test_search(self):
+        data = self.assertSameResults(
+            reverse("object-search"),
+            {
+                "geometry": {
+                    "within": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [
+                                [4.8, 52.2],
+                                [4.8, 52.5],
+                                [5.1, 52.5],
+                                [5.1, 52.2],
+                                [4.8, 52.2],
+                            ]
+                        ],
+                    }
+                }
+            },
+            method="post",
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(data["count"], 1)
+
+    def test_export(self):
+        with patch.object(
+            ObjectRowSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=ObjectRowSerializer.to_representation,
+        ) as mock_rows:
+            response = self.client.get(reverse("object-export"))
+            data = b"".join(response.streaming_content)
+            self.assertEqual(mock_rows.call_count, 3)
+
+        serializer_response = self.client.get(
+            reverse("object-export"), {"fields": ALL_FIELDS}
+        )
+
+        self.assertEqual(data, b"".join(serializer_response.streaming_content))
+
+    def test_field_based_authorization_uses_serializer(self):
+        PermissionFactory.create(
+            mode=PermissionModes.read_only,
+            token_auth=self.token_auth,
+            use_fields=True,
+            fields={"1": ["record__data__name"]},
+        )
+
+        with patch.object(ObjectRowSerializer, "to_representation") as mock_rows:
+            response = self.client.get(reverse("object-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_rows.assert_not_called()
@@ -0,0 +1,167 @@
+from django.test import override_settings
+from django.utils import timezone
+
+import requests_mock
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.cache import schema_cache
+from objects.core.loaders import ObjectTypeLoader
+from objects.core.models import ObjectType
+from objects.core.resolver import object_type_resolver
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from ..utils import mock_objecttype, mock_objecttype_version, mock_service_oas_get
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@requests_mock.Mocker()
+class ObjectTypeLoaderTests(TokenAuthMixin, APITestCase):
+    """
+    Check the number of calls to the Objecttypes API per write
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        # the OBJECTTYPE is mirrored like it is after its configuration in the admin
+        cls.object_type = ObjectTypeFactory(
+            service__api_root=OBJECT_TYPES_API, last_synced=timezone.now()
+        )
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+        object_type_resolver.clear()
+        self.addCleanup(object_type_resolver.clear)
+
+    def _mock_objecttypes_api(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(self.object_type.url, json=mock_objecttype(self.object_type.url))
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+
+    def _get_remote_calls(self, m) -> list:
+        """return the calls to the Objecttypes API resources"""
+        return [
+            req.url
+            for req in m.request_history
+            if req.url.startswith(self.object_type.url)
+        ]
+
+    def _get_body(self, geometry=True) -> dict:
+        record = {
+            "typeVersion": 1,
+            "data": {"plantDate": "2020-04-12", "diameter": 30},
+            "startAt": "2020-01-01",
+        }
+        if geometry:
+            record["geometry"] = {
+                "type": "Point",
+                "coordinates": [4.910649523925713, 52.37240093589432],
+            }
+        return {"type": self.object_type.url, "record": record}
+
+    def test_create_without_geometry(self, m):
+        self._mock_objecttypes_api(m)
+
+        response = self.client.post(
+            reverse("object-list"), self._get_body(geometry=False), **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            self._get_remote_calls(m), [f"{self.object_type.url}/versions/1"]
+        )
+
+    def test_create_with_geometry(self, m):
+        self._mock_objecttypes_api(m)
+
+        response = self.client.post(
+            reverse("object-list"), self._get_body(), **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # the OBJECTTYPE itself is mirrored when it's configured in the admin
+        self.assertEqual(
+            self._get_remote_calls(m), [f"{self.object_type.url}/versions/1"]
+        )
+
+    def test_update_with_geometry(self, m):
+        self._mock_objecttypes_api(m)
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type, version=1
+        )
+        url = reverse("object-detail", args=[record.object.uuid])
+
+        response = self.client.put(url, self._get_body(), **GEO_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._get_remote_calls(m), [f"{self.object_type.url}/versions/1"]
+        )
+
+    def test_create_with_geometry_not_mirrored_objecttype(self, m):
+        self._mock_objecttypes_api(m)
+        self.object_type.last_synced = None
+        self.object_type.save()
+
+        response = self.client.post(
+            reverse("object-list"), self._get_body(), **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertCountEqual(
+            self._get_remote_calls(m),
+            [self.object_type.url, f"{self.object_type.url}/versions/1"],
+        )
+
+    def test_loader_doesnt_share_filtered_lookups(self, m):
+        loader = ObjectTypeLoader()
+
+        self.assertEqual(loader.get_by_url(self.object_type.url), self.object_type)
+        with self.assertRaises(ObjectType.DoesNotExist):
+            loader.get_by_url(
+                self.object_type.url,
+                ObjectType.objects.exclude(pk=self.object_type.pk),
+            )
+
+    @override_settings(OBJECTTYPE_SCHEMA_CACHE_TIMEOUT=60)
+    def test_process_scoped_cache(self, m):
+        self._mock_objecttypes_api(m)
+        self.client.post(reverse("object-list"), self._get_body(), **GEO_WRITE_KWARGS)
+        m.reset_mock()
+
+        response = self.client.post(
+            reverse("object-list"), self._get_body(), **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._get_remote_calls(m), [])
+
+    def test_loader_resolves_object_type_once(self, m):
+        loader = ObjectTypeLoader()
+
+        with self.assertNumQueries(2):
+            # service and object type lookups
+            object_type = loader.get_by_url(self.object_type.url)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(loader.get_by_url(self.object_type.url), object_type)
+            self.assertEqual(object_type.url, self.object_type.url)
@@ -0,0 +1,203 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+import requests_mock
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.cache import schema_cache
+from objects.core.models import ObjectTypeVersion
+from objects.core.tests.factories import ObjectTypeFactory, ObjectTypeVersionFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from ..utils import mock_objecttype, mock_objecttype_version, mock_service_oas_get
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@requests_mock.Mocker()
+class ObjectTypeMirrorTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+
+    def _create_object(self, data: dict, geometry=True):
+        record = {"typeVersion": 1, "data": data, "startAt": "2020-01-01"}
+        if geometry:
+            record["geometry"] = {
+                "type": "Point",
+                "coordinates": [4.910649523925713, 52.37240093589432],
+            }
+        body = {"type": self.object_type.url, "record": record}
+        return self.client.post(reverse("object-list"), body, **GEO_WRITE_KWARGS)
+
+    def _mirror(self, allow_geometry=True, last_synced=None):
+        last_synced = last_synced or timezone.now()
+        self.object_type.allow_geometry = allow_geometry
+        self.object_type.last_synced = last_synced
+        self.object_type.save()
+        return ObjectTypeVersionFactory.create(
+            object_type=self.object_type, version=1, last_synced=last_synced
+        )
+
+    def test_missing_version_is_mirrored(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(self.object_type.url, json=mock_objecttype(self.object_type.url))
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+
+        response = self._create_object({"diameter": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.object_type.refresh_from_db()
+        self.assertTrue(self.object_type.allow_geometry)
+        self.assertIsNotNone(self.object_type.last_synced)
+
+        mirrored = ObjectTypeVersion.objects.get()
+        self.assertEqual(mirrored.object_type, self.object_type)
+        self.assertEqual(mirrored.version, 1)
+        self.assertEqual(mirrored.status, "published")
+        self.assertEqual(mirrored.published_at, date(2020, 11, 16))
+        self.assertEqual(mirrored.json_schema["required"], ["diameter"])
+
+    def test_validation_without_objecttypes_api(self, m):
+        self._mirror()
+
+        response_valid = self._create_object({"diameter": 10})
+        response_invalid = self._create_object({"plantDate": "2020-04-12"})
+
+        self.assertEqual(response_valid.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response_invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response_invalid.json()["non_field_errors"],
+            ["'diameter' is a required property"],
+        )
+        self.assertEqual(m.request_history, [])
+
+    def test_geometry_not_allowed_without_objecttypes_api(self, m):
+        self._mirror(allow_geometry=False)
+
+        response = self._create_object({"diameter": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["non_field_errors"],
+            ["This object type doesn't support geometry"],
+        )
+        self.assertEqual(m.request_history, [])
+
+    @override_settings(OBJECTTYPE_MIRROR_MAX_AGE=60)
+    def test_stale_mirror_is_refreshed(self, m):
+        self._mirror(last_synced=timezone.now() - timedelta(minutes=5))
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            self.object_type.url,
+            json=mock_objecttype(self.object_type.url, {"allowGeometry": False}),
+        )
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url, {"status": "draft"}),
+        )
+
+        response_stale = self._create_object({"diameter": 10})
+        response_refreshed = self._create_object({"diameter": 10})
+
+        # the stale mirror is used while it's refreshed
+        self.assertEqual(response_stale.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response_refreshed.status_code, status.HTTP_400_BAD_REQUEST)
+        mirrored = ObjectTypeVersion.objects.get()
+        self.assertEqual(mirrored.status, "draft")
+        self.assertGreater(mirrored.last_synced, timezone.now() - timedelta(minutes=1))
+
+    @override_settings(OBJECTTYPE_MIRROR_MAX_AGE=60)
+    def test_stale_mirror_objecttypes_api_down(self, m):
+        self._mirror(last_synced=timezone.now() - timedelta(minutes=5))
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(self.object_type.url, status_code=500)
+        m.get(f"{self.object_type.url}/versions/1", status_code=500)
+
+        response = self._create_object({"diameter": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_sync_objecttypes(self, m):
+        ObjectTypeVersionFactory.create(
+            object_type=self.object_type,
+            version=1,
+            json_schema={},
+            last_synced=timezone.now() - timedelta(days=2),
+        )
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            self.object_type.url,
+            json=mock_objecttype(self.object_type.url, {"allowGeometry": False}),
+        )
+        m.get(
+            f"{self.object_type.url}/versions",
+            json={
+                "count": 2,
+                "next": f"{self.object_type.url}/versions?page=2",
+                "previous": None,
+                "results": [mock_objecttype_version(self.object_type.url)],
+            },
+        )
+        m.get(
+            f"{self.object_type.url}/versions?page=2",
+            json={
+                "count": 2,
+                "next": None,
+                "previous": f"{self.object_type.url}/versions",
+                "results": [
+                    mock_objecttype_version(
+                        self.object_type.url,
+                        {
+                            "url": f"{self.object_type.url}/versions/2",
+                            "version": 2,
+                            "status": "draft",
+                            "publishedAt": None,
+                        },
+                    )
+                ],
+            },
+        )
+        broken_object_type = ObjectTypeFactory(service=self.object_type.service)
+        m.get(broken_object_type.url, status_code=404)
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("sync_objecttypes", stdout=stdout, stderr=stderr)
+
+        self.object_type.refresh_from_db()
+        self.assertFalse(self.object_type.allow_geometry)
+        self.assertIsNotNone(self.object_type.last_synced)
+
+        version1, version2 = ObjectTypeVersion.objects.order_by("version")
+        self.assertEqual(version1.json_schema["required"], ["diameter"])
+        self.assertEqual(version1.published_at, date(2020, 11, 16))
+        self.assertEqual(version2.status, "draft")
+        self.assertIsNone(version2.published_at)
+
+        self.assertIn("Synced 1 of 2 objecttypes", stdout.getvalue())
+        self.assertIn(f"Failed to sync {broken_object_type.url}", stderr.getvalue())
@@ -0,0 +1,82 @@
+from django.test import TestCase, override_settings
+
+from objects.core.models import ObjectType
+from objects.core.resolver import object_type_resolver
+from objects.core.tests.factories import ObjectTypeFactory, ServiceFactory
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@override_settings(OBJECTTYPE_RESOLVER_CACHE_TIMEOUT=60)
+class ObjectTypeResolverTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+
+    def setUp(self):
+        super().setUp()
+
+        object_type_resolver.clear()
+        self.addCleanup(object_type_resolver.clear)
+
+    def test_resolve_once(self):
+        with self.assertNumQueries(2):
+            # services and object type lookups
+            object_type = ObjectType.objects.get_by_url(self.object_type.url)
+
+        with self.assertNumQueries(0):
+            cached = ObjectType.objects.get_by_url(self.object_type.url)
+            self.assertEqual(cached.url, self.object_type.url)
+
+        self.assertEqual(cached, object_type)
+        # the requests don't share the instance
+        self.assertIsNot(cached, object_type)
+
+    def test_longest_api_root(self):
+        other_object_type = ObjectTypeFactory(
+            service__api_root="https://example.com/objecttypes/"
+        )
+        url = f"{OBJECT_TYPES_API}objecttypes/{self.object_type.uuid}"
+
+        self.assertEqual(
+            ObjectType.objects.get_by_url(url).service, self.object_type.service
+        )
+        self.assertEqual(
+            ObjectType.objects.get_by_url(other_object_type.url), other_object_type
+        )
+
+    def test_unknown_service(self):
+        with self.assertRaises(ObjectType.DoesNotExist):
+            ObjectType.objects.get_by_url(
+                f"https://other.example.com/objecttypes/{self.object_type.uuid}"
+            )
+
+    def test_invalidate_on_object_type_delete(self):
+        ObjectType.objects.get_by_url(self.object_type.url)
+
+        self.object_type.delete()
+
+        with self.assertRaises(ObjectType.DoesNotExist):
+            ObjectType.objects.get_by_url(self.object_type.url)
+
+    def test_invalidate_on_service_change(self):
+        ObjectType.objects.get_by_url(self.object_type.url)
+        service = self.object_type.service
+        service.api_root = "https://example.com/objecttypes/v2/"
+        service.save()
+
+        with self.assertRaises(ObjectType.DoesNotExist):
+            ObjectType.objects.get_by_url(self.object_type.url)
+
+        new_service = ServiceFactory(api_root=OBJECT_TYPES_API)
+        object_type = ObjectTypeFactory(service=new_service)
+
+        self.assertEqual(ObjectType.objects.get_by_url(object_type.url), object_type)
+
+    def test_restricted_queryset(self):
+        with self.assertRaises(ObjectType.DoesNotExist):
+            ObjectType.objects.exclude(pk=self.object_type.pk).get_by_url(
+                self.object_type.url
+            )
@@ -1,4 +1,5 @@
 from datetime import date
+from urllib.parse import parse_qs, urlparse
 
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -8,6 +9,7 @@ from objects.token.constants import PermissionModes
 from objects.token.tests.factories import PermissionFactory
 from objects.utils.test import TokenAuthMixin
 
+from ..constants import GEO_WRITE_KWARGS
 from .utils import reverse_lazy
 
 OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
@@ -49,3 +51,128 @@ class FilterObjectTypeTests(TokenAuthMixin, APITestCase):
 
         self.assertEqual(data["count"], 10)
         self.assertEqual(data["next"], f"http://testserver{self.url}?page=2&pageSize=5")
+
+
+class KeysetPaginationTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-list")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def _get_all_pages(self, url, params, **kwargs) -> list:
+        uuids = []
+        response = self.client.get(url, params, **kwargs)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = response.json()
+            self.assertNotIn("count", data)
+            uuids += [result["uuid"] for result in data["results"]]
+
+            if not data["next"]:
+                return uuids
+            response = self.client.get(data["next"], **kwargs)
+
+    def test_list_with_cursor(self):
+        records = ObjectRecordFactory.create_batch(
+            5, object__object_type=self.object_type, start_at=date.today()
+        )
+
+        response = self.client.get(self.url, {"cursor": "", "pageSize": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(list(data), ["next", "results"])
+        self.assertEqual(
+            [result["uuid"] for result in data["results"]],
+            [str(records[4].object.uuid), str(records[3].object.uuid)],
+        )
+
+        # objects created during the pagination don't shift the pages
+        ObjectRecordFactory.create(
+            object__object_type=self.object_type, start_at=date.today()
+        )
+        response = self.client.get(data["next"])
+
+        self.assertEqual(
+            [result["uuid"] for result in response.json()["results"]],
+            [str(records[2].object.uuid), str(records[1].object.uuid)],
+        )
+
+    def test_list_with_cursor_json_ordering(self):
+        record1 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"length": 4}
+        )
+        record2 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"length": 3}
+        )
+        record3 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"length": 4}
+        )
+        record4 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={}
+        )
+        record5 = ObjectRecordFactory.create(
+            object__object_type=self.object_type, data={"length": "4"}
+        )
+
+        for ordering, expected in [
+            # JSON strings are sorted before numbers and missing values last
+            ("record__data__length", [record5, record2, record3, record1, record4]),
+            ("-record__data__length", [record4, record3, record1, record2, record5]),
+        ]:
+            with self.subTest(ordering=ordering):
+                uuids = self._get_all_pages(
+                    self.url, {"cursor": "", "pageSize": 1, "ordering": ordering}
+                )
+
+                self.assertEqual(uuids, [str(r.object.uuid) for r in expected])
+
+    def test_search_with_cursor(self):
+        records = ObjectRecordFactory.create_batch(
+            3, object__object_type=self.object_type, start_at=date.today()
+        )
+        url = reverse_lazy("object-search")
+
+        response = self.client.post(
+            f"{url}?cursor=&pageSize=2",
+            {"type": self.object_type.url},
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+
+        response = self.client.post(
+            data["next"], {"type": self.object_type.url}, **GEO_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(
+            [result["uuid"] for result in data["results"]],
+            [str(records[0].object.uuid)],
+        )
+        self.assertIsNone(data["next"])
+
+    def test_invalid_cursor(self):
+        ObjectRecordFactory.create_batch(2, object__object_type=self.object_type)
+        response = self.client.get(self.url, {"cursor": "", "pageSize": 1})
+        cursor = parse_qs(urlparse(response.json()["next"]).query)["cursor"][0]
+
+        for params in [
+            {"cursor": "invalid"},
+            {"cursor": cursor, "ordering": "record__index"},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from freezegun import freeze_time
+
+from objects.core.models import ObjectRecord
+from objects.core.tests.factories import ObjectRecordFactory
+
+
+class RecordVersioningTests(TestCase):
+    def test_create_next_record(self):
+        record = ObjectRecordFactory.create(start_at=date.today() - timedelta(days=1))
+
+        # lock the object, close the previous record and insert the next record
+        with self.assertNumQueries(3):
+            next_record = ObjectRecord.objects.create(
+                object=record.object,
+                version=record.version,
+                data={"name": "next"},
+                start_at=date.today(),
+            )
+
+        self.assertEqual(next_record.index, 2)
+        self.assertTrue(next_record.is_latest)
+
+        record.refresh_from_db()
+        self.assertEqual(record.end_at, date.today())
+        self.assertFalse(record.is_latest)
+
+    def test_close_record_updates_modified_at(self):
+        with freeze_time("2020-01-01T12:00:00Z"):
+            record = ObjectRecordFactory.create(start_at=date(2020, 1, 1))
+            other_record = ObjectRecordFactory.create(start_at=date(2020, 1, 1))
+
+        with freeze_time("2020-02-01T12:00:00Z"):
+            ObjectRecord.objects.create(
+                object=record.object,
+                version=record.version,
+                data={"name": "next"},
+                start_at=date(2020, 2, 1),
+            )
+            ObjectRecord.objects.bulk_create_next_records(
+                [
+                    ObjectRecord(
+                        object=other_record.object,
+                        version=other_record.version,
+                        data={"name": "next"},
+                        start_at=date(2020, 2, 1),
+                    )
+                ]
+            )
+
+        # the closed records are modified, which changes their ETags
+        for closed_record in (record, other_record):
+            with self.subTest(record=closed_record):
+                closed_record.refresh_from_db()
+                self.assertFalse(closed_record.is_latest)
+                self.assertEqual(
+                    closed_record.modified_at,
+                    datetime(2020, 2, 1, 12, tzinfo=timezone.utc),
+                )
+
+    def test_create_first_record(self):
+        record = ObjectRecordFactory.create()
+
+        self.assertEqual(record.index, 1)
+        self.assertTrue(record.is_latest)
+
+
+class ConcurrentRecordVersioningTests(TransactionTestCase):
+    workers = 8
+    updates = 40
+
+    def test_parallel_updates(self):
+        record = ObjectRecordFactory.create(start_at=date.today() - timedelta(days=1))
+        object = record.object
+
+        def update(number: int) -> int:
+            try:
+                return ObjectRecord.objects.create(
+                    object=object,
+                    version=record.version,
+                    data={"number": number},
+                    start_at=date.today(),
+                ).index
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            indices = list(executor.map(update, range(self.updates)))
+
+        # every update created its own version
+        self.assertEqual(sorted(indices), list(range(2, self.updates + 2)))
+        records = object.records.order_by("index")
+        self.assertEqual(
+            list(records.values_list("index", flat=True)),
+            list(range(1, self.updates + 2)),
+        )
+        self.assertEqual(
+            list(records.filter(is_latest=True).values_list("index", flat=True)),
+            [self.updates + 1],
+        )
+        self.assertEqual(
+            sorted(record.data["number"] for record in records[1:]),
+            list(range(self.updates)),
+        )
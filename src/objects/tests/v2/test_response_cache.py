@@ -0,0 +1,179 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.api.cache import response_cache
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from .utils import reverse, reverse_lazy
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+def get_record_queries(context) -> list:
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if '"core_objectrecord"' in query["sql"]
+    ]
+
+
+@override_settings(
+    OBJECTS_RESPONSE_CACHE_TIMEOUT=60, OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE=1
+)
+class ResponseCacheTests(TokenAuthMixin, APITestCase):
+    url = reverse_lazy("object-list")
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.other_object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.permission = PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+        PermissionFactory.create(
+            object_type=cls.other_object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        response_cache.get_cache().clear()
+        self.addCleanup(response_cache.get_cache().clear)
+
+        ObjectRecordFactory.create(object__object_type=self.object_type)
+
+    def assertStats(self, hits, misses):
+        stats = response_cache.get_stats()
+        self.assertEqual((stats.hits, stats.misses), (hits, misses))
+
+    def test_cached_list(self):
+        params = {"type": self.object_type.url, "ordering": "-record__index"}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as context:
+            cached_response = self.client.get(
+                f"{self.url}?ordering=-record__index&type={self.object_type.url}"
+            )
+
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(get_record_queries(context), [])
+        self.assertStats(hits=1, misses=1)
+
+    def test_write_invalidates_objecttype(self):
+        params = {"type": self.object_type.url}
+        self.client.get(self.url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ObjectRecordFactory.create(object__object_type=self.object_type)
+
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.json()["count"], 2)
+        self.assertStats(hits=0, misses=2)
+
+    def test_write_to_other_objecttype(self):
+        params = {"type": self.object_type.url}
+        self.client.get(self.url, params)
+        # the list without type contains both objecttypes
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ObjectRecordFactory.create(object__object_type=self.other_object_type)
+
+        self.assertEqual(self.client.get(self.url, params).json()["count"], 1)
+        self.assertStats(hits=1, misses=2)
+
+        self.assertEqual(self.client.get(self.url).json()["count"], 2)
+        self.assertStats(hits=1, misses=3)
+
+    def test_permission_change(self):
+        self.client.get(self.url)
+
+        self.permission.use_fields = True
+        self.permission.fields = {"1": ["record__index"]}
+        self.permission.save()
+
+        response = self.client.get(self.url)
+        self.assertStats(hits=0, misses=2)
+        header = response["x-unauthorized-fields"]
+
+        cached_response = self.client.get(self.url)
+        self.assertStats(hits=1, misses=2)
+        self.assertEqual(cached_response["x-unauthorized-fields"], header)
+        self.assertEqual(cached_response.json(), response.json())
+
+    def test_cached_search(self):
+        url = reverse("object-search")
+        within = {
+            "type": "Polygon",
+            "coordinates": [
+                [[4.8, 52.2], [4.8, 52.5], [5.1, 52.5], [5.1, 52.2], [4.8, 52.2]]
+            ],
+        }
+
+        response = self.client.post(
+            url, {"geometry": {"within": within}}, **GEO_WRITE_KWARGS
+        )
+        with CaptureQueriesContext(connection) as context:
+            cached_response = self.client.post(
+                url, {"geometry": {"within": within}}, **GEO_WRITE_KWARGS
+            )
+
+        self.assertEqual(cached_response.json(), response.json())
+        # the queryset isn't built for a cached response
+        self.assertEqual(get_record_queries(context), [])
+        self.assertStats(hits=1, misses=1)
+
+        within["coordinates"][0].reverse()
+        self.client.post(url, {"geometry": {"within": within}}, **GEO_WRITE_KWARGS)
+        self.assertStats(hits=1, misses=2)
+
+    @override_settings(OBJECTS_RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.assertStats(hits=0, misses=0)
+
+    @override_settings(OBJECTS_RESPONSE_CACHE_STATS_SAMPLE_RATE=0.5)
+    def test_stats_sampled(self):
+        with patch("objects.api.cache.random", side_effect=[0.2, 0.7, 0.4]):
+            self.client.get(self.url)
+            self.client.get(self.url)
+            self.client.get(self.url)
+
+        # a sampled lookup counts for two lookups
+        self.assertStats(hits=2, misses=2)
+
+    def test_stats_command(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        stdout = StringIO()
+
+        call_command("response_cache_stats", reset=True, stdout=stdout)
+
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            ["hits: 1", "misses: 1", "hit_ratio: 0.50"],
+        )
+        self.assertStats(hits=0, misses=0)
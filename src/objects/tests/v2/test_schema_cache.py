@@ -0,0 +1,215 @@
+from django.test import override_settings
+
+import requests_mock
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.cache import schema_cache
+from objects.core.models import ObjectTypeVersion
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from ..utils import mock_objecttype_version, mock_service_oas_get
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@override_settings(OBJECTTYPE_SCHEMA_CACHE_TIMEOUT=60)
+@requests_mock.Mocker()
+class SchemaCacheTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+
+    def _get_version_requests(self, m, version=1) -> list:
+        version_url = f"{self.object_type.url}/versions/{version}"
+        return [req for req in m.request_history if req.url == version_url]
+
+    def _create_object(self, data: dict):
+        url = reverse("object-list")
+        body = {
+            "type": self.object_type.url,
+            "record": {
+                "typeVersion": 1,
+                "data": data,
+                "startAt": "2020-01-01",
+            },
+        }
+        return self.client.post(url, body, **GEO_WRITE_KWARGS)
+
+    def _require_plant_date(self):
+        """change the mirrored schema without invalidating the cache"""
+        mirrored = ObjectTypeVersion.objects.get(object_type=self.object_type)
+        mirrored.json_schema["required"].append("plantDate")
+        mirrored.save()
+
+    def test_schema_is_retrieved_once(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+
+        for diameter in [10, 20, 30]:
+            with self.subTest(diameter=diameter):
+                response = self._create_object({"diameter": diameter})
+
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(self._get_version_requests(m)), 1)
+
+    def test_cached_schema_validates_data(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        self._create_object({"diameter": 10})
+
+        response = self._create_object({"plantDate": "2020-04-12"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["non_field_errors"],
+            ["'diameter' is a required property"],
+        )
+        self.assertEqual(len(self._get_version_requests(m)), 1)
+
+    def test_validation_checks_formats(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+
+        response = self._create_object({"diameter": 10, "plantDate": "2020-13-45"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["non_field_errors"],
+            ["'2020-13-45' is not a 'date'"],
+        )
+
+    def test_failed_retrieval_is_not_cached(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            [
+                {"status_code": 404},
+                {"json": mock_objecttype_version(self.object_type.url)},
+            ],
+        )
+
+        response_failed = self._create_object({"diameter": 10})
+        response_created = self._create_object({"diameter": 10})
+
+        self.assertEqual(response_failed.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response_created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self._get_version_requests(m)), 2)
+
+    def test_invalidate(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        self._create_object({"diameter": 10})
+        self._require_plant_date()
+
+        response_cached = self._create_object({"diameter": 10})
+        schema_cache.invalidate(self.object_type, 1)
+        response_invalidated = self._create_object({"diameter": 10})
+
+        self.assertEqual(response_cached.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response_invalidated.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(self._get_version_requests(m)), 1)
+
+    def test_objecttype_change_invalidates(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        self._create_object({"diameter": 10})
+        self._require_plant_date()
+
+        self.object_type.save()
+        response = self._create_object({"diameter": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(OBJECTTYPE_SCHEMA_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        self._create_object({"diameter": 10})
+        self._require_plant_date()
+
+        response = self._create_object({"diameter": 10})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(OBJECTTYPE_SCHEMA_CACHE_ALIAS="default")
+    def test_shared_cache(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        self._create_object({"diameter": 10})
+        # the shared cache is used before the mirror
+        ObjectTypeVersion.objects.all().delete()
+
+        # other process has an empty in-process cache
+        schema_cache.clear()
+        self._create_object({"diameter": 10})
+
+        self.assertEqual(len(self._get_version_requests(m)), 1)
+
+        schema_cache.invalidate(self.object_type)
+        self._create_object({"diameter": 10})
+
+        self.assertEqual(len(self._get_version_requests(m)), 2)
+
+    def test_update_uses_cached_schema(self, m):
+        mock_service_oas_get(m, OBJECT_TYPES_API, "objecttypes")
+        m.get(
+            f"{self.object_type.url}/versions/1",
+            json=mock_objecttype_version(self.object_type.url),
+        )
+        record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            version=1,
+            data={"diameter": 10},
+            geometry=None,
+        )
+        url = reverse("object-detail", args=[record.object.uuid])
+
+        for diameter in [20, 30]:
+            response = self.client.patch(
+                url, {"record": {"data": {"diameter": diameter}}}, **GEO_WRITE_KWARGS
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(self._get_version_requests(m)), 1)
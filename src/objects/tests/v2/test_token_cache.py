@@ -0,0 +1,106 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.core.tests.factories import ObjectRecordFactory, ObjectTypeFactory
+from objects.token.cache import auth_cache
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+def get_token_queries(context) -> list:
+    return [
+        query["sql"] for query in context.captured_queries if '"token_' in query["sql"]
+    ]
+
+
+@override_settings(TOKEN_AUTH_CACHE_TIMEOUT=60, TOKEN_AUTH_CACHE_ALIAS="")
+class TokenCacheTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+        cls.permission = PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_only,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        auth_cache.clear()
+        self.addCleanup(auth_cache.clear)
+
+    def test_warm_request_without_auth_queries(self):
+        record = ObjectRecordFactory.create(object__object_type=self.object_type)
+        url = reverse("object-detail", args=[record.object.uuid])
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_token_queries(context), [])
+
+    def test_warm_list_without_auth_queries(self):
+        ObjectRecordFactory.create(object__object_type=self.object_type)
+        url = reverse("object-list")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"ordering": "-record__index"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertEqual(get_token_queries(context), [])
+
+    def test_invalidate_on_permission_change(self):
+        record = ObjectRecordFactory.create(object__object_type=self.object_type)
+        url = reverse("object-detail", args=[record.object.uuid])
+        data = {
+            "record": {"data": {"plantDate": "2020-04-12"}, "startAt": "2020-01-01"}
+        }
+
+        response = self.client.patch(url, data, **GEO_WRITE_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.permission.mode = PermissionModes.read_and_write
+        self.permission.save()
+
+        self.assertEqual(
+            auth_cache.get(self.token_auth.token).permissions[self.object_type.id].mode,
+            PermissionModes.read_and_write,
+        )
+
+    def test_invalidate_on_permission_delete(self):
+        record = ObjectRecordFactory.create(object__object_type=self.object_type)
+        url = reverse("object-detail", args=[record.object.uuid])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.permission.delete()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalidate_on_token_delete(self):
+        url = reverse("object-list")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.token_auth.delete()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_AUTH_CACHE_ALIAS="default")
+    def test_local_memory_cache_is_not_shared(self):
+        # the "default" cache of the tests is a local-memory cache
+        self.assertIsNone(auth_cache.get_shared_cache())
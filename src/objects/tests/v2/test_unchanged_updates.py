@@ -0,0 +1,202 @@
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from objects.api.utils import merge_patch
+from objects.core.models import OutgoingNotification
+from objects.core.tests.factories import (
+    ObjectRecordFactory,
+    ObjectTypeFactory,
+    ObjectTypeVersionFactory,
+)
+from objects.token.constants import PermissionModes
+from objects.token.tests.factories import PermissionFactory
+from objects.utils.test import TokenAuthMixin
+
+from ..constants import GEO_WRITE_KWARGS
+from .utils import reverse
+
+OBJECT_TYPES_API = "https://example.com/objecttypes/v1/"
+
+
+@override_settings(NOTIFICATIONS_DISABLED=False)
+class UnchangedUpdateTests(TokenAuthMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.object_type = ObjectTypeFactory(
+            service__api_root=OBJECT_TYPES_API,
+            allow_geometry=True,
+            last_synced=timezone.now(),
+        )
+        ObjectTypeVersionFactory.create(
+            object_type=cls.object_type, version=1, last_synced=timezone.now()
+        )
+        PermissionFactory.create(
+            object_type=cls.object_type,
+            mode=PermissionModes.read_and_write,
+            token_auth=cls.token_auth,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        self.record = ObjectRecordFactory.create(
+            object__object_type=self.object_type,
+            version=1,
+            data={"diameter": 30, "plantDate": "2020-04-12", "leaves": ["green"]},
+            geometry=Point(4.910649523925713, 52.37240093589432, srid=4326),
+            start_at=date(2020, 1, 1),
+        )
+        self.url = reverse("object-detail", args=[self.record.object.uuid])
+
+    def _record(self, **record):
+        return {
+            "typeVersion": 1,
+            # the same data in another order
+            "data": {"leaves": ["green"], "plantDate": "2020-04-12", "diameter": 30},
+            "geometry": {
+                "type": "Point",
+                "coordinates": [4.910649523925713, 52.37240093589432],
+            },
+            "startAt": "2020-01-01",
+            **record,
+        }
+
+    def _partial_record(self):
+        # partial updates without a geometry remove the geometry
+        record = self._record(data={"diameter": 30})
+        del record["typeVersion"]
+        return record
+
+    def test_put_unchanged(self):
+        with patch("objects.api.validators.check_objecttype") as validate:
+            response = self.client.put(
+                self.url,
+                {"type": self.object_type.url, "record": self._record()},
+                **GEO_WRITE_KWARGS,
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Object-Unchanged"], "true")
+        self.assertEqual(response.json()["record"]["index"], self.record.index)
+        self.assertEqual(self.record.object.records.count(), 1)
+        self.assertFalse(OutgoingNotification.objects.exists())
+        validate.assert_not_called()
+
+    def test_patch_unchanged(self):
+        response = self.client.patch(
+            self.url,
+            {"record": self._partial_record()},
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Object-Unchanged"], "true")
+        self.assertEqual(self.record.object.records.count(), 1)
+        self.assertFalse(OutgoingNotification.objects.exists())
+
+    def test_patch_merged_once(self):
+        with patch(
+            "objects.api.serializers.merge_patch", wraps=merge_patch
+        ) as merge_patch_mock:
+            response = self.client.patch(
+                self.url,
+                {"record": {"data": {"diameter": 31}, "startAt": "2021-01-01"}},
+                **GEO_WRITE_KWARGS,
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["record"]["data"],
+            {"diameter": 31, "plantDate": "2020-04-12", "leaves": ["green"]},
+        )
+        merge_patch_mock.assert_called_once()
+
+    def test_unchanged_runs_other_validators(self):
+        self.object_type.allow_geometry = False
+        self.object_type.save()
+
+        response = self.client.put(
+            self.url,
+            {"type": self.object_type.url, "record": self._record()},
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["invalidParams"][0]["code"], "geometry-not-allowed"
+        )
+        self.assertNotIn("X-Object-Unchanged", response)
+
+    def test_unchanged_immutable_field(self):
+        other_object_type = ObjectTypeFactory(service__api_root=OBJECT_TYPES_API)
+
+        response = self.client.put(
+            self.url,
+            {"type": other_object_type.url, "record": self._record()},
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["invalidParams"][0]["code"], "immutable-field")
+        self.assertEqual(self.record.object.records.count(), 1)
+
+    def test_changed(self):
+        for record in (
+            self._record(data={"diameter": 31}),
+            self._record(startAt="2021-01-01"),
+            self._record(geometry={"type": "Point", "coordinates": [4.91, 52.37]}),
+            self._record(geometry=None),
+            self._record(correctionFor=self.record.index),
+        ):
+            with self.subTest(record=record):
+                response = self.client.put(
+                    self.url,
+                    {"type": self.object_type.url, "record": record},
+                    **GEO_WRITE_KWARGS,
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn("X-Object-Unchanged", response)
+                self.assertNotEqual(
+                    response.json()["record"]["index"], self.record.index
+                )
+
+        self.assertEqual(self.record.object.records.count(), 6)
+        self.assertEqual(OutgoingNotification.objects.count(), 5)
+
+    def test_bulk_update_unchanged(self):
+        other_record = ObjectRecordFactory.create(
+            object__object_type=self.object_type, version=1, data={"diameter": 20}
+        )
+
+        response = self.client.patch(
+            reverse("object-bulk"),
+            [
+                {
+                    "uuid": str(self.record.object.uuid),
+                    "record": self._partial_record(),
+                },
+                {
+                    "uuid": str(other_record.object.uuid),
+                    "record": {"data": {"diameter": 21}, "startAt": "2021-01-01"},
+                },
+            ],
+            **GEO_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()
+        self.assertEqual([result["status"] for result in results], [200, 200])
+        self.assertEqual(results[0]["object"]["record"]["index"], self.record.index)
+        self.assertEqual(results[1]["object"]["record"]["data"], {"diameter": 21})
+        self.assertEqual(self.record.object.records.count(), 1)
+        self.assertEqual(OutgoingNotification.objects.count(), 1)
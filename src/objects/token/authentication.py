@@ -3,14 +3,13 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 from rest_framework.authentication import TokenAuthentication as _TokenAuthentication
 
+from .cache import auth_cache
+
 
 class TokenAuthentication(_TokenAuthentication):
     def authenticate_credentials(self, key):
-        from .models import TokenAuth
-
-        try:
-            token = TokenAuth.objects.get(token=key)
-        except TokenAuth.DoesNotExist:
+        auth_context = auth_cache.get(key)
+        if auth_context is None:
             raise exceptions.AuthenticationFailed(_("Invalid token."))
 
-        return (None, token)
+        return (None, auth_context.token)
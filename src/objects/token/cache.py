@@ -0,0 +1,124 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from objects.utils.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class ObjectTypePermission:
+    """read-only copy of the `Permission` of a token for an OBJECTTYPE"""
+
+    object_type_id: int
+    mode: str
+    use_fields: bool
+    fields: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """the token and its permissions, mapped by the id of the OBJECTTYPE"""
+
+    token: "TokenAuth"  # noqa: F821
+    permissions: Dict[int, ObjectTypePermission]
+
+    @classmethod
+    def load(cls, key: str) -> Optional["AuthContext"]:
+        from .models import TokenAuth
+
+        token = TokenAuth.objects.filter(token=key).first()
+        if token is None:
+            return None
+
+        permissions = {
+            object_type_id: ObjectTypePermission(
+                object_type_id, mode, use_fields, fields or {}
+            )
+            for object_type_id, mode, use_fields, fields in token.permissions.values_list(
+                "object_type_id", "mode", "use_fields", "fields"
+            )
+        }
+        context = cls(token=token, permissions=permissions)
+        # the token of the context doesn't load its permissions again
+        token.auth_context = context
+        return context
+
+
+class AuthContextCache:
+    """
+    Cache of the auth contexts of the tokens, so an authenticated request doesn't
+    query the tokens and their permissions.
+
+    There are two tiers, like the `SchemaCache`: an in-process LRU cache and an
+    optional shared Django cache (``TOKEN_AUTH_CACHE_ALIAS``). The contexts are
+    invalidated when the token or its permissions change and expire after
+    ``TOKEN_AUTH_CACHE_TIMEOUT`` seconds. ``0`` (the default) disables the cache.
+
+    The invalidation only reaches the in-process cache of the process which makes the
+    change, so other processes keep using a revoked token or permission until the
+    timeout expires.
+    """
+
+    key_prefix = "token-auth"
+
+    def __init__(self):
+        self._contexts = TTLCache(
+            maxsize=lambda: settings.TOKEN_AUTH_CACHE_SIZE,
+            timeout=lambda: settings.TOKEN_AUTH_CACHE_TIMEOUT,
+        )
+
+    def get_shared_key(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def get_shared_cache(self):
+        alias = settings.TOKEN_AUTH_CACHE_ALIAS
+        if not alias or not self._contexts.enabled:
+            return None
+
+        shared_cache = caches[alias]
+        # a local-memory cache isn't shared with the other processes, so the
+        # invalidations wouldn't reach them
+        if isinstance(shared_cache, LocMemCache):
+            return None
+        return shared_cache
+
+    def get(self, key: str) -> Optional[AuthContext]:
+        context = self._contexts.get(key)
+        if context is not None:
+            return context
+
+        shared_cache = self.get_shared_cache()
+        if shared_cache:
+            context = shared_cache.get(self.get_shared_key(key))
+
+        if context is None:
+            context = AuthContext.load(key)
+            # unknown tokens are not cached, so new tokens can be used at once
+            if context is None:
+                return None
+
+            if shared_cache:
+                shared_cache.set(
+                    self.get_shared_key(key),
+                    context,
+                    timeout=settings.TOKEN_AUTH_CACHE_TIMEOUT,
+                )
+
+        self._contexts.set(key, context)
+        return context
+
+    def invalidate(self, key: str) -> None:
+        self._contexts.delete(key)
+
+        shared_cache = self.get_shared_cache()
+        if shared_cache:
+            shared_cache.delete(self.get_shared_key(key))
+
+    def clear(self) -> None:
+        self._contexts.clear()
+
+
+auth_cache = AuthContextCache()
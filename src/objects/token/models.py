@@ -3,10 +3,12 @@ import os
 
 from django.core import exceptions
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from objects.core.models import ObjectType
 
+from .cache import AuthContext, auth_cache
 from .constants import PermissionModes
 
 
@@ -68,10 +70,16 @@ class TokenAuth(models.Model):
     def generate_token(self):
         return binascii.hexlify(os.urandom(20)).decode()
 
+    @cached_property
+    def auth_context(self) -> AuthContext:
+        """the permissions of the token, mapped by the id of the OBJECTTYPE"""
+        return auth_cache.get(self.token) or AuthContext(token=self, permissions={})
+
     def get_permission_for_object_type(self, object_type: ObjectType):
-        if not self.permissions.filter(object_type=object_type).exists():
-            return None
-        return self.permissions.get(object_type=object_type)
+        return self.auth_context.permissions.get(object_type.id)
+
+    def get_object_type_ids(self) -> list:
+        return list(self.auth_context.permissions)
 
 
 class Permission(models.Model):
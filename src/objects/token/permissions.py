@@ -1,6 +1,7 @@
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 from vng_api_common.permissions import bypass_permissions
 
+from objects.core.loaders import get_objecttype_loader
 from objects.core.models import ObjectType
 from objects.token.constants import PermissionModes
 
@@ -22,8 +23,9 @@ class ObjectTypeBasedPermission(BasePermission):
         if not object_type_url:
             return False
 
+        loader = get_objecttype_loader(request)
         try:
-            object_type = ObjectType.objects.get_by_url(object_type_url)
+            object_type = loader.get_by_url(object_type_url)
         except (ObjectType.DoesNotExist, ValueError, TypeError):
             return False
 
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import auth_cache
+from .models import Permission, TokenAuth
+
+
+def invalidate(key: str) -> None:
+    auth_cache.invalidate(key)
+    # requests running concurrently can cache the old context before the commit
+    transaction.on_commit(lambda: auth_cache.invalidate(key))
+
+
+@receiver([post_save, post_delete], sender=TokenAuth)
+def invalidate_token(sender, instance: TokenAuth, **kwargs):
+    invalidate(instance.token)
+
+
+@receiver(pre_save, sender=Permission)
+def keep_previous_token(sender, instance: Permission, **kwargs):
+    instance._previous_token_auth_id = (
+        Permission.objects.filter(pk=instance.pk)
+        .values_list("token_auth_id", flat=True)
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver([post_save, post_delete], sender=Permission)
+def invalidate_permission(sender, instance: Permission, **kwargs):
+    invalidate(instance.token_auth_id)
+
+    # the permission can be moved to another token
+    previous_token_auth_id = getattr(instance, "_previous_token_auth_id", None)
+    if previous_token_auth_id and previous_token_auth_id != instance.token_auth_id:
+        invalidate(previous_token_auth_id)
@@ -8,9 +8,9 @@ from drf_spectacular.utils import OpenApiParameter
 from vng_api_common.geo import DEFAULT_CRS, HEADER_ACCEPT, HEADER_CONTENT
 from vng_api_common.inspectors.view import HTTP_STATUS_CODE_TITLES
 
-from objects.api.mixins import GeoMixin
+from objects.api.mixins import GeoMixin, ObjectNotificationMixin
 
-from .serializers import DynamicFieldsMixin
+from .serializers import DynamicFieldsMixin, QueryFieldsMixin
 
 object_path_parameter = OpenApiParameter(
     name="object__uuid", required=True, location=OpenApiParameter.PATH
@@ -32,11 +32,12 @@ class AutoSchema(_AutoSchema):
         geo_headers = self.get_geo_headers()
         content_type_headers = self.get_content_type_headers()
         field_params = self.get_fields_params()
-        return geo_headers + content_type_headers + field_params
+        unchanged_headers = self.get_unchanged_headers()
+        return geo_headers + content_type_headers + field_params + unchanged_headers
 
     def _get_filter_parameters(self):
-        """remove filter parameters from all actions except LIST"""
-        if self.view.action != "list":
+        """remove filter parameters from all actions except LIST, EXPORT and HISTORY"""
+        if self.view.action not in ("list", "export", "history"):
             return []
         return super()._get_filter_parameters()
 
@@ -117,11 +118,54 @@ class AutoSchema(_AutoSchema):
             )
         ]
 
+    def get_unchanged_headers(self) -> list:
+        if not isinstance(
+            self.view, ObjectNotificationMixin
+        ) or self.view.action not in (
+            "update",
+            "partial_update",
+        ):
+            return []
+
+        return [
+            OpenApiParameter(
+                name=settings.UNCHANGED_OBJECT_HEADER,
+                type=str,
+                location=OpenApiParameter.HEADER,
+                response=[200],
+                enum=["true"],
+                description=_(
+                    "Present if the update doesn't change the OBJECT. The actual RECORD "
+                    "is returned, no new RECORD is created and no notification is sent."
+                ),
+            )
+        ]
+
     def get_fields_params(self) -> list[OpenApiParameter]:
         if self.method != "GET":
             return []
 
         response_serializers = self.get_response_serializers()
+        # the fields of the history are the fields of its RECORDs
+        history_serializer = (
+            response_serializers.get("200")
+            if isinstance(response_serializers, dict)
+            else response_serializers
+        )
+        if isinstance(getattr(history_serializer, "child", None), QueryFieldsMixin):
+            return [
+                OpenApiParameter(
+                    name="fields",
+                    type=str,
+                    location=OpenApiParameter.QUERY,
+                    required=False,
+                    description=_(
+                        "Comma-separated fields, which should be displayed in the response. "
+                        "For example: 'index, startAt, data__name'."
+                    ),
+                )
+            ]
+
         if isinstance(response_serializers, DynamicFieldsMixin):
             return [
                 OpenApiParameter(
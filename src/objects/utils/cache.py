@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe, in-process LRU cache with a per-entry time to live.
+
+    A ``timeout`` of ``0`` (or less) disables the cache: nothing is stored and every
+    lookup is a miss. The ``timeout`` and ``maxsize`` may be callables, so they
+    can be read from the Django settings lazily.
+    """
+
+    def __init__(self, maxsize=128, timeout=300):
+        self._maxsize = maxsize
+        self._timeout = timeout
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize() if callable(self._maxsize) else self._maxsize
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout() if callable(self._timeout) else self._timeout
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.timeout and self.timeout > 0)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max(self.maxsize, 1):
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
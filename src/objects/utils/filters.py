@@ -4,6 +4,8 @@ from django.utils.translation import gettext_lazy as _
 from django_filters import filters
 from vng_api_common.filters import URLModelChoiceFilter
 
+from objects.core.loaders import get_objecttype_loader
+
 
 class ObjectTypeField(filters.ModelChoiceField):
     default_error_messages = {
@@ -22,6 +24,10 @@ class ObjectTypeField(filters.ModelChoiceField):
 
         super().__init__(*args, **kwargs)
 
+    # Placeholder - gets replaced by URLModelChoiceFilter
+    def _get_request(self):
+        return None
+
     def to_python(self, value):
         if value in self.empty_values:
             return None
@@ -32,8 +38,9 @@ class ObjectTypeField(filters.ModelChoiceField):
         if self.min_length and len(value) < self.min_length:
             raise ValidationError(self.error_messages["min_length"], code="min_length")
 
+        loader = get_objecttype_loader(self._get_request())
         try:
-            result = self.queryset.get_by_url(value)
+            result = loader.get_by_url(value, self.queryset)
         except self.queryset.model.DoesNotExist:
             raise ValidationError(
                 self.error_messages["invalid_choice"],
@@ -0,0 +1,105 @@
+"""
+JSON Patch (https://datatracker.ietf.org/doc/html/rfc6902) helpers, which are used
+by the delta history of the API and the compacted data of the records.
+"""
+from copy import deepcopy
+
+from objects.typing import JSONObject, JSONValue
+
+
+def escape_pointer_token(token: str | int) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def is_same_json(source: JSONValue, target: JSONValue) -> bool:
+    # True == 1 in Python, but not in JSON
+    return type(source) is type(target) and source == target
+
+
+def get_json_patch(
+    source: JSONValue, target: JSONValue, path: str = ""
+) -> list[JSONObject]:
+    """Return the JSON Patch, which transforms the source into the target.
+
+    See https://datatracker.ietf.org/doc/html/rfc6902 - JSON Patch. Objects are compared
+    per key and arrays of the same length per item, other changed values are replaced.
+    Only the "add", "remove" and "replace" operations are used.
+    """
+
+    if isinstance(source, dict) and isinstance(target, dict):
+        operations = []
+        for key, value in source.items():
+            pointer = f"{path}/{escape_pointer_token(key)}"
+            if key in target:
+                operations += get_json_patch(value, target[key], pointer)
+            else:
+                operations.append({"op": "remove", "path": pointer})
+
+        for key, value in target.items():
+            if key not in source:
+                pointer = f"{path}/{escape_pointer_token(key)}"
+                operations.append({"op": "add", "path": pointer, "value": value})
+        return operations
+
+    if (
+        isinstance(source, list)
+        and isinstance(target, list)
+        and len(source) == len(target)
+    ):
+        return [
+            operation
+            for index, (source_item, target_item) in enumerate(zip(source, target))
+            for operation in get_json_patch(source_item, target_item, f"{path}/{index}")
+        ]
+
+    if is_same_json(source, target):
+        return []
+
+    return [{"op": "replace", "path": path, "value": target}]
+
+
+def apply_json_patch(document: JSONValue, patch: list[JSONObject]) -> JSONValue:
+    """Apply a JSON Patch to a copy of the document.
+
+    Only the "add", "remove" and "replace" operations of
+    https://datatracker.ietf.org/doc/html/rfc6902 are supported, which are the
+    operations of `get_json_patch`.
+    """
+
+    document = deepcopy(document)
+    for operation in patch:
+        op, path = operation["op"], operation["path"]
+        if op not in ("add", "remove", "replace"):
+            raise ValueError(f"Unsupported JSON Patch operation: {op}")
+
+        if not path:
+            if op == "remove":
+                raise ValueError("The whole document can't be removed")
+            document = deepcopy(operation["value"])
+            continue
+
+        *parents, name = [
+            unescape_pointer_token(token) for token in path.split("/")[1:]
+        ]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+
+        if isinstance(target, list):
+            index = len(target) if name == "-" else int(name)
+            if op == "add":
+                target.insert(index, deepcopy(operation["value"]))
+            elif op == "replace":
+                target[index] = deepcopy(operation["value"])
+            else:
+                del target[index]
+        elif op == "remove":
+            del target[name]
+        else:
+            target[name] = deepcopy(operation["value"])
+
+    return document
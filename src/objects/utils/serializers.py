@@ -1,7 +1,9 @@
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Optional
 
-from glom import SKIP, GlomError, glom
+from glom import SKIP, glom
 from rest_framework import fields, serializers
 
 from objects.token.constants import PermissionModes
@@ -62,6 +64,180 @@ def get_field_names_and_sources(data: dict[str, fields.Field]) -> list[tuple[str
     return names_and_sources
 
 
+def get_path(target, path: tuple):
+    """
+    return the value at the path, accessing it the same way as a glom path:
+    keys of dicts, indexes of lists and attributes of other objects
+    """
+    for part in path:
+        if isinstance(target, dict):
+            target = target[part]
+        elif isinstance(target, (list, tuple)):
+            target = target[int(part)]
+        else:
+            target = getattr(target, part)
+    return target
+
+
+class ProjectionError(Exception):
+    """the path of a field is absent in the data, the cause is the first argument"""
+
+
+class ProjectionPlan:
+    """
+    Projection of the serialized data on a list of fields, compiled once.
+
+    It's equivalent to ``glom(data, build_spec(fields))``: every field is looked up
+    from the root of the data and the nested keys of the result follow the field
+    names. Absent fields raise a ``ProjectionError``, absent attributes of the record
+    data (the fields starting with ``optional_prefix``) are skipped. If both a field
+    and its nested fields are listed, the field takes precedence.
+    """
+
+    def __init__(self, fields: tuple, optional_prefix: str = "record__data__"):
+        self.optional_prefix = optional_prefix
+        tree = {}
+        for field in fields:
+            *parents, name = field.split("__")
+            node = tree
+            for parent in parents:
+                node = node.setdefault(parent, {})
+                if not isinstance(node, dict):
+                    break
+            else:
+                node[name] = field
+
+        self.nodes = self.compile(tree)
+
+    def compile(self, tree: dict) -> tuple:
+        """
+        return a tuple of (key, path, skip_if_absent, children) per key, the children
+        of a listed field are None
+        """
+        nodes = []
+        for key, value in tree.items():
+            if isinstance(value, dict):
+                nodes.append((key, None, False, self.compile(value)))
+            else:
+                path = tuple(value.replace("__", ".").split("."))
+                nodes.append((key, path, value.startswith(self.optional_prefix), None))
+        return tuple(nodes)
+
+    def project(self, data) -> dict:
+        return self._project(self.nodes, data)
+
+    def _project(self, nodes: tuple, data) -> dict:
+        result = {}
+        for key, path, skip_if_absent, children in nodes:
+            if children is not None:
+                result[key] = self._project(children, data)
+                continue
+
+            try:
+                result[key] = get_path(data, path)
+            except (KeyError, IndexError, ValueError, TypeError, AttributeError) as exc:
+                if not skip_if_absent:
+                    raise ProjectionError(exc) from exc
+        return result
+
+
+@lru_cache(maxsize=1024)
+def get_projection_plan(
+    fields: tuple, optional_prefix: str = "record__data__"
+) -> ProjectionPlan:
+    return ProjectionPlan(fields, optional_prefix)
+
+
+def get_leaf_names(value, name: str) -> list:
+    if isinstance(value, dict):
+        return [f"{name}__{field}" for field in get_field_names(value)]
+    return [name]
+
+
+def get_removed_field_names(data: dict, projected: dict, prefix: str = "") -> set:
+    """
+    return the names of the fields of the data, which are absent in the projected
+    data, the same as ``set(get_field_names(data)) - set(get_field_names(projected))``
+
+    The projected data shares the values with the data, shared values are skipped.
+    """
+    removed = set()
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if key not in projected:
+            removed.update(get_leaf_names(value, name))
+            continue
+
+        projected_value = projected[key]
+        if projected_value is value:
+            continue
+
+        if isinstance(value, dict) and isinstance(projected_value, dict):
+            removed |= get_removed_field_names(value, projected_value, f"{name}__")
+        else:
+            removed |= set(get_leaf_names(value, name)) - set(
+                get_leaf_names(projected_value, name)
+            )
+    return removed
+
+
+def parse_fields(value: Optional[str]) -> list:
+    """return the field paths of the `fields` query parameter"""
+    if not value:
+        return []
+
+    return list({field.strip() for field in value.split(",")})
+
+
+def get_selected_names(paths, parent: str = "") -> Optional[set]:
+    """
+    return the names of the fields of the parent, which are needed for the field
+    paths, or None if the parent itself is needed
+    """
+    parts = parent.split("__") if parent else []
+    for index in range(1, len(parts) + 1):
+        if "__".join(parts[:index]) in paths:
+            return None
+
+    prefix = f"{parent}__" if parent else ""
+    return {
+        path[len(prefix) :].split("__")[0] for path in paths if path.startswith(prefix)
+    }
+
+
+class SelectedFieldsMixin:
+    """
+    this mixin keeps only the fields, which are needed for the `selected_fields`
+    in the serializer context, so the other fields are not loaded and serialized.
+    It also supports nested serializers.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        paths = self.context.get("selected_fields")
+        if paths is None:
+            return fields
+
+        names = get_selected_names(paths, self.get_field_path())
+        if names is None:
+            return fields
+
+        return OrderedDict(
+            (name, field) for name, field in fields.items() if name in names
+        )
+
+    def get_field_path(self) -> str:
+        names = []
+        serializer = self
+        while serializer.parent is not None:
+            # the child of a list serializer doesn't have a name
+            if serializer.field_name:
+                names.append(serializer.field_name)
+            serializer = serializer.parent
+        return "__".join(reversed(names))
+
+
 class NotAllowedDict(defaultdict):
     def pretty(self):
         if len(self.keys()) == 0:
@@ -96,10 +272,11 @@ class DynamicFieldsMixin:
         if allowed_fields == ALL_FIELDS:
             allowed_data = data
         else:
-            spec_allowed = build_spec(allowed_fields)
             try:
-                allowed_data = glom(data, spec_allowed)
-            except GlomError as exc:
+                allowed_data = get_projection_plan(
+                    tuple(sorted(allowed_fields))
+                ).project(data)
+            except ProjectionError as exc:
                 raise serializers.ValidationError(
                     f"Fields in the configured authorization are absent in the data: {exc.args[0]}"
                 )
@@ -107,26 +284,25 @@ class DynamicFieldsMixin:
         #  limit allowed data to requested in fields= query param
         if not query_fields:
             result_data = allowed_data
-            not_allowed = set(get_field_names(data)) - set(get_field_names(result_data))
-            if not_allowed:
-                self.not_allowed[
-                    f"{instance.object.object_type.url}({instance.version})"
-                ] |= not_allowed
+            not_allowed = get_removed_field_names(data, result_data)
         else:
-            spec_query = build_spec(query_fields)
+            query_plan = get_projection_plan(tuple(sorted(query_fields)))
             try:
-                result_data = glom(allowed_data, spec_query)
-            except GlomError as exc:
+                result_data = query_plan.project(allowed_data)
+            except ProjectionError as exc:
                 raise serializers.ValidationError(
                     f"'fields' query parameter has invalid or unauthorized values: {exc.args[0]}"
                 )
-            not_allowed = set(get_field_names(glom(data, spec_query))) - set(
-                get_field_names(result_data)
+            not_allowed = (
+                get_removed_field_names(query_plan.project(data), result_data)
+                if allowed_data is not data
+                else set()
             )
-            if not_allowed:
-                self.not_allowed[
-                    f"{instance.object.object_type.url}({instance.version})"
-                ] |= not_allowed
+
+        if not_allowed:
+            self.not_allowed[
+                f"{instance.object.object_type.url}({instance.version})"
+            ] |= not_allowed
 
         return result_data
 
@@ -135,11 +311,7 @@ class DynamicFieldsMixin:
         if not request:
             return []
 
-        fields = request.query_params.get("fields")
-        if not fields:
-            return []
-
-        return list({field.strip() for field in fields.split(",")})
+        return parse_fields(request.query_params.get("fields"))
 
     def get_allowed_fields(self, instance) -> list:
         request = self.context.get("request")
@@ -148,14 +320,44 @@ class DynamicFieldsMixin:
         if not request:
             return ALL_FIELDS
 
-        # use prefetch_related for DB optimization
-        if getattr(instance.object.object_type, "token_permissions", None):
-            permission = instance.object.object_type.token_permissions[0]
-        else:
-            permission = request.auth.get_permission_for_object_type(
-                instance.object.object_type
-            )
+        # the permissions of the token are cached
+        permission = request.auth.get_permission_for_object_type(
+            instance.object.object_type
+        )
         if permission.mode == PermissionModes.read_only and permission.use_fields:
             return permission.fields.get(str(instance.version), [])
 
         return ALL_FIELDS
+
+
+class QueryFieldsMixin:
+    """
+    this mixin projects the data on the fields in the query param, without the
+    field-based authorization. Absent attributes of the data are skipped.
+    """
+
+    optional_prefix = "data__"
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+
+        query_fields = self.get_query_fields()
+        if not query_fields:
+            return data
+
+        query_plan = get_projection_plan(
+            tuple(sorted(query_fields)), self.optional_prefix
+        )
+        try:
+            return query_plan.project(data)
+        except ProjectionError as exc:
+            raise serializers.ValidationError(
+                f"'fields' query parameter has invalid values: {exc.args[0]}"
+            )
+
+    def get_query_fields(self) -> list:
+        request = self.context.get("request")
+        if not request:
+            return []
+
+        return parse_fields(request.query_params.get("fields"))